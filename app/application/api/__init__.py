@@ -1,8 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.application.api import auth, companies, company_actions, quiz, users, user_actions
+from app.application.api import analytics, auth, companies, company_actions, quiz, system, user_actions, users
+from app.application.api.deps import get_unit_of_work
 
-routers = APIRouter()
+routers = APIRouter(dependencies=[Depends(get_unit_of_work)])
 
 routers.include_router(users.router)
 routers.include_router(auth.router)
@@ -10,3 +11,5 @@ routers.include_router(companies.router)
 routers.include_router(user_actions.router)
 routers.include_router(company_actions.router)
 routers.include_router(quiz.router)
+routers.include_router(analytics.router)
+routers.include_router(system.router)
@@ -0,0 +1,210 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette import status
+
+from app.application.api.deps import current_user_deps, quiz_service_deps, read_only_deps
+from app.core.schemas import PaginatedResponse
+from app.core.schemas.analytics_schemas import (
+    CompanyScoreStatsSchema,
+    CompanyUserScoreStatsSchema,
+    LeaderboardEntrySchema,
+    QuizScoreStatsSchema,
+    UserScoreStatsSchema,
+)
+from app.core.schemas.export_schemas import AttemptExportFilterSchema, ExportFormat, ExportJobSchema
+from app.core.services.attempt_export import MEDIA_TYPES
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get(
+    "/companies/{company_id}",
+    response_model=CompanyScoreStatsSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_company_stats(
+    company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> CompanyScoreStatsSchema:
+    """Get the score statistics of all the attempts at the company's quizzes."""
+    return await quiz_service.get_company_stats(company_id=company_id, user=current_user)
+
+
+@router.get(
+    "/companies/{company_id}/quizzes",
+    response_model=list[QuizScoreStatsSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_company_quizzes_stats(
+    company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> list[QuizScoreStatsSchema]:
+    """Get the score statistics of each attempted quiz of the company."""
+    return await quiz_service.get_company_quizzes_stats(company_id=company_id, user=current_user)
+
+
+@router.get(
+    "/companies/{company_id}/users/{user_id}",
+    response_model=CompanyUserScoreStatsSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_company_user_stats(
+    company_id: UUID, user_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> CompanyUserScoreStatsSchema:
+    """Get the score statistics of a member in the company."""
+    return await quiz_service.get_company_user_stats(company_id=company_id, user_id=user_id, user=current_user)
+
+
+@router.get(
+    "/companies/{company_id}/leaderboard",
+    response_model=PaginatedResponse[LeaderboardEntrySchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_company_leaderboard(
+    company_id: UUID,
+    quiz_service: quiz_service_deps,
+    current_user: current_user_deps,
+    limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
+    offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+) -> PaginatedResponse[LeaderboardEntrySchema]:
+    """Get members of the company ranked by their average score."""
+    return await quiz_service.get_company_leaderboard(
+        company_id=company_id, user=current_user, limit=limit, offset=offset
+    )
+
+
+@router.get(
+    "/companies/{company_id}/leaderboard/me",
+    response_model=LeaderboardEntrySchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_company_rank(
+    company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> LeaderboardEntrySchema:
+    """Get the current user's rank in the company."""
+    return await quiz_service.get_company_rank(company_id=company_id, user=current_user)
+
+
+@router.get(
+    "/companies/{company_id}/quizzes/{quiz_id}/leaderboard",
+    response_model=PaginatedResponse[LeaderboardEntrySchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_quiz_leaderboard(
+    company_id: UUID,
+    quiz_id: UUID,
+    quiz_service: quiz_service_deps,
+    current_user: current_user_deps,
+    limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
+    offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+) -> PaginatedResponse[LeaderboardEntrySchema]:
+    """Get users who attempted the quiz ranked by their average score at it."""
+    return await quiz_service.get_quiz_leaderboard(
+        quiz_id=quiz_id, company_id=company_id, user=current_user, limit=limit, offset=offset
+    )
+
+
+@router.get(
+    "/companies/{company_id}/quizzes/{quiz_id}/leaderboard/me",
+    response_model=LeaderboardEntrySchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_quiz_rank(
+    company_id: UUID, quiz_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> LeaderboardEntrySchema:
+    """Get the current user's rank at the quiz."""
+    return await quiz_service.get_quiz_rank(quiz_id=quiz_id, company_id=company_id, user=current_user)
+
+
+@router.get(
+    "/companies/{company_id}/attempts/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": ExportJobSchema}},
+    dependencies=[read_only_deps],
+)
+async def export_company_attempts(
+    company_id: UUID,
+    filters: Annotated[AttemptExportFilterSchema, Depends()],
+    quiz_service: quiz_service_deps,
+    current_user: current_user_deps,
+    export_format: ExportFormat = Query(default=ExportFormat.CSV, alias="format"),
+):
+    """
+    Export the attempts at the company's quizzes, streamed as they are read. Exports larger than
+    QUIZ_EXPORT_INLINE_MAX_ROWS are written to the media storage by a background job instead,
+    answered with 202 and the job to poll.
+    """
+    export = await quiz_service.export_company_attempts(
+        company_id=company_id, user=current_user, filters=filters, export_format=export_format
+    )
+    if isinstance(export, ExportJobSchema):
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=export.model_dump())
+    return StreamingResponse(
+        export,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="attempts-{company_id}.{export_format.value}"'},
+    )
+
+
+@router.get(
+    "/companies/{company_id}/attempts/archive",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    dependencies=[read_only_deps],
+)
+async def export_archived_attempts(
+    company_id: UUID,
+    filters: Annotated[AttemptExportFilterSchema, Depends()],
+    quiz_service: quiz_service_deps,
+    current_user: current_user_deps,
+    export_format: ExportFormat = Query(default=ExportFormat.CSV, alias="format"),
+):
+    """
+    Export the company's attempts moved to the archive by the retention policy, streamed as they are
+    read. Only the archive files of the months within date_from and date_to are read.
+    """
+    export = await quiz_service.export_archived_attempts(
+        company_id=company_id, user=current_user, filters=filters, export_format=export_format
+    )
+    return StreamingResponse(
+        export,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="archived-attempts-{company_id}.{export_format.value}"'
+        },
+    )
+
+
+@router.get(
+    "/companies/{company_id}/attempts/export/{job_id}",
+    response_model=ExportJobSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_export_job(
+    company_id: UUID, job_id: str, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> ExportJobSchema:
+    """Get the state of a background export, and where to download it once done."""
+    return await quiz_service.get_export_job(company_id=company_id, job_id=job_id, user=current_user)
+
+
+@router.get(
+    "/users/{user_id}",
+    response_model=UserScoreStatsSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_user_stats(
+    user_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> UserScoreStatsSchema:
+    """Get the overall rating of a user across all companies."""
+    return await quiz_service.get_user_stats(user_id=user_id)
@@ -3,7 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Query, UploadFile
 from starlette import status
 
-from app.application.api.deps import company_service_deps, current_user_deps, file_storage_deps
+from app.application.api.deps import company_service_deps, current_user_deps, file_storage_deps, read_only_deps
 from app.core.schemas.company_schemas import (
     CompanyInputSchema,
     CompanyMemberOutputSchema,
@@ -11,7 +11,7 @@ from app.core.schemas.company_schemas import (
     CompanyOutputSchema,
     CompanyUpdateSchema,
 )
-from app.core.schemas.pagination_schemas import PaginatedResponse
+from app.core.schemas.pagination_schemas import CountStrategy, PaginatedResponse
 from app.infrastructure.postgres.models.enums import CompanyMemberRole, CompanyStatus
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
@@ -26,42 +26,74 @@ async def create_company(
     return company
 
 
-@router.get("/all", response_model=PaginatedResponse[CompanyOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/all",
+    response_model=PaginatedResponse[CompanyOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_all_companies(
     limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(default=None, description="Cursor of the page to fetch, takes precedence over offset"),
+    count: CountStrategy = Query(default=CountStrategy.EXACT, description="How the total number of items is computed"),
     company_service: company_service_deps = None,
 ) -> PaginatedResponse[CompanyOutputSchema]:
     """Get paginated list of all companies."""
-    companies = await company_service.get_all_companies_paginated(limit=limit, offset=offset)
+    companies = await company_service.get_all_companies_paginated(
+        limit=limit, offset=offset, cursor=cursor, count_strategy=count
+    )
     return companies
 
 
-@router.get("/owned", response_model=PaginatedResponse[CompanyOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/owned",
+    response_model=PaginatedResponse[CompanyOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_my_owned_companies(
     limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(default=None, description="Cursor of the page to fetch, takes precedence over offset"),
+    count: CountStrategy = Query(default=CountStrategy.EXACT, description="How the total number of items is computed"),
     user: current_user_deps = None,
     company_service: company_service_deps = None,
 ) -> PaginatedResponse[CompanyOutputSchema]:
     """Get paginated companies owned by the current user (where user is owner/admin)."""
-    companies = await company_service.get_companies_for_owner_paginated(user=user, limit=limit, offset=offset)
+    companies = await company_service.get_companies_for_owner_paginated(
+        user=user, limit=limit, offset=offset, cursor=cursor, count_strategy=count
+    )
     return companies
 
 
-@router.get("/joined", response_model=PaginatedResponse[CompanyOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/joined",
+    response_model=PaginatedResponse[CompanyOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_my_joined_companies(
     limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(default=None, description="Cursor of the page to fetch, takes precedence over offset"),
+    count: CountStrategy = Query(default=CountStrategy.EXACT, description="How the total number of items is computed"),
     user: current_user_deps = None,
     company_service: company_service_deps = None,
 ) -> PaginatedResponse[CompanyOutputSchema]:
     """Get paginated companies where the current user is a member (not owner)."""
-    companies = await company_service.get_companies_for_member_paginated(user=user, limit=limit, offset=offset)
+    companies = await company_service.get_companies_for_member_paginated(
+        user=user, limit=limit, offset=offset, cursor=cursor, count_strategy=count
+    )
     return companies
 
 
-@router.get("/{company_id}", response_model=CompanyMemberOutputSchema, status_code=status.HTTP_200_OK)
+@router.get(
+    "/{company_id}",
+    response_model=CompanyMemberOutputSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_company(company_id: UUID, company_service: company_service_deps) -> CompanyMemberOutputSchema:
     """Get a company by its ID."""
     members = await company_service.get_company_members(company_id=company_id)
@@ -132,7 +164,12 @@ async def change_company_member_role(
     return member
 
 
-@router.get("/{company_id}/admins", response_model=list[CompanyMemberUserSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/{company_id}/admins",
+    response_model=list[CompanyMemberUserSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_company_admins(
     company_id: UUID, user: current_user_deps = None, company_service: company_service_deps = None
 ) -> list[CompanyMemberUserSchema]:
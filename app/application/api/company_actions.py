@@ -3,15 +3,25 @@ from uuid import UUID
 from fastapi import APIRouter
 from starlette import status
 
-from app.application.api.deps import company_service_deps, current_user_deps, user_service_deps
-from app.core.schemas.company_schemas import CompanyInvitationInputSchema, CompanyInvitationOutputSchema
+from app.application.api.deps import company_service_deps, current_user_deps, read_only_deps, user_service_deps
+from app.core.schemas.company_schemas import (
+    BulkInvitationReportSchema,
+    CompanyBulkInvitationInputSchema,
+    CompanyInvitationInputSchema,
+    CompanyInvitationOutputSchema,
+)
 
 
 router = APIRouter(prefix="/company-actions", tags=["Company Actions"])
 
 
 
-@router.get("/{company_id}/company-invitations", response_model=list[CompanyInvitationOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/{company_id}/company-invitations",
+    response_model=list[CompanyInvitationOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_company_invitations(
         company_id: UUID,
         company_service: company_service_deps,
@@ -40,6 +50,18 @@ async def invite_user_to_company(
     return invite
 
 
+@router.post("/invite/bulk", response_model=BulkInvitationReportSchema, status_code=status.HTTP_200_OK)
+async def invite_users_to_company(
+    payload: CompanyBulkInvitationInputSchema,
+    company_service: company_service_deps,
+    user: current_user_deps,
+):
+    """Invite many users to a company by email, with the outcome for each email."""
+    return await company_service.invite_users_to_company(
+        company_id=payload.company_id, emails=payload.invite_user_emails, user=user
+    )
+
+
 @router.post("/{invitation_id}/accept", response_model=None, status_code=status.HTTP_204_NO_CONTENT)
 async def accept_incoming_invitation(
     invitation_id: UUID, company_service: company_service_deps, user: current_user_deps
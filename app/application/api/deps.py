@@ -1,12 +1,17 @@
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.interfaces.file_storage_interface import FileStorageInterface
+from app.core.repositories.analytics_repository import AnalyticsRepository
+from app.core.repositories.attempt_history_repository import AttemptHistoryRepository
+from app.core.repositories.attempt_session_repository import AttemptSessionRepository
 from app.core.repositories.company_repository import CompanyRepository
+from app.core.repositories.leaderboard_repository import LeaderboardRepository
+from app.core.repositories.quiz_draw_repository import QuizDrawRepository
 from app.core.repositories.quiz_repository import QuizRepository
-from app.core.repositories.redis_repository import AsyncRedisRepository
 from app.core.repositories.user_repository import UserRepository
 from app.core.services.auth_service import AuthService
 from app.core.services.base_http_service import BaseHTTPClient
@@ -15,12 +20,30 @@ from app.core.services.notification_service import AsyncEmailSender
 from app.core.services.quiz_service import QuizService
 from app.core.services.user_service import UserService
 from app.infrastructure.postgres.models import User
-from app.infrastructure.storage import create_local_storage
+from app.infrastructure.postgres.routing import set_routing_key
+from app.infrastructure.postgres.session_manager import mark_read_only, unit_of_work
+from app.infrastructure.redis import get_redis_client
+from app.infrastructure.storage import AttemptArchive, create_attempt_archive, create_local_storage
 from app.settings import settings
 
 http_bearer = HTTPBearer()
 
 
+async def get_unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped session that every repository call made while handling the request reuses."""
+    async with unit_of_work() as session:
+        yield session
+
+
+async def get_read_only_unit_of_work(session: AsyncSession = Depends(get_unit_of_work)) -> AsyncSession:
+    """
+    The request's unit of work, declared read-only so its reads may be served by a read replica.
+    Only for endpoints that never write: reads of the other requests stay on the primary.
+    """
+    mark_read_only(session)
+    return session
+
+
 def get_email_sender() -> AsyncEmailSender:
     return AsyncEmailSender(
         host=settings.smtp.SMTP_EMAIL_HOST,
@@ -59,7 +82,15 @@ token_deps = Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)]
 
 
 async def get_current_user(auth_service: auth_service_deps, token: token_deps):
-    return await auth_service.get_current_user(token.credentials)
+    user = await auth_service.get_current_user(token.credentials)
+    # Reads made for this user after their own writes are kept on the primary.
+    set_routing_key(user.id)
+    return user
+
+
+async def get_current_user_email(auth_service: auth_service_deps, token: token_deps) -> str:
+    """Email of the user the access token was issued to, for endpoints that don't load the user."""
+    return auth_service.get_token_subject(token.credentials)
 
 
 async def get_company_repository() -> CompanyRepository:
@@ -78,28 +109,59 @@ def get_file_storage() -> FileStorageInterface:
 def get_quiz_repository() -> QuizRepository:
     return QuizRepository()
 
-def get_redis_repository() -> AsyncRedisRepository:
-    return AsyncRedisRepository(
-        host=settings.redis.REDIS_HOST,
-        port=settings.redis.REDIS_PORT,
-        db=settings.redis.REDIS_DB_QUIZ_ANSWERS,
-        password=settings.redis.REDIS_PASSWORD
+def get_analytics_repository() -> AnalyticsRepository:
+    return AnalyticsRepository()
+
+def get_leaderboard_repository() -> LeaderboardRepository:
+    return LeaderboardRepository(client=get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS))
+
+def get_attempt_history_repository() -> AttemptHistoryRepository:
+    return AttemptHistoryRepository(
+        client=get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS),
+        ttl=settings.redis.REDIS_ATTEMPT_HISTORY_TTL,
+        size=settings.redis.REDIS_ATTEMPT_HISTORY_SIZE,
+    )
+
+def get_quiz_draw_repository() -> QuizDrawRepository:
+    return QuizDrawRepository(
+        client=get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS), ttl=settings.redis.REDIS_QUIZ_DRAW_TTL
     )
 
+def get_attempt_session_repository() -> AttemptSessionRepository:
+    return AttemptSessionRepository(
+        client=get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS),
+        retention=settings.redis.REDIS_ATTEMPT_SESSION_RETENTION,
+    )
+
+def get_attempt_archive() -> AttemptArchive:
+    return create_attempt_archive(settings.quiz)
+
 def get_quiz_service(
     company_repository: CompanyRepository = Depends(get_company_repository),
     quiz_repository: QuizRepository = Depends(get_quiz_repository),
-    redis_repository: AsyncRedisRepository = Depends(get_redis_repository),
+    attempt_history_repository: AttemptHistoryRepository = Depends(get_attempt_history_repository),
+    analytics_repository: AnalyticsRepository = Depends(get_analytics_repository),
+    leaderboard_repository: LeaderboardRepository = Depends(get_leaderboard_repository),
+    quiz_draw_repository: QuizDrawRepository = Depends(get_quiz_draw_repository),
+    attempt_session_repository: AttemptSessionRepository = Depends(get_attempt_session_repository),
+    attempt_archive: AttemptArchive = Depends(get_attempt_archive),
 ) -> QuizService:
     return QuizService(
         company_repository=company_repository,
         quiz_repository=quiz_repository,
-        redis_repository=redis_repository
+        attempt_history_repository=attempt_history_repository,
+        analytics_repository=analytics_repository,
+        leaderboard_repository=leaderboard_repository,
+        quiz_draw_repository=quiz_draw_repository,
+        attempt_session_repository=attempt_session_repository,
+        attempt_archive=attempt_archive,
     )
 
 
 
+read_only_deps = Depends(get_read_only_unit_of_work)
 current_user_deps = Annotated[User, Depends(get_current_user)]
+current_user_email_deps = Annotated[str, Depends(get_current_user_email)]
 company_service_deps = Annotated[CompanyService, Depends(get_company_service)]
 file_storage_deps = Annotated[FileStorageInterface, Depends(get_file_storage)]
 quiz_service_deps = Annotated[QuizService, Depends(get_quiz_service)]
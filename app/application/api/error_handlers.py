@@ -31,4 +31,12 @@ def add_exception_handlers(_: Request, e: base_exc.FileTooLargeError):
     return JSONResponse(content={"message": str(e)}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
 
 def file_extension_not_allowed_handler(_: Request, e: base_exc.FileExtensionNotAllowedError):
-    return JSONResponse(content={"message": str(e)}, status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
\ No newline at end of file
+    return JSONResponse(content={"message": str(e)}, status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+def handle_invalid_cursor(_: Request, e: base_exc.InvalidCursor) -> JSONResponse:
+    return JSONResponse(content={"message": str(e)}, status_code=status.HTTP_400_BAD_REQUEST)
+
+def handle_invalid_import_file(_: Request, e: base_exc.InvalidImportFile) -> JSONResponse:
+    return JSONResponse(
+        content={"message": str(e), "errors": e.errors}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
@@ -1,20 +1,31 @@
+from pathlib import Path
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, UploadFile
+from fastapi.responses import JSONResponse
 from starlette import status
 
-from app.application.api.deps import current_user_deps, quiz_service_deps
-from app.core.schemas import PaginatedResponse
+from app.application.api.deps import current_user_deps, current_user_email_deps, quiz_service_deps, read_only_deps
+from app.core.schemas import CountStrategy, PaginatedResponse
+from app.core.schemas.analytics_schemas import ItemStatisticsJobSchema, QuizItemStatisticsSchema
+from app.core.schemas.import_schemas import ImportFormat, QuizImportReportSchema
 from app.core.schemas.quiz_schemas import (
     AttemptQuizInputSchema,
     AttemptQuizOutputSchema,
+    AttemptSessionAnswerSchema,
+    AttemptSessionSchema,
     QuizAttemptRedisSchema,
+    QuizDrawSchema,
     QuizInputSchema,
     QuizOutputSchema,
+    QuizSubmissionSchema,
 )
+from app.utils.exceptions import FileExtensionNotAllowedError
 
 router = APIRouter(prefix="/quizzes", tags=["Quiz"])
 
+IMPORT_EXTENSIONS = {".csv": ImportFormat.CSV, ".jsonl": ImportFormat.JSONL, ".ndjson": ImportFormat.JSONL}
+
 
 @router.post("/{company_id}", response_model=QuizOutputSchema, status_code=status.HTTP_201_CREATED)
 async def create_quiz(
@@ -24,6 +35,32 @@ async def create_quiz(
     return quiz
 
 
+@router.post("/{company_id}/import", response_model=QuizImportReportSchema, status_code=status.HTTP_201_CREATED)
+async def import_quizzes(
+    company_id: UUID,
+    file: UploadFile,
+    quiz_service: quiz_service_deps,
+    current_user: current_user_deps,
+    import_format: ImportFormat | None = Query(
+        default=None, alias="format", description="Format of the file, taken from its extension when omitted"
+    ),
+) -> QuizImportReportSchema:
+    """
+    Create quizzes in bulk from a CSV file, one answer per row with the columns quiz_title, quiz_description,
+    question_text, answer_text and is_correct, or from a JSON-lines file, one quiz per line.
+    Answers 422 with the invalid rows when there are any, nothing is created then.
+    """
+    if import_format is None:
+        extension = Path(file.filename or "").suffix.lower()
+        if extension not in IMPORT_EXTENSIONS:
+            raise FileExtensionNotAllowedError(extension=extension, allowed=list(IMPORT_EXTENSIONS))
+        import_format = IMPORT_EXTENSIONS[extension]
+    report = await quiz_service.import_quizzes(
+        company_id=company_id, user=current_user, file=file.file, import_format=import_format
+    )
+    return report
+
+
 @router.put("/{quiz_id}/{company_id}", response_model=QuizOutputSchema, status_code=status.HTTP_200_OK)
 async def update_quiz(
     quiz_id: UUID,
@@ -45,23 +82,147 @@ async def delete_quiz(
     await quiz_service.delete(quiz_id=quiz_id, company_id=company_id, user=current_user)
 
 
-@router.get("/{company_id}", response_model=PaginatedResponse[QuizOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/{company_id}",
+    response_model=PaginatedResponse[QuizOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_company_quizzes(
     company_id: UUID,
     quiz_service: quiz_service_deps,
     current_user: current_user_deps,
     limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(default=None, description="Cursor of the page to fetch, takes precedence over offset"),
+    count: CountStrategy = Query(default=CountStrategy.EXACT, description="How the total number of items is computed"),
 ) -> PaginatedResponse[QuizOutputSchema]:
     quizzes = await quiz_service.get_company_quizzes(
-        company_id=company_id, user=current_user, limit=limit, offset=offset
+        company_id=company_id, user=current_user, limit=limit, offset=offset, cursor=cursor, count_strategy=count
     )
     return quizzes
 
 
+@router.get(
+    "/{quiz_id}/{company_id}/statistics",
+    response_model=QuizItemStatisticsSchema,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_202_ACCEPTED: {"model": ItemStatisticsJobSchema}},
+    dependencies=[read_only_deps],
+)
+async def get_item_statistics(
+    quiz_id: UUID, company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+):
+    """
+    Get the percent correct, answer pick rates and discrimination of each question of the quiz's current
+    version. Statistics older than REDIS_ITEM_STATISTICS_TTL are worked out again by a background job,
+    answered with 202 and the job until they are ready.
+    """
+    statistics = await quiz_service.get_item_statistics(quiz_id=quiz_id, company_id=company_id, user=current_user)
+    if isinstance(statistics, ItemStatisticsJobSchema):
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=statistics.model_dump())
+    return statistics
+
+
+@router.post("/{quiz_id}/{company_id}/draw", response_model=QuizDrawSchema, status_code=status.HTTP_201_CREATED)
+async def draw_questions(
+    quiz_id: UUID, company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> QuizDrawSchema:
+    """
+    Draw the questions of an attempt: sample_size of them picked at random from a question bank, all of
+    them for other quizzes. The attempt is then submitted with the draw id, and graded on these questions.
+    """
+    return await quiz_service.draw_questions(quiz_id=quiz_id, company_id=company_id, user=current_user)
+
+
+@router.post(
+    "/{quiz_id}/{company_id}/sessions", response_model=AttemptSessionSchema, status_code=status.HTTP_201_CREATED
+)
+async def start_session(
+    quiz_id: UUID, company_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> AttemptSessionSchema:
+    """
+    Start a timed attempt, its questions drawn as by the draw endpoint. Answers are saved one question at a
+    time until the session is submitted; once its deadline passes it is submitted with the answers saved.
+    """
+    return await quiz_service.start_session(quiz_id=quiz_id, company_id=company_id, user=current_user)
+
+
+@router.get(
+    "/{quiz_id}/{company_id}/sessions/{session_id}",
+    response_model=AttemptSessionSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_session(
+    quiz_id: UUID, company_id: UUID, session_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> AttemptSessionSchema:
+    """Get an attempt in progress with the answers saved so far."""
+    return await quiz_service.get_session(
+        quiz_id=quiz_id, company_id=company_id, session_id=session_id, user=current_user
+    )
+
+
+@router.put(
+    "/{quiz_id}/{company_id}/sessions/{session_id}/answers/{question_id}",
+    response_model=None,
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def save_session_answer(
+    quiz_id: UUID,
+    company_id: UUID,
+    session_id: UUID,
+    question_id: UUID,
+    answer_payload: AttemptSessionAnswerSchema,
+    quiz_service: quiz_service_deps,
+    current_user_email: current_user_email_deps,
+) -> None:
+    """Save the answers chosen for a question of a session, 409 once its deadline has passed."""
+    await quiz_service.save_session_answer(
+        quiz_id=quiz_id,
+        session_id=session_id,
+        question_id=question_id,
+        answer_ids=answer_payload.answer_ids,
+        user_email=current_user_email,
+    )
+
+
+@router.delete(
+    "/{quiz_id}/{company_id}/sessions/{session_id}/answers/{question_id}",
+    response_model=None,
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def clear_session_answer(
+    quiz_id: UUID,
+    company_id: UUID,
+    session_id: UUID,
+    question_id: UUID,
+    quiz_service: quiz_service_deps,
+    current_user_email: current_user_email_deps,
+) -> None:
+    """Leave a question of a session unanswered again."""
+    await quiz_service.save_session_answer(
+        quiz_id=quiz_id, session_id=session_id, question_id=question_id, answer_ids=None, user_email=current_user_email
+    )
+
+
+@router.post(
+    "/{quiz_id}/{company_id}/sessions/{session_id}/submit",
+    response_model=AttemptQuizOutputSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def submit_session(
+    quiz_id: UUID, company_id: UUID, session_id: UUID, quiz_service: quiz_service_deps, current_user: current_user_deps
+) -> AttemptQuizOutputSchema:
+    """Submit a session with the answers saved to it."""
+    return await quiz_service.submit_session(
+        quiz_id=quiz_id, company_id=company_id, session_id=session_id, user=current_user
+    )
+
+
 @router.post("/{quiz_id}/{company_id}/attempts", response_model=AttemptQuizOutputSchema, status_code=status.HTTP_200_OK)
 async def attempt_quiz(
-    quiz_payload: AttemptQuizInputSchema,
+    quiz_payload: AttemptQuizInputSchema | QuizSubmissionSchema,
     quiz_id: UUID,
     company_id: UUID,
     quiz_service: quiz_service_deps,
@@ -72,7 +233,13 @@ async def attempt_quiz(
     )
     return attempt
 
-@router.get("/{quiz_id}/{company_id}/attempts", response_model=QuizAttemptRedisSchema, status_code=status.HTTP_200_OK, description="Get quiz attempts from Redis for 48 hours")
+@router.get(
+    "/{quiz_id}/{company_id}/attempts",
+    response_model=QuizAttemptRedisSchema,
+    status_code=status.HTTP_200_OK,
+    description="Get quiz attempts from Redis for 48 hours",
+    dependencies=[read_only_deps],
+)
 async def get_quiz_attempts(
     quiz_id: UUID,
     company_id: UUID,
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+
+from app.application.api.deps import get_current_user
+from app.core.schemas.system_schemas import (
+    AttemptIngestionStatsSchema,
+    DatabasePoolStatsSchema,
+    DatabaseRoutingStatsSchema,
+    MembershipCacheStatsSchema,
+    QuizTreeCacheStatsSchema,
+)
+from app.infrastructure.postgres.connection import engine
+from app.infrastructure.postgres.pool import get_pool_stats
+from app.infrastructure.postgres.routing import replica_router
+from app.infrastructure.redis.attempt_stream import attempt_stream
+from app.infrastructure.redis.membership_cache import membership_cache
+from app.infrastructure.redis.quiz_tree_cache import quiz_tree_cache
+from app.settings import settings
+
+# Operational details of the deployment, for signed-in users only.
+router = APIRouter(prefix="/system", tags=["System"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/database/pool", response_model=DatabasePoolStatsSchema, status_code=status.HTTP_200_OK)
+async def get_database_pool_stats() -> DatabasePoolStatsSchema:
+    """Get connection pool usage and checkout wait times."""
+    return DatabasePoolStatsSchema(**get_pool_stats(engine))
+
+
+@router.get("/database/routing", response_model=DatabaseRoutingStatsSchema, status_code=status.HTTP_200_OK)
+async def get_database_routing_stats() -> DatabaseRoutingStatsSchema:
+    """Get read routing decisions and replica lag."""
+    return DatabaseRoutingStatsSchema(**replica_router.snapshot())
+
+
+@router.get("/cache/membership", response_model=MembershipCacheStatsSchema, status_code=status.HTTP_200_OK)
+async def get_membership_cache_stats() -> MembershipCacheStatsSchema:
+    """Get hit and miss counts of the membership cache."""
+    return MembershipCacheStatsSchema(**membership_cache.snapshot())
+
+
+@router.get("/cache/quiz-trees", response_model=QuizTreeCacheStatsSchema, status_code=status.HTTP_200_OK)
+async def get_quiz_tree_cache_stats() -> QuizTreeCacheStatsSchema:
+    """Get hit counts and memory use of the quiz tree cache."""
+    return QuizTreeCacheStatsSchema(**quiz_tree_cache.snapshot())
+
+
+@router.get("/ingestion/attempts", response_model=AttemptIngestionStatsSchema, status_code=status.HTTP_200_OK)
+async def get_attempt_ingestion_stats() -> AttemptIngestionStatsSchema:
+    """Get the backlog and lag of quiz attempts waiting to be written."""
+    return AttemptIngestionStatsSchema(
+        ingestion=settings.quiz.QUIZ_ATTEMPT_INGESTION, **await attempt_stream.snapshot()
+    )
@@ -1,20 +1,42 @@
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette import status
 
-from app.application.api.deps import company_service_deps, current_user_deps
+from app.application.api.deps import company_service_deps, current_user_deps, quiz_service_deps, read_only_deps
 from app.core.schemas.company_schemas import CompanyInvitationOutputSchema
+from app.core.schemas.quiz_schemas import QuizAttemptRedisSchema
+from app.settings import settings
 
 router = APIRouter(prefix="/user-actions", tags=["User Actions"])
 
 
-@router.get("/invitations", response_model=list[CompanyInvitationOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/invitations",
+    response_model=list[CompanyInvitationOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_my_invitations(company_service: company_service_deps, user: current_user_deps):
     """Get all invitations for the current user."""
     invitations = await company_service.get_invitations_for_user(user=user)
     return invitations
 
+@router.get(
+    "/attempts",
+    response_model=list[QuizAttemptRedisSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
+async def get_my_recent_attempts(
+    quiz_service: quiz_service_deps,
+    user: current_user_deps,
+    limit: int = Query(default=10, ge=1, le=settings.redis.REDIS_ATTEMPT_HISTORY_SIZE),
+):
+    """Get the current user's latest quiz attempts across all companies, newest first."""
+    attempts = await quiz_service.get_recent_attempts(user=user, limit=limit)
+    return attempts
+
 @router.post("/{company_id}/requests", response_model=CompanyInvitationOutputSchema, status_code=status.HTTP_201_CREATED)
 async def request_membership_to_company(
     company_id: UUID, company_service: company_service_deps, user: current_user_deps
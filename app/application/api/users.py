@@ -3,31 +3,38 @@ from uuid import UUID
 from fastapi import APIRouter, Query, UploadFile
 from starlette import status
 
-from app.application.api.deps import current_user_deps, file_storage_deps, user_service_deps
-from app.core.schemas import PaginatedResponse
+from app.application.api.deps import current_user_deps, file_storage_deps, read_only_deps, user_service_deps
+from app.core.schemas import CountStrategy, PaginatedResponse
 from app.core.schemas.user_schemas import UserInputSchema, UserOutputSchema, UserUpdateSchema
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("/", response_model=PaginatedResponse[UserOutputSchema], status_code=status.HTTP_200_OK)
+@router.get(
+    "/",
+    response_model=PaginatedResponse[UserOutputSchema],
+    status_code=status.HTTP_200_OK,
+    dependencies=[read_only_deps],
+)
 async def get_users(
         limit: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
         offset: int = Query(default=0, ge=0, description="Number of items to skip"),
+        cursor: str | None = Query(default=None, description="Cursor of the page to fetch, takes precedence over offset"),
+        count: CountStrategy = Query(default=CountStrategy.EXACT, description="How the total number of items is computed"),
         user_service: user_service_deps = None,
         _: current_user_deps = None,
 ):
-    users = await user_service.get_all(limit=limit, offset=offset)
+    users = await user_service.get_all(limit=limit, offset=offset, cursor=cursor, count_strategy=count)
     return users
 
 
-@router.get("/profile", response_model=UserOutputSchema, status_code=status.HTTP_200_OK)
+@router.get("/profile", response_model=UserOutputSchema, status_code=status.HTTP_200_OK, dependencies=[read_only_deps])
 async def read_users_me(user_service: user_service_deps, current_user: current_user_deps):
     return await user_service.get(email=current_user.email)
 
 
 
-@router.get("/{uuid}", response_model=UserOutputSchema, status_code=status.HTTP_200_OK)
+@router.get("/{uuid}", response_model=UserOutputSchema, status_code=status.HTTP_200_OK, dependencies=[read_only_deps])
 async def get_user_by_uuid(uuid: UUID, user_service: user_service_deps):
     user = await user_service.get_by_id(uuid=uuid)
     return user
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.infrastructure.postgres.models import CompanyScoreStats, CompanyUserScoreStats, QuizScoreStats, UserScoreStats
+
+
+class AbstractAnalyticsRepository(ABC):
+    @abstractmethod
+    async def add_attempts(self, attempts) -> None:
+        """Add newly recorded attempts to the score statistics."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_quiz_stats(self, quiz_id: UUID) -> QuizScoreStats | None:
+        """Retrieve the score statistics of a quiz."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_company_stats(self, company_id: UUID) -> CompanyScoreStats | None:
+        """Retrieve the score statistics of all the quizzes of a company."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_stats(self, user_id: UUID) -> UserScoreStats | None:
+        """Retrieve the score statistics of a user across all companies."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_company_user_stats(self, company_id: UUID, user_id: UUID) -> CompanyUserScoreStats | None:
+        """Retrieve the score statistics of a user in a company."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_company_quizzes_stats(self, company_id: UUID) -> list[QuizScoreStats]:
+        """Retrieve the score statistics of every attempted quiz of a company."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_scored_company_ids(self) -> list[UUID]:
+        """Retrieve the ids of the companies whose quizzes have been attempted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_member_score_totals(self, company_id: UUID) -> list:
+        """Retrieve the score sum and attempt count of each member of a company."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_quiz_member_score_totals(self, company_id: UUID) -> list:
+        """Retrieve the score sum and attempt count of each member of a company at each of its quizzes."""
+        raise NotImplementedError
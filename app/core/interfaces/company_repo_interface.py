@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, Tuple
+from typing import Sequence
 from uuid import UUID
 
+from app.core.schemas.access_schemas import AccessContext
 from app.infrastructure.postgres.models import Company, User
 from app.infrastructure.postgres.models.company import CompanyInvitation, CompanyMember
 from app.infrastructure.postgres.models.enums import CompanyMemberRole, InvitationStatus, InvitationType
+from app.infrastructure.postgres.pagination import CountStrategy, Page
 
 
 class AbstractCompanyRepository(ABC):
@@ -16,6 +18,13 @@ class AbstractCompanyRepository(ABC):
     async def get(self, company_id: UUID, owner_id: UUID | None = None) -> Company | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_access_context(
+        self, company_id: UUID, user_id: UUID, quiz_id: UUID | None = None, with_questions: bool = False
+    ) -> AccessContext | None:
+        """Get the company, the user's role in it and optionally one of its quizzes in one query."""
+        raise NotImplementedError
+
     @abstractmethod
     async def check_if_company_exists(self, company_email: str, owner_id: UUID) -> bool:
         raise NotImplementedError
@@ -34,13 +43,20 @@ class AbstractCompanyRepository(ABC):
 
     @abstractmethod
     async def get_companies_for_owner_paginated(
-        self, owner_id: UUID, limit: int, offset: int
-    ) -> Tuple[list[Company], int]:
+        self,
+        owner_id: UUID,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Company]:
         """Get paginated companies for owner with total count."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_all_companies_paginated(self, limit: int, offset: int) -> Tuple[list[Company], int]:
+    async def get_all_companies_paginated(
+        self, limit: int, offset: int, cursor: str | None = None, count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> Page[Company]:
         """Get paginated companies with total count."""
         raise NotImplementedError
 
@@ -49,6 +65,18 @@ class AbstractCompanyRepository(ABC):
         """Invite a user to a company."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_invite_candidates(self, company: Company, emails: Sequence[str]) -> Sequence:
+        """Users with these emails, whether each is a member of the company and whether each is invited to it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invite_users_to_company(
+        self, company: Company, user_ids: Sequence[UUID], invited_by: User, invitation_type: InvitationType
+    ) -> dict[UUID, UUID]:
+        """Invite many users to a company, skipping those with a pending invitation of this type."""
+        raise NotImplementedError
+
     @abstractmethod
     async def check_if_invite_exists(
         self, company: Company, invite_user: User, status: InvitationStatus
@@ -138,7 +166,12 @@ class AbstractCompanyRepository(ABC):
 
     @abstractmethod
     async def get_companies_for_member_paginated(
-        self, user_id: UUID, limit: int, offset: int
-    ) -> Tuple[list[Company], int]:
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Company]:
         """Get paginated companies where user is a member (not owner) with total count."""
         raise NotImplementedError
\ No newline at end of file
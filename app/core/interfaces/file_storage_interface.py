@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterable
 
 
 class FileStorageInterface(ABC):
@@ -9,6 +10,11 @@ class FileStorageInterface(ABC):
         """Saves a file and returns its URL or path."""
         pass
 
+    @abstractmethod
+    async def save_stream(self, chunks: AsyncIterable[bytes], filename: str) -> str:
+        """Saves a generated file chunk by chunk and returns its URL or path."""
+        pass
+
     @abstractmethod
     async def delete_file(self, filename: str) -> bool:
         """Deletes a file by its filename. Returns True if successful."""
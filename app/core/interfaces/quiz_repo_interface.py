@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from uuid import UUID
 
-from app.core.schemas.quiz_schemas import AttemptQuizResultSchema, QuizInputSchema
-from app.infrastructure.postgres.models import Company, Quiz, User
+from app.core.schemas.export_schemas import AttemptExportFilterSchema
+from app.core.schemas.quiz_schemas import AttemptQuizResultSchema, QuizInputSchema, QuizTreeSchema
+from app.infrastructure.postgres.models import Company, Question, Quiz, User, UserQuizAttempt
+from app.infrastructure.postgres.pagination import CountStrategy, Page
 
 
 class AbstractQuizRepository(ABC):
@@ -16,6 +19,11 @@ class AbstractQuizRepository(ABC):
         """Retrieve a quiz by its ID and associated company."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_tree(self, quiz: Quiz) -> QuizTreeSchema:
+        """Retrieve the questions and answers of a quiz for scoring."""
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, quiz: Quiz, quiz_payload: QuizInputSchema):
         """Update an existing quiz with new data."""
@@ -27,11 +35,76 @@ class AbstractQuizRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_quizzes_by_company(self, company: Company, limit: int, offset: int):
+    async def get_quizzes_by_company(
+        self,
+        company_id: UUID,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Quiz]:
         """Retrieve quizzes associated with a specific company, with pagination."""
         raise NotImplementedError
 
     @abstractmethod
-    async def record_quiz_attempt(self, user: User, quiz: Quiz, company: Company, score: AttemptQuizResultSchema):
-        """Record an attempt for a quiz by a user."""
+    async def record_quiz_attempt(
+        self,
+        user: User,
+        quiz: Quiz,
+        company: Company,
+        score: AttemptQuizResultSchema,
+        attempt_id: UUID | None = None,
+        attempted_at: datetime | None = None,
+    ):
+        """Record an attempt for a quiz by a user, made now unless `attempted_at` says otherwise."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_attempts(self, user_id: UUID, limit: int) -> list[UserQuizAttempt]:
+        """Retrieve the newest attempts of a user."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def draw_questions(self, quiz_id: UUID, sample_size: int | None) -> list[Question]:
+        """Retrieve `sample_size` questions of a quiz drawn at random, or all of them when it is None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_last_user_attempt(self, user_id: UUID, quiz_id: UUID) -> UserQuizAttempt | None:
+        """Retrieve the newest attempt of a user at a quiz."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_attempt_answers(self, quiz_id: UUID, quiz_version: int):
+        """Retrieve the score and packed answers of every attempt at a version of a quiz."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_company_attempts(self, company_id: UUID, filters: AttemptExportFilterSchema, limit: int) -> int:
+        """Count the attempts at a company's quizzes matching the filters, up to a limit."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_company_attempts(self, company_id: UUID, filters: AttemptExportFilterSchema, batch_size: int):
+        """Stream the attempts at a company's quizzes matching the filters, in batches."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_month_attempts(self, month: datetime, batch_size: int):
+        """Stream every attempt of a month with its company id, company by company, in batches."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stage_quiz_import(self, rows) -> None:
+        """Copy parsed quiz import rows into a staging table."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def merge_quiz_import(self, company_id: UUID) -> tuple[int, int, int]:
+        """Create the staged quizzes, questions and answers."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def record_quiz_attempts(self, attempts: list[dict]) -> int:
+        """Record a batch of attempts, ignoring those already recorded."""
         raise NotImplementedError
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple
+from typing import Dict
 from uuid import UUID
 
 from pydantic import EmailStr
 
 from app.infrastructure.postgres.models.user import User
+from app.infrastructure.postgres.pagination import CountStrategy, Page
 
 
 class AbstractUserRepository(ABC):
@@ -21,7 +22,9 @@ class AbstractUserRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_all(self, limit: int, offset: int) -> Tuple[list[User], int]:
+    async def get_all(
+        self, limit: int, offset: int, cursor: str | None = None, count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> Page[User]:
         raise NotImplementedError
 
     @abstractmethod
@@ -3,6 +3,7 @@ from typing import List
 
 from pydantic import EmailStr
 
+from app.core.schemas import CountStrategy
 from app.core.schemas.user_schemas import UserInputSchema, UserOutputSchema
 from app.infrastructure.postgres.models import User
 
@@ -17,7 +18,9 @@ class AbstractUserService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_all(self, limit: int, offset: int) -> List[UserOutputSchema]:
+    def get_all(
+        self, limit: int, offset: int, cursor: str | None = None, count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> List[UserOutputSchema]:
         raise NotImplementedError
 
     @abstractmethod
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Iterable, Protocol
+from uuid import UUID
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.interfaces.analytics_repo_interface import AbstractAnalyticsRepository
+from app.infrastructure.postgres.models import (
+    CompanyMember,
+    CompanyScoreStats,
+    CompanyUserScoreStats,
+    QuizScoreStats,
+    UserQuizAttempt,
+    UserScoreStats,
+)
+from app.infrastructure.postgres.session_manager import provide_async_session, provide_read_only_session
+from app.settings import settings
+
+TOTALS = ("attempts_count", "score_sum", "score_sumsq", "passed_count", "correct_answers_sum", "total_questions_sum")
+
+
+class ScoredAttempt(Protocol):
+    user_id: UUID
+    quiz_id: UUID
+    company_id: UUID
+    score: float
+    total_questions: int
+    correct_answers_count: int
+
+
+def _totals(attempt: ScoredAttempt) -> tuple:
+    return (
+        1,
+        attempt.score,
+        attempt.score**2,
+        int(attempt.score >= settings.quiz.QUIZ_PASS_SCORE),
+        attempt.correct_answers_count,
+        attempt.total_questions,
+    )
+
+
+class AnalyticsRepository(AbstractAnalyticsRepository):
+    @provide_async_session
+    async def add_attempts(self, attempts: Iterable[ScoredAttempt], session: AsyncSession) -> None:
+        """
+        Add newly recorded attempts to the score statistics of their quiz, company, user and
+        user in the company, with one upsert per table. Must run in the transaction that inserts
+        the attempts, and only for attempts that were actually inserted.
+        """
+        by_quiz, by_company, by_user, by_company_user = (defaultdict(lambda: [0] * len(TOTALS)) for _ in range(4))
+        for attempt in attempts:
+            totals = _totals(attempt)
+            for grouped, key in (
+                (by_quiz, (attempt.quiz_id, attempt.company_id)),
+                (by_company, (attempt.company_id,)),
+                (by_user, (attempt.user_id,)),
+                (by_company_user, (attempt.company_id, attempt.user_id)),
+            ):
+                grouped[key] = [total + value for total, value in zip(grouped[key], totals)]
+
+        await self._upsert(QuizScoreStats, ("quiz_id", "company_id"), by_quiz, session=session)
+        await self._upsert(CompanyScoreStats, ("company_id",), by_company, session=session)
+        await self._upsert(UserScoreStats, ("user_id",), by_user, session=session)
+        await self._upsert(CompanyUserScoreStats, ("company_id", "user_id"), by_company_user, session=session)
+
+    @staticmethod
+    async def _upsert(model, key_columns: tuple[str, ...], grouped: dict, session: AsyncSession) -> None:
+        if not grouped:
+            return
+        # Rows are written in key order, so concurrent writers lock shared rows in the same order.
+        rows = [{**dict(zip(key_columns, key)), **dict(zip(TOTALS, totals))} for key, totals in sorted(grouped.items())]
+        stmt = pg_insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=model.__table__.primary_key.columns,
+            set_={
+                **{column: getattr(model, column) + getattr(stmt.excluded, column) for column in TOTALS},
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+
+    @provide_read_only_session
+    async def get_quiz_stats(self, quiz_id: UUID, session: AsyncSession) -> QuizScoreStats | None:
+        return await session.get(QuizScoreStats, quiz_id, populate_existing=True)
+
+    @provide_read_only_session
+    async def get_company_stats(self, company_id: UUID, session: AsyncSession) -> CompanyScoreStats | None:
+        return await session.get(CompanyScoreStats, company_id, populate_existing=True)
+
+    @provide_read_only_session
+    async def get_user_stats(self, user_id: UUID, session: AsyncSession) -> UserScoreStats | None:
+        return await session.get(UserScoreStats, user_id, populate_existing=True)
+
+    @provide_read_only_session
+    async def get_company_user_stats(
+        self, company_id: UUID, user_id: UUID, session: AsyncSession
+    ) -> CompanyUserScoreStats | None:
+        return await session.get(CompanyUserScoreStats, (company_id, user_id), populate_existing=True)
+
+    @provide_read_only_session
+    async def get_company_quizzes_stats(self, company_id: UUID, session: AsyncSession) -> list[QuizScoreStats]:
+        stmt = select(QuizScoreStats).where(QuizScoreStats.company_id == company_id)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    @provide_read_only_session
+    async def get_scored_company_ids(self, session: AsyncSession) -> list[UUID]:
+        result = await session.execute(select(CompanyScoreStats.company_id))
+        return list(result.scalars().all())
+
+    @provide_read_only_session
+    async def get_member_score_totals(self, company_id: UUID, session: AsyncSession) -> list[Row]:
+        """(user_id, score_sum, attempts_count) of each current member of the company who made attempts."""
+        stmt = (
+            select(CompanyUserScoreStats.user_id, CompanyUserScoreStats.score_sum, CompanyUserScoreStats.attempts_count)
+            .join(
+                CompanyMember,
+                (CompanyMember.company_id == CompanyUserScoreStats.company_id)
+                & (CompanyMember.user_id == CompanyUserScoreStats.user_id),
+            )
+            .where(CompanyUserScoreStats.company_id == company_id)
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
+
+    @provide_read_only_session
+    async def get_quiz_member_score_totals(self, company_id: UUID, session: AsyncSession) -> list[Row]:
+        """(quiz_id, user_id, score_sum, attempts_count) of each current member at each quiz of the company."""
+        stmt = (
+            select(
+                UserQuizAttempt.quiz_id,
+                UserQuizAttempt.user_id,
+                func.sum(UserQuizAttempt.score).label("score_sum"),
+                func.count().label("attempts_count"),
+            )
+            .join(
+                CompanyMember,
+                (CompanyMember.company_id == UserQuizAttempt.company_id)
+                & (CompanyMember.user_id == UserQuizAttempt.user_id),
+            )
+            .where(UserQuizAttempt.company_id == company_id)
+            .group_by(UserQuizAttempt.quiz_id, UserQuizAttempt.user_id)
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
@@ -0,0 +1,113 @@
+import json
+import time
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.schemas.quiz_schemas import QuizAttemptRedisSchema
+
+DETAIL_PREFIX = "attempts:detail:"
+
+# Fetches the newest ARGV[1] attempts of a user with their details, in one round trip.
+# KEYS[1] is the user's history, KEYS[2] is set once it was completed from Postgres.
+RECENT_ATTEMPTS_SCRIPT = """
+local ids = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+local attempts = {}
+for _, id in ipairs(ids) do
+    local attempt = redis.call('HGETALL', ARGV[2] .. id)
+    if #attempt > 0 then
+        attempts[#attempts + 1] = attempt
+    end
+end
+return {redis.call('EXISTS', KEYS[2]), attempts}
+"""
+
+# Details of the latest attempt of a user at a quiz, KEYS[1] holds its id.
+LATEST_ATTEMPT_SCRIPT = """
+local id = redis.call('GET', KEYS[1])
+if not id then
+    return {}
+end
+return redis.call('HGETALL', ARGV[1] .. id)
+"""
+
+
+class AttemptHistoryRepository:
+    """
+    Recent quiz attempts of every user, kept in Redis:
+
+    - attempts:user:{user_id} is a sorted set of the user's attempt ids scored by attempt time,
+      capped at `size` entries;
+    - attempts:detail:{attempt_id} is a hash with the attempt's result, expiring after `ttl`;
+    - attempts:latest:{user_id}:{quiz_id} is the id of the user's latest attempt at the quiz.
+
+    The history of a user is only complete when every attempt was recorded here; once it has been
+    completed from Postgres, attempts:user:{user_id}:complete says so until the details expire.
+    """
+
+    def __init__(self, client: redis.Redis, ttl: int, size: int):
+        self.client = client
+        self.ttl = ttl
+        self.size = size
+        self._recent_attempts = client.register_script(RECENT_ATTEMPTS_SCRIPT)
+        self._latest_attempt = client.register_script(LATEST_ATTEMPT_SCRIPT)
+
+    @staticmethod
+    def _history_key(user_id: UUID) -> str:
+        return f"attempts:user:{user_id}"
+
+    @staticmethod
+    def _complete_key(user_id: UUID) -> str:
+        return f"attempts:user:{user_id}:complete"
+
+    @staticmethod
+    def _latest_key(user_id: UUID, quiz_id: UUID) -> str:
+        return f"attempts:latest:{user_id}:{quiz_id}"
+
+    @staticmethod
+    def _to_hash(attempt: QuizAttemptRedisSchema) -> dict[str, str]:
+        data = attempt.model_dump(mode="json")
+        data["answers_detail"] = json.dumps(data["answers_detail"])
+        return {key: str(value) for key, value in data.items()}
+
+    @staticmethod
+    def _from_hash(fields: list[str] | dict[str, str]) -> QuizAttemptRedisSchema:
+        if isinstance(fields, list):
+            fields = dict(zip(fields[::2], fields[1::2]))
+        fields["answers_detail"] = json.loads(fields["answers_detail"])
+        return QuizAttemptRedisSchema.model_validate(fields)
+
+    def _add_to_pipeline(self, pipe, attempt: QuizAttemptRedisSchema) -> None:
+        detail_key = f"{DETAIL_PREFIX}{attempt.id}"
+        history_key = self._history_key(attempt.user_id)
+        pipe.hset(detail_key, mapping=self._to_hash(attempt))
+        pipe.expire(detail_key, self.ttl)
+        pipe.zadd(history_key, {str(attempt.id): attempt.last_attempt_time.timestamp()})
+        pipe.zremrangebyrank(history_key, 0, -self.size - 1)
+        pipe.expire(history_key, self.ttl)
+
+    async def add(self, attempt: QuizAttemptRedisSchema) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            self._add_to_pipeline(pipe, attempt)
+            pipe.set(self._latest_key(attempt.user_id, attempt.quiz_id), str(attempt.id), ex=self.ttl)
+            await pipe.execute()
+
+    async def complete(self, user_id: UUID, attempts: list[QuizAttemptRedisSchema]) -> None:
+        """Store attempts read from Postgres and mark the user's history as complete."""
+        async with self.client.pipeline(transaction=True) as pipe:
+            for attempt in attempts:
+                self._add_to_pipeline(pipe, attempt)
+            # Expires with the details stored here, so the mark never outlives them.
+            pipe.set(self._complete_key(user_id), int(time.time()), ex=self.ttl)
+            await pipe.execute()
+
+    async def get_recent(self, user_id: UUID, limit: int) -> tuple[list[QuizAttemptRedisSchema], bool]:
+        """The user's newest attempts, and whether they are all of them."""
+        complete, attempts = await self._recent_attempts(
+            keys=[self._history_key(user_id), self._complete_key(user_id)], args=[limit, DETAIL_PREFIX]
+        )
+        return [self._from_hash(attempt) for attempt in attempts], bool(complete)
+
+    async def get_latest(self, user_id: UUID, quiz_id: UUID) -> QuizAttemptRedisSchema | None:
+        attempt = await self._latest_attempt(keys=[self._latest_key(user_id, quiz_id)], args=[DETAIL_PREFIX])
+        return self._from_hash(attempt) if attempt else None
@@ -0,0 +1,112 @@
+import json
+from datetime import UTC, datetime
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.schemas.quiz_schemas import AttemptSessionRedisSchema
+
+DEADLINES_KEY = "quiz:sessions:deadlines"
+
+# Saves ARGV[4] as the answers to question ARGV[3] of session ARGV[1] if it is still open at time ARGV[2]:
+# listed in the deadlines sorted set KEYS[2], which it leaves once it is being finalized, and not past
+# its deadline. KEYS[1] is the answers hash of the session. Returns 1 when saved, 0 when closed.
+SAVE_ANSWER_SCRIPT = """
+local deadline = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if not deadline or tonumber(ARGV[2]) > tonumber(deadline) then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+return 1
+"""
+
+
+def _timestamp(moment: datetime) -> float:
+    # Times are naive UTC, like the database clock.
+    return moment.replace(tzinfo=UTC).timestamp()
+
+
+class AttemptSessionRepository:
+    """
+    Attempts in progress, kept in Redis until they are submitted or their deadline passes:
+
+    - quiz:session:{session_id} is the session: who started it and the questions they were served;
+    - quiz:session:{session_id}:answers is a hash of the ids of the answers saved, as a JSON list,
+      by question id, with an empty string for the questions served but not answered;
+    - quiz:sessions:deadlines is a sorted set of the ids of the sessions not finalized yet, scored by
+      their deadline, from which the finalize_attempt_sessions task picks those whose time is up.
+
+    Both keys of a session expire `retention` seconds after its deadline, should the task not have
+    finalized it by then.
+    """
+
+    def __init__(self, client: redis.Redis, retention: int):
+        self.client = client
+        self.retention = retention
+        self._save_answer = client.register_script(SAVE_ANSWER_SCRIPT)
+
+    @staticmethod
+    def _key(session_id: UUID) -> str:
+        return f"quiz:session:{session_id}"
+
+    @staticmethod
+    def _answers_key(session_id: UUID) -> str:
+        return f"quiz:session:{session_id}:answers"
+
+    async def add(self, session: AttemptSessionRedisSchema) -> None:
+        key, answers_key = self._key(session.draw_id), self._answers_key(session.draw_id)
+        expires_at = int(_timestamp(session.deadline)) + self.retention
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(key, session.model_dump_json(), exat=expires_at)
+            if session.question_ids:
+                # Created with the session so that it expires with it, saving answers only sets fields.
+                pipe.hset(answers_key, mapping={str(question_id): "" for question_id in session.question_ids})
+                pipe.expireat(answers_key, expires_at)
+            pipe.zadd(DEADLINES_KEY, {str(session.draw_id): _timestamp(session.deadline)})
+            await pipe.execute()
+
+    async def get(self, session_id: UUID) -> AttemptSessionRedisSchema | None:
+        value = await self.client.get(self._key(session_id))
+        return AttemptSessionRedisSchema.model_validate_json(value) if value is not None else None
+
+    async def get_answers(self, session_id: UUID) -> dict[UUID, list[UUID]]:
+        """The answers saved so far, by question id."""
+        saved = await self.client.hgetall(self._answers_key(session_id))
+        return {
+            UUID(question_id): [UUID(answer_id) for answer_id in json.loads(value)]
+            for question_id, value in saved.items()
+            if value
+        }
+
+    async def save_answer(self, session_id: UUID, question_id: UUID, answer_ids: list[UUID] | None) -> bool:
+        """
+        Save the answers chosen for a question, None clearing them, in one round trip.
+        False when the session is being finalized or past its deadline, nothing is saved then.
+        """
+        value = "" if answer_ids is None else json.dumps([str(answer_id) for answer_id in answer_ids])
+        saved = await self._save_answer(
+            keys=[self._answers_key(session_id), DEADLINES_KEY],
+            args=[str(session_id), datetime.now(UTC).timestamp(), str(question_id), value],
+        )
+        return bool(saved)
+
+    async def get_due(self, limit: int) -> list[UUID]:
+        """Ids of the sessions whose deadline has passed, earliest first."""
+        session_ids = await self.client.zrangebyscore(
+            DEADLINES_KEY, "-inf", datetime.now(UTC).timestamp(), start=0, num=limit
+        )
+        return [UUID(session_id) for session_id in session_ids]
+
+    async def claim(self, session_id: UUID) -> bool:
+        """
+        Take the session out of the deadlines to finalize it, which closes it to further answers.
+        Of the callers finalizing a session at the same time, only one gets True.
+        """
+        return bool(await self.client.zrem(DEADLINES_KEY, str(session_id)))
+
+    async def release(self, session: AttemptSessionRedisSchema) -> None:
+        """Put back a claimed session that couldn't be finalized, to be finalized later."""
+        await self.client.zadd(DEADLINES_KEY, {str(session.draw_id): _timestamp(session.deadline)})
+
+    async def delete(self, session_id: UUID) -> None:
+        await self.client.delete(self._key(session_id), self._answers_key(session_id))
@@ -1,26 +1,30 @@
-from typing import Sequence, Tuple
-from uuid import UUID
+from typing import Sequence
+from uuid import UUID, uuid4
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import Row, and_, delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
 
 from app.core.interfaces.company_repo_interface import AbstractCompanyRepository
+from app.core.schemas.access_schemas import AccessContext
 from app.infrastructure.postgres.models import Answer, Company, Question, Quiz, User, UserQuizAttempt
 from app.infrastructure.postgres.models.company import CompanyInvitation, CompanyMember
 from app.infrastructure.postgres.models.enums import CompanyMemberRole, CompanyStatus, InvitationStatus, InvitationType
-from app.infrastructure.postgres.session_manager import provide_async_session
+from app.infrastructure.postgres.pagination import CountStrategy, Page, paginate
+from app.infrastructure.postgres.session_manager import provide_async_session, provide_read_only_session
+from app.infrastructure.redis.membership_cache import invalidate_membership_on_commit
 
 
 class CompanyRepository(AbstractCompanyRepository):
     @provide_async_session
     async def create(self, company: Company, session: AsyncSession) -> Company:
         session.add(company)
-        await session.commit()
+        await session.flush()
         await session.refresh(company)
         return company
 
-    @provide_async_session
+    @provide_read_only_session
     async def check_if_company_exists(
         self, company_email: str, owner_id: UUID, session: AsyncSession
     ) -> Company | None:
@@ -28,59 +32,87 @@ class CompanyRepository(AbstractCompanyRepository):
         company = await session.execute(query)
         return company.scalar_one_or_none()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get(self, company_id: int, owner_id: UUID | None, session: AsyncSession) -> Company | None:
         constraints = [Company.id == company_id]
         if owner_id:
             constraints.append(Company.owner_id == owner_id)
 
-        query = (
-            select(Company)
-            .options(selectinload(Company.members))
-            .where(*constraints)
-        )
+        query = select(Company).where(*constraints)
 
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
+    @provide_read_only_session
+    async def get_access_context(
+        self,
+        company_id: UUID,
+        user_id: UUID,
+        session: AsyncSession,
+        quiz_id: UUID | None = None,
+        with_questions: bool = False,
+    ) -> AccessContext | None:
+        """
+        Load the company, the user's role in it and optionally one of its quizzes in a single query.
+        Returns None when the company doesn't exist; `role` is None for non-members and `quiz` is None
+        when the quiz doesn't belong to the company. Questions and answers of the quiz are only loaded
+        when `with_questions` is set.
+        """
+        query = (
+            select(Company, CompanyMember.role)
+            .outerjoin(CompanyMember, and_(CompanyMember.company_id == Company.id, CompanyMember.user_id == user_id))
+            .where(Company.id == company_id)
+            .limit(1)
+        )
+        if quiz_id is not None:
+            query = query.add_columns(Quiz).outerjoin(Quiz, and_(Quiz.company_id == Company.id, Quiz.id == quiz_id))
+            if not with_questions:
+                query = query.options(lazyload(Quiz.questions))
+
+        row = (await session.execute(query)).first()
+        if row is None:
+            return None
+
+        company, role = row[0], row[1]
+        # Owner powers come from Company.owner_id alone, whatever the owner's membership row says;
+        # a membership row claiming ownership of someone else's company counts as a plain member.
+        if company.owner_id == user_id:
+            role = CompanyMemberRole.OWNER
+        elif role == CompanyMemberRole.OWNER:
+            role = CompanyMemberRole.MEMBER
+        return AccessContext(company=company, role=role, quiz=row[2] if quiz_id is not None else None)
+
     @provide_async_session
     async def update(self, company: Company, updates: dict, session: AsyncSession) -> Company:
         company = await session.merge(company)
         for key, value in updates.items():
             if value is not None:
                 setattr(company, key, value)
-        await session.commit()
+        await session.flush()
         await session.refresh(company)
         return company
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_companies_for_owner(self, owner_id: UUID, session: AsyncSession) -> Sequence[Company]:
         query = select(Company).where(Company.owner_id == owner_id)
         result = await session.execute(query)
         return result.scalars().all()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_companies_for_owner_paginated(
-        self, owner_id: UUID, limit: int, offset: int, session: AsyncSession
-    ) -> Tuple[list[Company], int]:
+        self,
+        owner_id: UUID,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Company]:
         """Get paginated companies for owner with total count."""
-        # Get total count
-        count_query = select(func.count(Company.id)).where(Company.owner_id == owner_id)
-        total_result = await session.execute(count_query)
-        total = total_result.scalar()
-
-        # Get paginated results
-        query = (
-            select(Company)
-            .where(Company.owner_id == owner_id)
-            .order_by(Company.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        query = select(Company).where(Company.owner_id == owner_id)
+        return await paginate(
+            session, query, Company, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
         )
-        result = await session.execute(query)
-        companies = result.scalars().all()
-
-        return list(companies), total
 
     @provide_async_session
     async def delete(self, company: Company, owner_id: UUID, session: AsyncSession) -> bool:
@@ -94,25 +126,24 @@ class CompanyRepository(AbstractCompanyRepository):
         await session.execute(delete(Question).where(Question.quiz_id.in_(quiz_ids)))
         await session.execute(delete(Quiz).where(Quiz.company_id == company.id))
         await session.execute(delete(Company).where(Company.id == company.id, Company.owner_id == owner_id))
-        await session.commit()
+        await session.flush()
+        invalidate_membership_on_commit(session, company_id=company.id)
         return True
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_all_companies_paginated(
-        self, limit: int, offset: int, session: AsyncSession
-    ) -> Tuple[list[Company], int]:
+        self,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Company]:
         """Get paginated companies with total count."""
-        # Get total count
-        count_query = select(func.count(Company.id))
-        total_result = await session.execute(count_query)
-        total = total_result.scalar()
-
-        # Get paginated results
-        query = select(Company).where(Company.company_status == CompanyStatus.VISIBLE).order_by(Company.created_at.desc()).limit(limit).offset(offset)
-        result = await session.execute(query)
-        companies = result.scalars().all()
-
-        return list(companies), total
+        query = select(Company).where(Company.company_status == CompanyStatus.VISIBLE)
+        return await paginate(
+            session, query, Company, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
+        )
 
     @provide_async_session
     async def invite_user_to_company(
@@ -126,11 +157,81 @@ class CompanyRepository(AbstractCompanyRepository):
         }
         invitation = CompanyInvitation(**query)
         session.add(invitation)
-        await session.commit()
+        await session.flush()
         await session.refresh(invitation)
         return invitation
 
+    @provide_read_only_session
+    async def get_invite_candidates(self, company: Company, emails: Sequence[str], session: AsyncSession) -> list[Row]:
+        """
+        (id, email, is_member, is_invited) of each user with one of these emails, in one query: whether
+        they are a member of the company, and whether they have a pending invitation or membership
+        request to it.
+        """
+        is_member = (
+            select(CompanyMember.id)
+            .where(CompanyMember.company_id == company.id, CompanyMember.user_id == User.id)
+            .exists()
+        )
+        is_invited = (
+            select(CompanyInvitation.id)
+            .where(
+                CompanyInvitation.company_id == company.id,
+                CompanyInvitation.invited_user_id == User.id,
+                CompanyInvitation.status == InvitationStatus.PENDING,
+            )
+            .exists()
+        )
+        query = select(
+            User.id, User.email, is_member.label("is_member"), is_invited.label("is_invited")
+        ).where(User.email.in_(emails))
+        result = await session.execute(query)
+        return list(result.all())
+
     @provide_async_session
+    async def invite_users_to_company(
+        self,
+        company: Company,
+        user_ids: Sequence[UUID],
+        invited_by: User,
+        invitation_type: InvitationType,
+        session: AsyncSession,
+    ) -> dict[UUID, UUID]:
+        """
+        Invite the users with multi-row inserts. A user who already has a pending invitation of this
+        type, made concurrently for instance, is skipped by the uq_company_invitations_pending index.
+        Returns the id of the new invitation of each user who was invited.
+        """
+        if not user_ids:
+            return {}
+        stmt = (
+            pg_insert(CompanyInvitation)
+            .on_conflict_do_nothing(
+                index_elements=["company_id", "invited_user_id", "invitation_type"],
+                # Inline, as a bound parameter would keep Postgres from matching the partial index.
+                index_where=text("status = 'PENDING'"),
+            )
+            .returning(CompanyInvitation.invited_user_id, CompanyInvitation.id)
+        )
+        # Executed with a list of rows, the statement is compiled once and sent as multi-row
+        # INSERTs of a page of rows each, rather than compiled with a VALUES clause of every row.
+        result = await session.execute(
+            stmt,
+            [
+                {
+                    "id": uuid4(),
+                    "company_id": company.id,
+                    "invited_user_id": user_id,
+                    "invited_by_id": invited_by.id,
+                    "invitation_type": invitation_type,
+                    "status": InvitationStatus.PENDING,
+                }
+                for user_id in user_ids
+            ],
+        )
+        return dict(result.tuples().all())
+
+    @provide_read_only_session
     async def check_if_invite_exists(
         self, company: Company, invite_user: User, status: InvitationStatus, session: AsyncSession
     ) -> CompanyInvitation | None:
@@ -142,7 +243,7 @@ class CompanyRepository(AbstractCompanyRepository):
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_invitation_by_id(self, invitation_id: UUID, session: AsyncSession) -> CompanyInvitation | None:
         query = select(CompanyInvitation).where(
             CompanyInvitation.id == invitation_id, CompanyInvitation.status == InvitationStatus.PENDING
@@ -158,10 +259,11 @@ class CompanyRepository(AbstractCompanyRepository):
         query = {"company_id": company.id, "user_id": user_id, "role": role}
         company_member = CompanyMember(**query)
         session.add(company_member)
-        await session.commit()
+        await session.flush()
         await session.refresh(company_member)
+        invalidate_membership_on_commit(session, company_id=company.id, user_id=user_id)
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_company_members(
         self, company: Company, session: AsyncSession
     ) -> Sequence[tuple[User, CompanyMember]]:
@@ -182,14 +284,14 @@ class CompanyRepository(AbstractCompanyRepository):
 
         return user_member_pairs
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_company_member(self, company: Company, user_id: UUID, session: AsyncSession) -> CompanyMember | None:
         """Get a specific company member."""
         query = select(CompanyMember).where(CompanyMember.company_id == company.id, CompanyMember.user_id == user_id)
         result = await session.execute(query)
         return result.scalars().first()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_invitations_for_user(
         self, user: User, session: AsyncSession
     ) -> Sequence[CompanyInvitation]:
@@ -206,7 +308,7 @@ class CompanyRepository(AbstractCompanyRepository):
         result = await session.execute(stmt)
         return result.scalars().all()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_invitations_for_company(
         self, company: Company, session: AsyncSession
     ) -> Sequence[CompanyInvitation]:
@@ -223,7 +325,7 @@ class CompanyRepository(AbstractCompanyRepository):
         result = await session.execute(stmt)
         return result.scalars().all()
 
-    @provide_async_session
+    @provide_read_only_session
     async def check_if_user_is_company_member(self, company: Company, user_id: UUID, session: AsyncSession) -> bool:
         query = select(CompanyMember).where(CompanyMember.company_id == company.id, CompanyMember.user_id == user_id)
 
@@ -240,7 +342,8 @@ class CompanyRepository(AbstractCompanyRepository):
         company_member = result.scalar_one_or_none()
 
         await session.delete(company_member)
-        await session.commit()
+        await session.flush()
+        invalidate_membership_on_commit(session, company_id=company.id, user_id=user_id)
 
     @provide_async_session
     async def change_member_role(
@@ -254,8 +357,9 @@ class CompanyRepository(AbstractCompanyRepository):
         result = await session.execute(query)
         user, company_member = result.one_or_none()
         company_member.role = new_role
-        await session.commit()
+        await session.flush()
         await session.refresh(company_member)
+        invalidate_membership_on_commit(session, company_id=company.id, user_id=user_id)
         return user, company_member
 
     @provide_async_session
@@ -270,9 +374,9 @@ class CompanyRepository(AbstractCompanyRepository):
         for invitation in invitations:
             await session.delete(invitation)
 
-        await session.commit()
+        await session.flush()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_companies_for_member(self, user_id: UUID, session: AsyncSession) -> Sequence[Company]:
         """Get companies where user is a member (not owner)."""
         query = (
@@ -284,39 +388,31 @@ class CompanyRepository(AbstractCompanyRepository):
         result = await session.execute(query)
         return result.scalars().all()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_companies_for_member_paginated(
-        self, user_id: UUID, limit: int, offset: int, session: AsyncSession
-    ) -> Tuple[list[Company], int]:
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Company]:
         """Get paginated companies where user is a member (not owner) with total count."""
-        # Get total count
-        count_query = (
-            select(func.count(Company.id))
-            .join(CompanyMember, CompanyMember.company_id == Company.id)
-            .where(CompanyMember.user_id == user_id, Company.owner_id != user_id)
-        )
-        total_result = await session.execute(count_query)
-        total = total_result.scalar()
-
-        # Get paginated results
         query = (
             select(Company)
             .join(CompanyMember, CompanyMember.company_id == Company.id)
             .where(CompanyMember.user_id == user_id, Company.owner_id != user_id)
-            .order_by(Company.created_at.desc())
-            .limit(limit)
-            .offset(offset)
         )
-        result = await session.execute(query)
-        companies = result.scalars().all()
-
-        return list(companies), total
+        return await paginate(
+            session, query, Company, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
+        )
 
     @provide_async_session
     async def cancel_invitation(self, invitation: CompanyInvitation, session: AsyncSession):
         invitation = await session.merge(invitation)
         invitation.status = InvitationStatus.CANCELED
-        await session.commit()
+        await session.flush()
         await session.refresh(invitation)
 
 
@@ -324,19 +420,19 @@ class CompanyRepository(AbstractCompanyRepository):
     async def accept_invitation(self, invitation: CompanyInvitation, session: AsyncSession) -> None:
         invitation = await session.merge(invitation)
         invitation.status = InvitationStatus.ACCEPTED
-        await session.commit()
+        await session.flush()
         await session.refresh(invitation)
 
     @provide_async_session
     async def reject_invitation(self, invitation: CompanyInvitation, session: AsyncSession) -> None:
         invitation = await session.merge(invitation)
         invitation.status = InvitationStatus.REJECTED
-        await session.commit()
+        await session.flush()
         await session.refresh(invitation)
 
     @provide_async_session
     async def decline_invitation(self, invitation: CompanyInvitation, session: AsyncSession) -> None:
         invitation = await session.merge(invitation)
         invitation.status = InvitationStatus.DECLINED
-        await session.commit()
+        await session.flush()
         await session.refresh(invitation)
\ No newline at end of file
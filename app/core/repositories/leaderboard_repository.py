@@ -0,0 +1,98 @@
+from uuid import UUID
+
+import redis.asyncio as redis
+
+# Adds a score to the running average of ARGV[1] on each leaderboard of KEYS, given in
+# (board, totals) pairs: the totals hash keeps the sum and count the average is worked out from.
+RECORD_SCORE_SCRIPT = """
+for i = 1, #KEYS, 2 do
+    local total = redis.call('HINCRBYFLOAT', KEYS[i + 1], ARGV[1] .. ':sum', ARGV[2])
+    local count = redis.call('HINCRBY', KEYS[i + 1], ARGV[1] .. ':count', 1)
+    redis.call('ZADD', KEYS[i], tonumber(total) / count, ARGV[1])
+end
+"""
+
+# Totals of a user's scores, as (sum, count).
+Totals = tuple[float, int]
+
+
+class LeaderboardRepository:
+    """
+    Average scores of the members of each company and of the users of each quiz, kept in Redis:
+
+    - leaderboard:company:{company_id} and leaderboard:quiz:{quiz_id} are sorted sets of user ids
+      scored by their average score, so a rank is a ZREVRANK and a page a ZREVRANGE;
+    - each has a :totals hash with the {user_id}:sum and {user_id}:count of the user's scores.
+
+    Postgres stays the source of truth, `replace_company` rebuilds the boards of a company from it.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self._record_score = client.register_script(RECORD_SCORE_SCRIPT)
+
+    @staticmethod
+    def company_board(company_id: UUID) -> str:
+        return f"leaderboard:company:{company_id}"
+
+    @staticmethod
+    def quiz_board(quiz_id: UUID) -> str:
+        return f"leaderboard:quiz:{quiz_id}"
+
+    async def record(self, company_id: UUID, quiz_id: UUID, user_id: UUID, score: float) -> None:
+        company_board, quiz_board = self.company_board(company_id), self.quiz_board(quiz_id)
+        await self._record_score(
+            keys=[company_board, f"{company_board}:totals", quiz_board, f"{quiz_board}:totals"], args=[str(user_id), score]
+        )
+
+    async def get_page(self, board: str, limit: int, offset: int) -> tuple[list[tuple[UUID, float]], int]:
+        """Users of a page of the board, best first, with their average, and the number of users on it."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(board, offset, offset + limit - 1, withscores=True)
+            pipe.zcard(board)
+            entries, total = await pipe.execute()
+        return [(UUID(user_id), score) for user_id, score in entries], total
+
+    async def get_rank(self, board: str, user_id: UUID) -> tuple[int, float] | None:
+        """Zero-based rank of the user on the board and their average, None when they aren't on it."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(board, str(user_id))
+            pipe.zscore(board, str(user_id))
+            rank, score = await pipe.execute()
+        return None if rank is None else (rank, score)
+
+    async def replace_company(
+        self, company_id: UUID, company_totals: dict[UUID, Totals], quiz_totals: dict[UUID, dict[UUID, Totals]]
+    ) -> None:
+        """
+        Replace the boards of the company and its quizzes with ones built from these totals. The new
+        boards are written under temporary keys and renamed over the old ones in one transaction,
+        so readers see either board in full.
+        """
+        boards = {self.company_board(company_id): company_totals}
+        boards.update((self.quiz_board(quiz_id), totals) for quiz_id, totals in quiz_totals.items())
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for board, totals in boards.items():
+                if not totals:
+                    continue
+                pipe.delete(f"{board}:rebuild", f"{board}:totals:rebuild")
+                pipe.zadd(f"{board}:rebuild", {str(user_id): total / count for user_id, (total, count) in totals.items()})
+                pipe.hset(
+                    f"{board}:totals:rebuild",
+                    mapping={
+                        f"{user_id}:{field}": value
+                        for user_id, (total, count) in totals.items()
+                        for field, value in (("sum", total), ("count", count))
+                    },
+                )
+            await pipe.execute()
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            for board, totals in boards.items():
+                if totals:
+                    pipe.rename(f"{board}:rebuild", board)
+                    pipe.rename(f"{board}:totals:rebuild", f"{board}:totals")
+                else:
+                    pipe.delete(board, f"{board}:totals")
+            await pipe.execute()
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+
+from app.core.schemas.quiz_schemas import AnswerInputSchema, QuestionInputSchema, QuizInputSchema
+from app.infrastructure.postgres.models import Answer, Quiz
+from app.utils.exceptions import ConflictError, ObjectNotFound
+
+
+@dataclass
+class QuizDiff:
+    """Rows to insert, update and delete to turn a stored quiz into the submitted one."""
+
+    quiz_changes: dict = field(default_factory=dict)
+    question_inserts: list[dict] = field(default_factory=list)
+    question_updates: list[dict] = field(default_factory=list)
+    question_deletes: list[UUID] = field(default_factory=list)
+    answer_inserts: list[dict] = field(default_factory=list)
+    answer_updates: list[dict] = field(default_factory=list)
+    answer_deletes: list[UUID] = field(default_factory=list)
+    # Final (position ordered) ids of the questions, and of the answers of every question.
+    question_order: list[UUID] = field(default_factory=list)
+    answer_order: dict[UUID, list[UUID]] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.quiz_changes
+            or self.question_inserts
+            or self.question_updates
+            or self.question_deletes
+            or self.answer_inserts
+            or self.answer_updates
+            or self.answer_deletes
+        )
+
+
+def _match(existing: list, payloads: list, model_name: str) -> list:
+    """
+    Pair every payload item with the stored row it edits, or None for new rows.
+    Items sent with an id match that row; the others take the stored row at their position,
+    unless that row was already claimed by id.
+    """
+    by_id = {row.id: row for row in existing}
+    claimed = set()
+    for payload in payloads:
+        if payload.id is None:
+            continue
+        if payload.id not in by_id:
+            raise ObjectNotFound(model_name=model_name, id_=payload.id)
+        if payload.id in claimed:
+            raise ConflictError(f"{model_name} {payload.id} is submitted more than once.")
+        claimed.add(payload.id)
+
+    matches = []
+    for position, payload in enumerate(payloads):
+        if payload.id is not None:
+            matches.append(by_id[payload.id])
+        elif position < len(existing) and existing[position].id not in claimed:
+            claimed.add(existing[position].id)
+            matches.append(existing[position])
+        else:
+            matches.append(None)
+    return matches
+
+
+def _diff_answers(question_id: UUID, existing: list[Answer], payloads: list[AnswerInputSchema], diff: QuizDiff):
+    order = []
+    matches = _match(existing, payloads, model_name="Answer")
+    for position, (answer, payload) in enumerate(zip(matches, payloads)):
+        values = {"answer_text": payload.answer_text, "is_correct": payload.is_correct, "position": position}
+        if answer is None:
+            answer_id = uuid4()
+            diff.answer_inserts.append({"id": answer_id, "question_id": question_id, **values})
+        else:
+            answer_id = answer.id
+            if any(getattr(answer, key) != value for key, value in values.items()):
+                diff.answer_updates.append({"id": answer_id, **values})
+        order.append(answer_id)
+
+    kept = set(order)
+    diff.answer_deletes.extend(answer.id for answer in existing if answer.id not in kept)
+    diff.answer_order[question_id] = order
+
+
+def _diff_questions(quiz: Quiz, payloads: list[QuestionInputSchema], diff: QuizDiff):
+    matches = _match(quiz.questions, payloads, model_name="Question")
+    for position, (question, payload) in enumerate(zip(matches, payloads)):
+        values = {"question_text": payload.question_text, "position": position}
+        if question is None:
+            question_id = uuid4()
+            diff.question_inserts.append({"id": question_id, "quiz_id": quiz.id, **values})
+            _diff_answers(question_id, [], payload.answers, diff)
+        else:
+            question_id = question.id
+            if any(getattr(question, key) != value for key, value in values.items()):
+                diff.question_updates.append({"id": question_id, **values})
+            _diff_answers(question_id, question.answers, payload.answers, diff)
+        diff.question_order.append(question_id)
+
+    kept = set(diff.question_order)
+    # Answers of deleted questions go with them (ON DELETE CASCADE), they aren't listed separately.
+    diff.question_deletes.extend(question.id for question in quiz.questions if question.id not in kept)
+
+
+def diff_quiz(quiz: Quiz, quiz_payload: QuizInputSchema) -> QuizDiff:
+    """Compare a stored quiz (with questions and answers loaded) against the submitted payload."""
+    diff = QuizDiff()
+    for key in ("title", "description", "sample_size", "time_limit"):
+        if getattr(quiz, key) != getattr(quiz_payload, key):
+            diff.quiz_changes[key] = getattr(quiz_payload, key)
+    _diff_questions(quiz, quiz_payload.questions, diff)
+    return diff
@@ -0,0 +1,30 @@
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.schemas.quiz_schemas import QuizDrawRedisSchema
+
+
+class QuizDrawRepository:
+    """
+    Questions drawn for attempts not submitted yet, kept in Redis as quiz:draw:{draw_id} until they are
+    answered or `ttl` seconds have passed, so an attempt is graded on the questions it was served.
+    """
+
+    def __init__(self, client: redis.Redis, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(draw_id: UUID) -> str:
+        return f"quiz:draw:{draw_id}"
+
+    async def add(self, draw: QuizDrawRedisSchema) -> None:
+        await self.client.set(self._key(draw.draw_id), draw.model_dump_json(), ex=self.ttl)
+
+    async def get(self, draw_id: UUID) -> QuizDrawRedisSchema | None:
+        value = await self.client.get(self._key(draw_id))
+        return QuizDrawRedisSchema.model_validate_json(value) if value is not None else None
+
+    async def delete(self, draw_id: UUID) -> None:
+        await self.client.delete(self._key(draw_id))
@@ -1,36 +1,83 @@
-from uuid import UUID
+import random
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Sequence
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Row, Select, column, delete, func, insert, literal, select, table, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.interfaces.quiz_repo_interface import AbstractQuizRepository
-from app.core.schemas.quiz_schemas import (
-    AnswerInputSchema,
-    AttemptQuizResultSchema,
-    QuestionInputSchema,
-    QuizInputSchema,
-)
+from app.core.repositories.analytics_repository import AnalyticsRepository
+from app.core.repositories.quiz_diff import QuizDiff, diff_quiz
+from app.core.schemas.export_schemas import AttemptExportFilterSchema
+from app.core.schemas.import_schemas import QUIZ_IMPORT_COLUMNS
+from app.core.schemas.quiz_schemas import AttemptQuizResultSchema, QuizInputSchema, QuizTreeSchema
 from app.infrastructure.postgres.models import Answer, Company, Question, Quiz, User
 from app.infrastructure.postgres.models.quiz import UserQuizAttempt
-from app.infrastructure.postgres.session_manager import provide_async_session
+from app.infrastructure.postgres.pagination import CountStrategy, Page, paginate
+from app.infrastructure.postgres.partitions import add_months, month_start
+from app.infrastructure.postgres.session_manager import (
+    create_streaming_session,
+    provide_async_session,
+    provide_read_only_session,
+)
+from app.infrastructure.redis.quiz_tree_cache import drop_quiz_tree_on_commit, quiz_tree_cache
+
+# Draws must not be predictable from earlier ones, they come from the OS' random source.
+_draw_random = random.SystemRandom()
 
 
 class QuizRepository(AbstractQuizRepository):
+    def __init__(self):
+        # Score statistics are written with the attempts, in the same transaction.
+        self.analytics_repository = AnalyticsRepository()
+
     @provide_async_session
     async def create(self, company: Company, quiz_payload: QuizInputSchema, session: AsyncSession) -> Quiz:
+        """
+        Insert the quiz, its questions and their answers with one multi-row INSERT ... RETURNING each.
+        Ids are generated here, so answers can reference their questions without waiting for the
+        questions insert, and the returned rows are assembled into the quiz without re-reading it.
+        """
         quiz = await self._create_quiz(company=company, quiz_payload=quiz_payload, session=session)
-        for question in quiz_payload.questions:
-            created_question = await self._create_questions(quiz_id=quiz.id, question_payload=question, session=session)
-            for answer in question.answers:
-                await self._create_answers(question_id=created_question.id, answer_payload=answer, session=session)
 
-        await session.commit()
+        question_rows, answer_rows = [], []
+        for question_position, question_payload in enumerate(quiz_payload.questions):
+            question_id = uuid4()
+            question_rows.append(
+                {
+                    "id": question_id,
+                    "quiz_id": quiz.id,
+                    "question_text": question_payload.question_text,
+                    "position": question_position,
+                }
+            )
+            answer_rows.extend(
+                {
+                    "id": uuid4(),
+                    "question_id": question_id,
+                    "answer_text": answer_payload.answer_text,
+                    "is_correct": answer_payload.is_correct,
+                    "position": answer_position,
+                }
+                for answer_position, answer_payload in enumerate(question_payload.answers)
+            )
+
+        questions = await self._create_questions(question_rows=question_rows, session=session)
+        answers = await self._create_answers(answer_rows=answer_rows, session=session)
 
-        created_quiz = await self.get(quiz_id=quiz.id, company=company, session=session)
-        return created_quiz
+        answers_by_question = {question.id: [] for question in questions}
+        for answer in answers:
+            answers_by_question[answer.question_id].append(answer)
+        for question in questions:
+            set_committed_value(question, "answers", answers_by_question[question.id])
+        set_committed_value(quiz, "questions", questions)
+        return quiz
 
-    @provide_async_session
+    @provide_read_only_session
     async def get(self, quiz_id: UUID, company: Company, session: AsyncSession) -> Quiz | None:
         stmt = (
             select(Quiz)
@@ -40,7 +87,7 @@ class QuizRepository(AbstractQuizRepository):
         result = await session.execute(stmt)
         return result.scalars().one_or_none()
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_by_id(self, quiz_id: UUID, session: AsyncSession) -> Quiz | None:
         stmt = (
             select(Quiz).options(selectinload(Quiz.questions).selectinload(Question.answers)).where(Quiz.id == quiz_id)
@@ -48,146 +95,428 @@ class QuizRepository(AbstractQuizRepository):
         result = await session.execute(stmt)
         return result.scalars().one_or_none()
 
+    async def get_tree(self, quiz: Quiz) -> QuizTreeSchema:
+        """
+        Questions and answers of the quiz for scoring, read through the quiz tree cache.
+        `quiz` only needs its id and version loaded, the version decides which cached tree is valid.
+        """
+        tree = await quiz_tree_cache.get(quiz.id, quiz.version)
+        if tree is None:
+            tree = await self._load_tree(quiz_id=quiz.id)
+            await quiz_tree_cache.set(tree)
+        return tree
+
+    @provide_read_only_session
+    async def _load_tree(self, quiz_id: UUID, session: AsyncSession) -> QuizTreeSchema:
+        # The version is read with the quiz and questions and answers right after it, so if the quiz
+        # changes meanwhile the tree is newer than its version, never older: a stale version is never
+        # cached as the current one.
+        stmt = (
+            select(Quiz)
+            .options(selectinload(Quiz.questions).selectinload(Question.answers))
+            .where(Quiz.id == quiz_id)
+            .execution_options(populate_existing=True)
+        )
+        quiz = (await session.execute(stmt)).scalar_one()
+        return QuizTreeSchema.model_validate(quiz)
+
+    @provide_read_only_session
+    async def draw_questions(self, quiz_id: UUID, sample_size: int | None, session: AsyncSession) -> list[Question]:
+        """
+        `sample_size` questions of the quiz, with their answers, drawn at random in a random order, or
+        all of them in order when it is None.
+        Positions run from 0 to the number of questions - 1, so the number of questions is read off the
+        end of the (quiz_id, position) index and a draw picks positions in that range: it looks up
+        `sample_size` rows whatever the size of the bank, where ORDER BY random() would sort all of it.
+        """
+        if sample_size is None:
+            result = await session.execute(
+                select(Question).where(Question.quiz_id == quiz_id).order_by(Question.position)
+            )
+            return list(result.scalars().all())
+
+        last = await session.scalar(select(func.max(Question.position)).where(Question.quiz_id == quiz_id))
+        if last is None:
+            return []
+        positions = _draw_random.sample(range(last + 1), min(sample_size, last + 1))
+        result = await session.execute(
+            select(Question).where(Question.quiz_id == quiz_id, Question.position.in_(positions))
+        )
+        questions = {question.position: question for question in result.scalars().all()}
+        return [questions[position] for position in positions if position in questions]
+
     @provide_async_session
     async def update(self, quiz: Quiz, quiz_payload: QuizInputSchema, session: AsyncSession) -> Quiz:
-        updated_quiz = await self._update_quiz(quiz=quiz, quiz_payload=quiz_payload, session=session)
-        # Update questions and answers logic would go here
-        for question in quiz_payload.questions:
-            updated_question = await self._update_questions(
-                quiz=updated_quiz, question_payload=question, session=session
-            )
-            for answer in question.answers:
-                await self._update_answers(question=updated_question, answer_payload=answer, session=session)
+        """
+        Apply only what differs between the stored quiz and the payload.
+        Questions and answers are matched by id, or by position when sent without one; each kind of
+        change (insert, update, delete) of questions and of answers then runs as a single statement.
+        """
+        # Lock the quiz so concurrent edits are diffed against each other's result, not the same snapshot.
+        stmt = (
+            select(Quiz)
+            .options(selectinload(Quiz.questions).selectinload(Question.answers))
+            .where(Quiz.id == quiz.id)
+            .with_for_update(of=Quiz)
+            .execution_options(populate_existing=True)
+        )
+        quiz = (await session.execute(stmt)).scalar_one()
 
-        await session.commit()
-        quiz = await self.get_by_id(quiz_id=quiz.id, session=session)
+        diff = diff_quiz(quiz, quiz_payload)
+        if not diff.is_empty:
+            await self._apply_diff(quiz=quiz, diff=diff, session=session)
         return quiz
 
     @provide_async_session
     async def delete(self, quiz: Quiz, session: AsyncSession) -> None:
+        quiz = await session.merge(quiz)
         await session.delete(quiz)
-        await session.commit()
+        drop_quiz_tree_on_commit(session, quiz_id=quiz.id, version=quiz.version)
+        await session.flush()
         return None
 
-    @provide_async_session
+    @provide_read_only_session
     async def get_quizzes_by_company(
-        self, company: Company, limit: int, offset: int, session: AsyncSession
-    ) -> tuple[list[Quiz], int]:
-        # Get total count
-        count_query = select(func.count(Quiz.id))
-        total_result = await session.execute(count_query)
-        total = total_result.scalar()
-
+        self,
+        company_id: UUID,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Quiz]:
         query = (
             select(Quiz)
-            .where(Quiz.company_id == company.id)
+            .where(Quiz.company_id == company_id)
             .options(selectinload(Quiz.questions).selectinload(Question.answers))
-            .limit(limit)
-            .offset(offset)
         )
-        result = await session.execute(query)
-        quizzes = result.scalars().all()
-
-        return list(quizzes), total
+        return await paginate(
+            session, query, Quiz, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
+        )
 
     @provide_async_session
     async def record_quiz_attempt(
-        self, user: User, quiz: Quiz, company: Company, score: AttemptQuizResultSchema, session: AsyncSession
+        self,
+        user: User,
+        quiz: Quiz,
+        company: Company,
+        score: AttemptQuizResultSchema,
+        session: AsyncSession,
+        attempt_id: UUID | None = None,
+        attempted_at: datetime | None = None,
     ) -> UserQuizAttempt:
+        given = {}
+        if attempt_id is not None:
+            given["id"] = attempt_id
+        if attempted_at is not None:
+            # Listings order attempts by created_at, which has to be the attempt time as well.
+            given.update(last_attempt_time=attempted_at, created_at=attempted_at)
         user_quiz_attempt = UserQuizAttempt(
+            **given,
             user_id=user.id,
             quiz_id=quiz.id,
             company_id=company.id,
             score=score.score,
             total_questions=score.total_questions,
             correct_answers_count=score.correct_answers_count,
+            quiz_version=score.quiz_version,
+            answer_masks=score.answer_masks,
+            correct_questions=score.correct_questions,
+            question_ids=score.question_ids,
         )
         session.add(user_quiz_attempt)
-        await session.commit()
+        await session.flush()
         await session.refresh(user_quiz_attempt)
+        await self.analytics_repository.add_attempts([user_quiz_attempt], session=session)
         return user_quiz_attempt
 
-    @provide_async_session
-    async def _update_quiz(self, quiz: Quiz, quiz_payload: QuizInputSchema, session: AsyncSession) -> Quiz:
-        smtp = (
-            update(Quiz)
-            .where(Quiz.id == quiz.id)
-            .values(
-                title=quiz_payload.title,
-                description=quiz_payload.description,
-                counter=quiz_payload.counter,
+    @staticmethod
+    async def _newest_attempts(stmt: Select, limit: int, session: AsyncSession) -> list[UserQuizAttempt]:
+        """
+        The newest `limit` attempts selected by `stmt`, looked up in the partition of the current month
+        first: recent attempts are usually all there, and the older partitions are only searched when
+        it has fewer than `limit` of them.
+        """
+        stmt = stmt.order_by(UserQuizAttempt.created_at.desc())
+        boundary = month_start()
+        result = await session.execute(stmt.where(UserQuizAttempt.created_at >= boundary).limit(limit))
+        attempts = list(result.scalars().all())
+        if len(attempts) < limit:
+            result = await session.execute(
+                stmt.where(UserQuizAttempt.created_at < boundary).limit(limit - len(attempts))
             )
-            .returning(Quiz)
+            attempts.extend(result.scalars().all())
+        return attempts
+
+    @provide_read_only_session
+    async def get_user_attempts(self, user_id: UUID, limit: int, session: AsyncSession) -> list[UserQuizAttempt]:
+        stmt = select(UserQuizAttempt).where(UserQuizAttempt.user_id == user_id)
+        return await self._newest_attempts(stmt, limit, session=session)
+
+    @provide_read_only_session
+    async def get_last_user_attempt(
+        self, user_id: UUID, quiz_id: UUID, session: AsyncSession
+    ) -> UserQuizAttempt | None:
+        stmt = select(UserQuizAttempt).where(UserQuizAttempt.user_id == user_id, UserQuizAttempt.quiz_id == quiz_id)
+        attempts = await self._newest_attempts(stmt, 1, session=session)
+        return attempts[0] if attempts else None
+
+    @provide_read_only_session
+    async def get_attempt_answers(self, quiz_id: UUID, quiz_version: int, session: AsyncSession) -> Sequence[Row]:
+        """
+        Score, answer masks, bitmap of the questions answered right and questions served (None when
+        all were) of every attempt at this version of the quiz: one row per attempt, whatever its number
+        of questions.
+        """
+        result = await session.execute(
+            select(
+                UserQuizAttempt.score,
+                UserQuizAttempt.answer_masks,
+                UserQuizAttempt.correct_questions,
+                UserQuizAttempt.question_ids,
+            ).where(UserQuizAttempt.quiz_id == quiz_id, UserQuizAttempt.quiz_version == quiz_version)
         )
-        result = await session.execute(smtp)
-        await session.flush()
+        return result.all()
+
+    @staticmethod
+    def _filter_company_attempts(stmt: Select, company_id: UUID, filters: AttemptExportFilterSchema) -> Select:
+        stmt = stmt.where(UserQuizAttempt.company_id == company_id)
+        if filters.quiz_id is not None:
+            stmt = stmt.where(UserQuizAttempt.quiz_id == filters.quiz_id)
+        if filters.user_id is not None:
+            stmt = stmt.where(UserQuizAttempt.user_id == filters.user_id)
+        if filters.date_from is not None:
+            stmt = stmt.where(UserQuizAttempt.created_at >= filters.date_from)
+        if filters.date_to is not None:
+            stmt = stmt.where(UserQuizAttempt.created_at < filters.date_to)
+        return stmt
+
+    @staticmethod
+    def _select_attempt_rows(*leading_columns) -> Select:
+        """Attempts with the title of their quiz and the email of their user, as exported."""
+        return (
+            select(
+                *leading_columns,
+                UserQuizAttempt.id,
+                UserQuizAttempt.created_at,
+                UserQuizAttempt.quiz_id,
+                Quiz.title.label("quiz_title"),
+                UserQuizAttempt.user_id,
+                User.email.label("user_email"),
+                UserQuizAttempt.score,
+                UserQuizAttempt.correct_answers_count,
+                UserQuizAttempt.total_questions,
+            )
+            .join(Quiz, Quiz.id == UserQuizAttempt.quiz_id)
+            .join(User, User.id == UserQuizAttempt.user_id)
+        )
+
+    @provide_read_only_session
+    async def count_company_attempts(
+        self, company_id: UUID, filters: AttemptExportFilterSchema, limit: int, session: AsyncSession
+    ) -> int:
+        """Number of the company's attempts matching the filters, counting no further than `limit`."""
+        matching = self._filter_company_attempts(select(UserQuizAttempt.id), company_id, filters).limit(limit)
+        result = await session.execute(select(func.count()).select_from(matching.subquery()))
         return result.scalar_one()
 
+    async def stream_company_attempts(
+        self, company_id: UUID, filters: AttemptExportFilterSchema, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        The company's attempts matching the filters, oldest first, in batches read from a server-side
+        cursor, so memory use doesn't grow with the number of attempts.
+        """
+        stmt = (
+            self._select_attempt_rows()
+            .order_by(UserQuizAttempt.created_at, UserQuizAttempt.id)
+            .execution_options(yield_per=batch_size)
+        )
+        stmt = self._filter_company_attempts(stmt, company_id, filters)
+        async with create_streaming_session() as session:
+            result = await session.stream(stmt)
+            async for batch in result.partitions():
+                yield batch
+
+    async def stream_month_attempts(self, month: datetime, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Every attempt made in the month starting at `month`, as the company id followed by the columns
+        of stream_company_attempts, company by company and oldest first, in batches read from a
+        server-side cursor. Only the month's partition is scanned.
+        """
+        stmt = (
+            self._select_attempt_rows(UserQuizAttempt.company_id)
+            .where(UserQuizAttempt.created_at >= month, UserQuizAttempt.created_at < add_months(month, 1))
+            .order_by(UserQuizAttempt.company_id, UserQuizAttempt.created_at, UserQuizAttempt.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async with create_streaming_session() as session:
+            result = await session.stream(stmt)
+            async for batch in result.partitions():
+                yield batch
+
     @provide_async_session
-    async def _update_questions(
-        self, quiz: Quiz, question_payload: QuestionInputSchema, session: AsyncSession
-    ) -> Question:
-        smtp = (
-            update(Question)
-            .where(Question.quiz_id == quiz.id)
-            .values(
-                question_text=question_payload.question_text,
+    async def record_quiz_attempts(self, attempts: list[dict], session: AsyncSession) -> int:
+        """
+        Insert attempts in one multi-row statement, skipping those whose id is already stored,
+        so a batch delivered twice is only written once, nor counted twice in the score statistics.
+        Returns how many rows were new.
+        """
+        stmt = (
+            pg_insert(UserQuizAttempt)
+            .values(attempts)
+            # created_at is the attempt time of a queued attempt, the same on every delivery.
+            .on_conflict_do_nothing(index_elements=[UserQuizAttempt.id, UserQuizAttempt.created_at])
+            .returning(
+                UserQuizAttempt.user_id,
+                UserQuizAttempt.quiz_id,
+                UserQuizAttempt.company_id,
+                UserQuizAttempt.score,
+                UserQuizAttempt.total_questions,
+                UserQuizAttempt.correct_answers_count,
             )
-            .returning(Question)
         )
-        result = await session.execute(smtp)
-        await session.flush()
-        return result.scalar_one()
+        inserted = (await session.execute(stmt)).all()
+        await self.analytics_repository.add_attempts(inserted, session=session)
+        return len(inserted)
 
     @provide_async_session
-    async def _update_answers(
-        self, question: Question, answer_payload: AnswerInputSchema, session: AsyncSession
-    ) -> Answer:
-        smtp = (
-            update(Answer)
-            .where(Answer.question_id == question.id)
-            .values(
-                answer_text=answer_payload.answer_text,
-                is_correct=answer_payload.is_correct,
+    async def stage_quiz_import(self, rows: Iterable[tuple], session: AsyncSession) -> None:
+        """
+        COPY parsed import rows into a temporary staging table, dropped when the transaction ends;
+        merge_quiz_import must run in the same unit of work. `rows` are consumed as they are sent.
+        """
+        await session.execute(
+            text(
+                """
+                CREATE TEMPORARY TABLE quiz_import_rows (
+                    line integer NOT NULL,
+                    quiz_id uuid NOT NULL,
+                    quiz_title varchar(100) NOT NULL,
+                    quiz_description varchar(500) NOT NULL,
+                    question_id uuid NOT NULL,
+                    question_text varchar(500) NOT NULL,
+                    question_position integer NOT NULL,
+                    answer_id uuid NOT NULL,
+                    answer_text varchar(500) NOT NULL,
+                    is_correct boolean NOT NULL,
+                    answer_position integer NOT NULL
+                ) ON COMMIT DROP
+                """
             )
-            .returning(Answer)
         )
-        result = await session.execute(smtp)
-        await session.flush()
-        return result.scalar_one()
+        connection = await (await session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(
+            "quiz_import_rows", records=rows, columns=QUIZ_IMPORT_COLUMNS
+        )
+
+    @provide_async_session
+    async def merge_quiz_import(self, company_id: UUID, session: AsyncSession) -> tuple[int, int, int]:
+        """Insert the staged quizzes, questions and answers, one INSERT ... SELECT each. Returns their counts."""
+        staged = table("quiz_import_rows", *(column(name) for name in QUIZ_IMPORT_COLUMNS))
+        quizzes = await session.execute(
+            insert(Quiz).from_select(
+                ["id", "company_id", "title", "description"],
+                select(staged.c.quiz_id, literal(company_id), staged.c.quiz_title, staged.c.quiz_description)
+                .distinct(staged.c.quiz_id)
+                .order_by(staged.c.quiz_id, staged.c.line),
+            )
+        )
+        questions = await session.execute(
+            insert(Question).from_select(
+                ["id", "quiz_id", "question_text", "position"],
+                select(staged.c.question_id, staged.c.quiz_id, staged.c.question_text, staged.c.question_position)
+                .distinct(staged.c.question_id)
+                .order_by(staged.c.question_id, staged.c.line),
+            )
+        )
+        answers = await session.execute(
+            insert(Answer).from_select(
+                ["id", "question_id", "answer_text", "is_correct", "position"],
+                select(
+                    staged.c.answer_id,
+                    staged.c.question_id,
+                    staged.c.answer_text,
+                    staged.c.is_correct,
+                    staged.c.answer_position,
+                ),
+            )
+        )
+        return quizzes.rowcount, questions.rowcount, answers.rowcount
+
+    @provide_async_session
+    async def _apply_diff(self, quiz: Quiz, diff: QuizDiff, session: AsyncSession) -> None:
+        # Any change to the tree makes a new version, cached copies of the previous one stop being used.
+        stmt = (
+            update(Quiz)
+            .where(Quiz.id == quiz.id)
+            .values(**diff.quiz_changes, version=Quiz.version + 1)
+            .returning(Quiz.version)
+            .execution_options(synchronize_session=False)
+        )
+        drop_quiz_tree_on_commit(session, quiz_id=quiz.id, version=quiz.version)
+        set_committed_value(quiz, "version", (await session.execute(stmt)).scalar_one())
+        if diff.answer_deletes:
+            await session.execute(
+                delete(Answer).where(Answer.id.in_(diff.answer_deletes)).execution_options(synchronize_session=False)
+            )
+        if diff.question_deletes:
+            await session.execute(
+                delete(Question)
+                .where(Question.id.in_(diff.question_deletes))
+                .execution_options(synchronize_session=False)
+            )
+        if diff.question_updates:
+            await session.execute(update(Question), diff.question_updates)
+        if diff.answer_updates:
+            await session.execute(update(Answer), diff.answer_updates)
+        questions = await self._create_questions(question_rows=diff.question_inserts, session=session)
+        answers = await self._create_answers(answer_rows=diff.answer_inserts, session=session)
+
+        # Bring the loaded tree in line with what was written instead of reading it back.
+        for key, value in diff.quiz_changes.items():
+            set_committed_value(quiz, key, value)
+        questions_by_id = {question.id: question for question in (*quiz.questions, *questions)}
+        answers_by_id = {answer.id: answer for question in quiz.questions for answer in question.answers}
+        answers_by_id.update((answer.id, answer) for answer in answers)
+        for rows, objects in ((diff.question_updates, questions_by_id), (diff.answer_updates, answers_by_id)):
+            for row in rows:
+                for key, value in row.items():
+                    set_committed_value(objects[row["id"]], key, value)
+        for question_id in diff.question_order:
+            question_answers = [answers_by_id[answer_id] for answer_id in diff.answer_order[question_id]]
+            set_committed_value(questions_by_id[question_id], "answers", question_answers)
+        set_committed_value(quiz, "questions", [questions_by_id[question_id] for question_id in diff.question_order])
 
     @provide_async_session
     async def _create_quiz(self, company: Company, quiz_payload: QuizInputSchema, session: AsyncSession) -> Quiz:
-        quiz = Quiz(
-            company_id=company.id,
-            title=quiz_payload.title,
-            description=quiz_payload.description,
+        stmt = (
+            insert(Quiz)
+            .values(
+                company_id=company.id,
+                title=quiz_payload.title,
+                description=quiz_payload.description,
+                sample_size=quiz_payload.sample_size,
+                time_limit=quiz_payload.time_limit,
+            )
+            .returning(Quiz)
+            .options(lazyload(Quiz.questions))
         )
-        session.add(quiz)
-        await session.flush()
-        return quiz
+        result = await session.execute(stmt)
+        return result.scalar_one()
 
     @provide_async_session
-    async def _create_questions(
-        self, quiz_id: UUID, question_payload: QuestionInputSchema, session: AsyncSession
-    ) -> Question:
-        question = Question(
-            quiz_id=quiz_id,
-            question_text=question_payload.question_text,
-        )
-        session.add(question)
-        await session.flush()
-        return question
+    async def _create_questions(self, question_rows: list[dict], session: AsyncSession) -> list[Question]:
+        if not question_rows:
+            return []
+        stmt = insert(Question).returning(Question, sort_by_parameter_order=True).options(lazyload(Question.answers))
+        result = await session.execute(stmt, question_rows)
+        return list(result.scalars().all())
 
     @provide_async_session
-    async def _create_answers(
-        self, question_id: UUID, answer_payload: AnswerInputSchema, session: AsyncSession
-    ) -> Answer:
-        answer = Answer(
-            question_id=question_id,
-            answer_text=answer_payload.answer_text,
-            is_correct=answer_payload.is_correct,
-        )
-        session.add(answer)
-        await session.flush()
-        return answer
+    async def _create_answers(self, answer_rows: list[dict], session: AsyncSession) -> list[Answer]:
+        if not answer_rows:
+            return []
+        stmt = insert(Answer).returning(Answer, sort_by_parameter_order=True)
+        result = await session.execute(stmt, answer_rows)
+        return list(result.scalars().all())
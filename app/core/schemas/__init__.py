@@ -1,3 +1,3 @@
-from .pagination_schemas import PaginatedResponse, PaginationMeta, PaginationParams
+from .pagination_schemas import CountStrategy, PaginatedResponse, PaginationMeta, PaginationParams
 
-__all__ = ["PaginationParams", "PaginationMeta", "PaginatedResponse"]
+__all__ = ["CountStrategy", "PaginationParams", "PaginationMeta", "PaginatedResponse"]
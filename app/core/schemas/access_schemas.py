@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from app.infrastructure.postgres.models import Company, Quiz
+from app.infrastructure.postgres.models.enums import CompanyMemberRole
+
+
+@dataclass
+class AccessContext:
+    """A company together with the caller's role in it and, when asked for, one of its quizzes."""
+
+    company: Company
+    role: CompanyMemberRole | None
+    quiz: Quiz | None = None
+
+    @property
+    def is_member(self) -> bool:
+        return self.role is not None
+
+    def has_role(self, *roles: CompanyMemberRole) -> bool:
+        return self.role in roles
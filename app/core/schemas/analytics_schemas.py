@@ -0,0 +1,80 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ScoreStatsSchema(BaseModel):
+    """Score statistics of a set of quiz attempts."""
+
+    attempts_count: int = Field(default=0, description="Number of attempts")
+    average_score: float = Field(default=0.0, description="Mean score of the attempts, in percent")
+    score_stddev: float = Field(default=0.0, description="Sample standard deviation of the scores")
+    pass_rate: float = Field(default=0.0, description="Share of the attempts scoring at least the pass score")
+    accuracy: float = Field(default=0.0, description="Share of all the questions answered that were answered correctly")
+
+    class Config:
+        from_attributes = True
+
+
+class QuizScoreStatsSchema(ScoreStatsSchema):
+    quiz_id: UUID
+
+
+class CompanyScoreStatsSchema(ScoreStatsSchema):
+    company_id: UUID
+
+
+class UserScoreStatsSchema(ScoreStatsSchema):
+    user_id: UUID
+
+
+class CompanyUserScoreStatsSchema(ScoreStatsSchema):
+    company_id: UUID
+    user_id: UUID
+
+
+class LeaderboardEntrySchema(BaseModel):
+    user_id: UUID
+    rank: int = Field(description="Position on the leaderboard, 1 is the best average score")
+    average_score: float
+
+
+class AnswerStatisticsSchema(BaseModel):
+    answer_id: UUID
+    answer_text: str
+    is_correct: bool
+    pick_rate: float = Field(description="Share of the attempts answering the question that chose this answer")
+
+
+class QuestionStatisticsSchema(BaseModel):
+    question_id: UUID
+    question_text: str
+    served: int = Field(description="Number of attempts the question was served in, all of them but for question banks")
+    answered: int = Field(description="Number of attempts that answered the question")
+    percent_correct: float = Field(
+        description="Share of the attempts it was served in that answered the question right, in percent, "
+        "unanswered counting as wrong"
+    )
+    discrimination: float | None = Field(
+        description="Correlation, over the attempts it was served in, between answering the question right and "
+        "the number of other questions answered right; None when either never varies"
+    )
+    answers: list[AnswerStatisticsSchema]
+
+
+class QuizItemStatisticsSchema(BaseModel):
+    """Item statistics of the attempts at one version of a quiz."""
+
+    quiz_id: UUID
+    quiz_version: int
+    attempts_count: int = Field(description="Attempts at this version of the quiz with their answers kept")
+    computed_at: datetime
+    questions: list[QuestionStatisticsSchema]
+
+
+class ItemStatisticsJobSchema(BaseModel):
+    """Item statistics not computed yet, being worked out by a background job."""
+
+    job_id: str
+    status: str = Field(description="PENDING, STARTED, SUCCESS or FAILURE")
@@ -1,3 +1,4 @@
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
@@ -54,6 +55,42 @@ class CompanyInvitationInputSchema(BaseModel):
     invite_user_email: EmailStr
 
 
+# Emails a single bulk invitation request can take.
+BULK_INVITE_MAX_EMAILS = 10_000
+
+
+class CompanyBulkInvitationInputSchema(BaseModel):
+    """Schema for inviting many users to a company at once."""
+
+    company_id: UUID
+    # Plain strings, so an invalid email is reported in its result instead of failing the request.
+    invite_user_emails: list[str] = Field(..., min_length=1, max_length=BULK_INVITE_MAX_EMAILS)
+
+
+class BulkInvitationStatus(StrEnum):
+    INVITED = "invited"
+    ALREADY_INVITED = "already_invited"
+    ALREADY_MEMBER = "already_member"
+    USER_NOT_FOUND = "user_not_found"
+    INVALID_EMAIL = "invalid_email"
+
+
+class BulkInvitationResultSchema(BaseModel):
+    """Outcome of inviting one email of a bulk invitation."""
+
+    email: str
+    status: BulkInvitationStatus
+    invitation_id: UUID | None = None
+
+
+class BulkInvitationReportSchema(BaseModel):
+    """Schema for the outcome of a bulk invitation, one result per distinct email."""
+
+    invited: int
+    skipped: int
+    results: list[BulkInvitationResultSchema]
+
+
 class CompanyInvitationOutputSchema(BaseModel):
     """Schema for company invitation data."""
 
@@ -0,0 +1,26 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class AttemptExportFilterSchema(BaseModel):
+    quiz_id: UUID | None = Field(default=None, description="Only attempts at this quiz")
+    user_id: UUID | None = Field(default=None, description="Only attempts of this user")
+    date_from: datetime | None = Field(default=None, description="Only attempts made at or after this time")
+    date_to: datetime | None = Field(default=None, description="Only attempts made before this time")
+
+
+class ExportJobSchema(BaseModel):
+    """An export handed to a background job, too large to be served inline."""
+
+    job_id: str
+    status: str = Field(description="PENDING, STARTED, SUCCESS or FAILURE")
+    url: str | None = Field(default=None, description="Where the file can be downloaded once the job succeeded")
+    rows: int | None = Field(default=None, description="Number of attempts exported")
@@ -0,0 +1,43 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+# Columns of the quiz import staging table, in the order of the tuples QuizImportParser yields.
+QUIZ_IMPORT_COLUMNS = (
+    "line",
+    "quiz_id",
+    "quiz_title",
+    "quiz_description",
+    "question_id",
+    "question_text",
+    "question_position",
+    "answer_id",
+    "answer_text",
+    "is_correct",
+    "answer_position",
+)
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class QuizImportRowSchema(BaseModel):
+    """One answer of a quiz import file, with the quiz and question it belongs to."""
+
+    quiz_title: str = Field(..., min_length=1, max_length=100)
+    quiz_description: str = Field(default="", max_length=500)
+    question_text: str = Field(..., min_length=1, max_length=500)
+    answer_text: str = Field(..., min_length=1, max_length=500)
+    is_correct: bool = False
+
+
+class QuizImportReportSchema(BaseModel):
+    quizzes: int = Field(description="Quizzes created")
+    questions: int = Field(description="Questions created")
+    answers: int = Field(description="Answers created")
+    rows: int = Field(description="Rows read from the file, one per answer")
+    copy_seconds: float = Field(description="Time spent parsing the file and copying it to the staging table")
+    merge_seconds: float = Field(description="Time spent inserting the staged rows into the quiz tables")
+    rows_per_second: float
@@ -2,6 +2,8 @@ from typing import Generic, TypeVar
 
 from pydantic import BaseModel, Field
 
+from app.infrastructure.postgres.pagination import CountStrategy, Page
+
 T = TypeVar("T")
 
 
@@ -10,16 +12,36 @@ class PaginationParams(BaseModel):
 
     limit: int = Field(default=10, ge=1, le=100, description="Number of items per page")
     offset: int = Field(default=0, ge=0, description="Number of items to skip")
+    cursor: str | None = Field(default=None, description="Cursor of the page to fetch, takes precedence over offset")
+    count: CountStrategy = Field(default=CountStrategy.EXACT, description="How the total number of items is computed")
 
 
 class PaginationMeta(BaseModel):
     """Metadata for pagination response."""
 
-    total: int = Field(description="Total number of items")
+    total: int | None = Field(description="Total number of items, null when the count was skipped")
     limit: int = Field(description="Number of items per page")
     offset: int = Field(description="Number of items skipped")
     has_next: bool = Field(description="Whether there are more items")
     has_previous: bool = Field(description="Whether there are previous items")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque cursor of the next page, pass it back as `cursor` instead of an offset"
+    )
+    count_strategy: CountStrategy = Field(
+        default=CountStrategy.EXACT, description="How `total` was computed, `estimated` totals are approximate"
+    )
+
+    @classmethod
+    def from_page(cls, page: Page, limit: int, offset: int, cursor: str | None = None) -> "PaginationMeta":
+        return cls(
+            total=page.total,
+            limit=limit,
+            offset=0 if cursor else offset,
+            has_next=page.has_next,
+            has_previous=cursor is not None or offset > 0,
+            next_cursor=page.next_cursor,
+            count_strategy=page.count_strategy,
+        )
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
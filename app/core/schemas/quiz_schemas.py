@@ -3,20 +3,37 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# The answers chosen for a question are stored as a mask in a Postgres bigint, one bit per answer.
+MAX_ANSWERS_PER_QUESTION = 64
+
 
 class AnswerInputSchema(BaseModel):
+    id: UUID | None = Field(default=None, description="Id of the answer to edit, omit it to match by position")
     answer_text: str = Field(..., max_length=500)
     is_correct: bool = False
 
 
 class QuestionInputSchema(BaseModel):
+    id: UUID | None = Field(default=None, description="Id of the question to edit, omit it to match by position")
     question_text: str = Field(..., max_length=500)
-    answers: list[AnswerInputSchema]
+    answers: list[AnswerInputSchema] = Field(..., max_length=MAX_ANSWERS_PER_QUESTION)
 
 
 class QuizInputSchema(BaseModel):
     title: str = Field(..., max_length=100)
     description: str = Field(..., max_length=500)
+    sample_size: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of questions drawn at random for every attempt, making the quiz a question bank; "
+        "all the questions are served when omitted",
+    )
+    time_limit: int | None = Field(
+        default=None,
+        ge=1,
+        description="Seconds an attempt session has to be submitted in, after which it is finalized with the "
+        "answers saved so far; QUIZ_SESSION_TIME_LIMIT when omitted",
+    )
     questions: list[QuestionInputSchema]
 
 
@@ -44,12 +61,42 @@ class QuizOutputSchema(BaseModel):
     company_id: UUID
     title: str
     description: str
-    counter: int
+    sample_size: int | None = None
+    time_limit: int | None = None
     questions: list[QuestionOutputSchema] = []
 
     class Config:
         from_attributes = True
 
+class AnswerTreeSchema(BaseModel):
+    id: UUID
+    answer_text: str
+    is_correct: bool
+
+    class Config:
+        from_attributes = True
+
+
+class QuestionTreeSchema(BaseModel):
+    id: UUID
+    question_text: str
+    answers: list[AnswerTreeSchema] = []
+
+    class Config:
+        from_attributes = True
+
+
+class QuizTreeSchema(BaseModel):
+    """Questions and answers of one version of a quiz, including the correct answers, as used for scoring."""
+
+    id: UUID
+    version: int
+    questions: list[QuestionTreeSchema] = []
+
+    class Config:
+        from_attributes = True
+
+
 class AnswerUserResultSchema(BaseModel):
     answer_text: str = Field(..., max_length=500)
     is_correct: bool
@@ -60,13 +107,22 @@ class QuestionUserResultSchema(BaseModel):
     answers: list[AnswerUserResultSchema]
 
 class QuizAttemptRedisSchema(BaseModel):
+    id: UUID
     user_id: UUID
     company_id: UUID
     quiz_id: UUID
     score: float
     total_questions: int
     correct_answers_count: int
-    answers_detail: list[QuestionUserResultSchema]
+    last_attempt_time: datetime
+    answers_detail: list[QuestionUserResultSchema] = Field(
+        default=[],
+        description="Empty for attempts older than the Redis history whose answers weren't kept, or were given to "
+        "a version of the quiz since edited",
+    )
+
+    class Config:
+        from_attributes = True
 
 class QuizResultSchema(BaseModel):
     score: float
@@ -75,12 +131,79 @@ class QuizResultSchema(BaseModel):
 
 class AttemptQuizResultSchema(QuizResultSchema):
     answers_detail: list[QuestionUserResultSchema]
+    quiz_version: int
+    answer_masks: list[int | None] = Field(
+        description="Mask of the answers chosen for each question, in order, None for unanswered questions"
+    )
+    correct_questions: bytes = Field(description="Bitmap of the questions answered right")
+    question_ids: list[UUID] | None = Field(
+        default=None, description="Questions served by a draw, in order; None when all of the quiz's were"
+    )
 
 class AttemptQuizInputSchema(BaseModel):
+    draw_id: UUID | None = Field(default=None, description="Draw of the questions answered, required by question banks")
     questions: list[QuestionInputSchema]
 
 
+class QuizSubmissionSchema(BaseModel):
+    draw_id: UUID | None = Field(default=None, description="Draw of the questions answered, required by question banks")
+    answers: dict[UUID, list[UUID]] = Field(
+        ..., description="Ids of the answers chosen as correct, by question id; unanswered questions count as wrong"
+    )
+
+
+class QuizDrawSchema(BaseModel):
+    """Questions served for one attempt at a quiz, to be answered with the draw id."""
+
+    draw_id: UUID
+    quiz_id: UUID
+    quiz_version: int
+    expires_at: datetime
+    questions: list[QuestionOutputSchema]
+
+
+class QuizDrawRedisSchema(BaseModel):
+    """What is kept of a draw until it is answered: who it was served to and which questions."""
+
+    draw_id: UUID
+    user_id: UUID
+    quiz_id: UUID
+    quiz_version: int
+    question_ids: list[UUID]
+    # Positions of the questions in the quiz, they index the questions of its tree.
+    positions: list[int]
+
+
+class AttemptSessionSchema(BaseModel):
+    """An attempt in progress: the questions served, the answers saved so far and when it is finalized."""
+
+    session_id: UUID
+    quiz_id: UUID
+    quiz_version: int
+    started_at: datetime
+    deadline: datetime
+    questions: list[QuestionOutputSchema]
+    answers: dict[UUID, list[UUID]] = Field(default={}, description="Ids of the answers saved, by question id")
+
+
+class AttemptSessionRedisSchema(QuizDrawRedisSchema):
+    """A draw answered against a deadline, its draw_id is the id of the session."""
+
+    # Saving answers checks it against the subject of the access token, without loading the user.
+    user_email: str
+    company_id: UUID
+    started_at: datetime
+    deadline: datetime
+
+
+class AttemptSessionAnswerSchema(BaseModel):
+    answer_ids: list[UUID] = Field(
+        ..., max_length=MAX_ANSWERS_PER_QUESTION, description="Ids of the answers chosen as correct"
+    )
+
+
 class AttemptQuizOutputSchema(QuizResultSchema):
+    id: UUID
     quiz_id: UUID
     user_id: UUID
     company_id: UUID
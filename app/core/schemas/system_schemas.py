@@ -0,0 +1,76 @@
+from pydantic import BaseModel, Field
+
+
+class DatabasePoolStatsSchema(BaseModel):
+    """Snapshot of the primary database connection pool."""
+
+    pool_size: int = Field(description="Configured number of persistent connections")
+    max_overflow: int = Field(description="Connections allowed above pool_size under load")
+    checked_out: int = Field(description="Connections currently in use")
+    checked_in: int = Field(description="Idle connections kept in the pool")
+    overflow: int = Field(description="Overflow connections currently open")
+    checkouts: int = Field(description="Checkouts since startup")
+    timeouts: int = Field(description="Checkouts that gave up after pool_timeout")
+    avg_wait_ms: float = Field(description="Average time spent waiting for a connection")
+    max_wait_ms: float = Field(description="Longest time spent waiting for a connection")
+    wait_histogram: dict[str, int] = Field(description="Checkout wait time distribution")
+
+
+class ReplicaStatsSchema(BaseModel):
+    """State of a single read replica."""
+
+    host: str | None
+    port: int | None
+    healthy: bool = Field(description="Whether reads are currently routed to this replica")
+    lag_seconds: float | None = Field(description="Replication lag measured by the last check")
+    reads: int = Field(description="Read-only calls routed to this replica")
+
+
+class DatabaseRoutingStatsSchema(BaseModel):
+    """Read routing decisions between the primary and the replicas."""
+
+    replicas: list[ReplicaStatsSchema]
+    decisions: dict[str, int] = Field(description="Read-only calls by routing decision")
+    max_lag_seconds: float
+    read_your_writes_window_seconds: float
+
+
+class MembershipCacheStatsSchema(BaseModel):
+    """Hit rate of the company membership (role) cache used by permission checks."""
+
+    local_hits: int = Field(description="Lookups answered by the in-process cache")
+    redis_hits: int = Field(description="Lookups answered by Redis")
+    misses: int = Field(description="Lookups that went to the database")
+    bypasses: int = Field(description="Lookups that skipped the cache on purpose")
+    invalidations: int = Field(description="Memberships dropped from the cache after a change")
+    hit_ratio: float
+    local_entries: int = Field(description="Roles currently held in the in-process cache")
+    ttl_seconds: int
+    local_ttl_seconds: float
+
+
+class QuizTreeCacheStatsSchema(BaseModel):
+    """Hit rate and memory use of the cache of quiz trees used for scoring attempts."""
+
+    local_hits: int = Field(description="Lookups answered by the in-process cache")
+    redis_hits: int = Field(description="Lookups answered by Redis")
+    misses: int = Field(description="Lookups that loaded the quiz from the database")
+    hit_ratio: float
+    local_entries: int = Field(description="Quiz versions held in the in-process cache")
+    local_bytes: int = Field(description="Serialized size of the quiz trees held in the in-process cache")
+    local_max_bytes: int
+    ttl_seconds: int
+
+
+class AttemptIngestionStatsSchema(BaseModel):
+    """Quiz attempts queued in the attempts stream and not yet written to Postgres."""
+
+    ingestion: str = Field(description="Ingestion mode of the API: sync or stream")
+    backlog: int = Field(description="Attempts in the stream, delivered to a writer or not")
+    undelivered: int = Field(description="Attempts no writer has picked up yet")
+    pending: int = Field(description="Attempts picked up by a writer and not committed yet")
+    lag_seconds: float = Field(description="Age of the oldest attempt not written yet")
+    consumers: int = Field(description="Writers known to the consumer group")
+    inserted: int = Field(description="Attempts written since the stream was created")
+    duplicates: int = Field(description="Re-delivered attempts skipped because they were already written")
+    dead_lettered: int = Field(description="Attempts set aside because they could not be written")
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from app.core.schemas.quiz_schemas import QuizTreeSchema
+from app.utils.exceptions import ObjectNotFound
+
+# Compiled keys kept in memory, a key never changes for a given quiz version.
+ANSWER_KEY_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    """Answers of one question as bits of a mask, with the mask of the correct ones."""
+
+    answer_bits: dict[UUID, int]
+    correct_mask: int
+
+    def mask(self, answer_ids: list[UUID]) -> int:
+        mask = 0
+        for answer_id in answer_ids:
+            bit = self.answer_bits.get(answer_id)
+            if bit is None:
+                raise ObjectNotFound(model_name="Answer", id_=answer_id)
+            mask |= bit
+        return mask
+
+    def is_correct(self, answer_ids: list[UUID]) -> bool:
+        return self.mask(answer_ids) == self.correct_mask
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    quiz_id: UUID
+    version: int
+    questions: dict[UUID, QuestionKey]
+
+
+def compile_answer_key(quiz: QuizTreeSchema) -> AnswerKey:
+    questions = {}
+    for question in quiz.questions:
+        answer_bits, correct_mask = {}, 0
+        for index, answer in enumerate(question.answers):
+            answer_bits[answer.id] = 1 << index
+            if answer.is_correct:
+                correct_mask |= 1 << index
+        questions[question.id] = QuestionKey(answer_bits=answer_bits, correct_mask=correct_mask)
+    return AnswerKey(quiz_id=quiz.id, version=quiz.version, questions=questions)
+
+
+def to_bigint(mask: int) -> int:
+    """
+    An answer mask as a signed 64 bit integer, the bit of a 64th answer becoming the sign bit.
+    Python's bitwise operators read the bits of the signed value as those of the mask.
+    """
+    return mask - (1 << 64) if mask >> 63 else mask
+
+
+def pack_bits(flags: Iterable[bool]) -> bytes:
+    """
+    Flags packed eight to a byte, flag i being bit i % 8 of byte i // 8: the bit Postgres get_bit()
+    numbers i, and NumPy's unpackbits(bitorder="little") puts at index i.
+    """
+    packed, count = 0, 0
+    for count, flag in enumerate(flags, start=1):
+        if flag:
+            packed |= 1 << (count - 1)
+    return packed.to_bytes((count + 7) // 8, "little")
+
+
+def unpack_bits(packed: bytes, count: int) -> list[bool]:
+    value = int.from_bytes(packed, "little")
+    return [bool(value >> index & 1) for index in range(count)]
+
+
+_compiled: OrderedDict[tuple[UUID, int], AnswerKey] = OrderedDict()
+
+
+def get_answer_key(quiz: QuizTreeSchema) -> AnswerKey:
+    """The answer key of this version of the quiz, compiled once per version."""
+    key = (quiz.id, quiz.version)
+    answer_key = _compiled.get(key)
+    if answer_key is None:
+        answer_key = _compiled[key] = compile_answer_key(quiz)
+        if len(_compiled) > ANSWER_KEY_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    else:
+        _compiled.move_to_end(key)
+    return answer_key
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+from app.core.schemas.export_schemas import ExportFormat
+
+MEDIA_TYPES = {ExportFormat.CSV: "text/csv", ExportFormat.NDJSON: "application/x-ndjson"}
+
+COLUMNS = (
+    "id",
+    "created_at",
+    "quiz_id",
+    "quiz_title",
+    "user_id",
+    "user_email",
+    "score",
+    "correct_answers_count",
+    "total_questions",
+)
+
+
+def _values(row: Row) -> list:
+    return [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+
+
+async def encode_attempts(batches: AsyncIterable[Sequence[Row]], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """Attempts as CSV or NDJSON, one chunk per batch, so the export is never held in memory whole."""
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        yield buffer.getvalue().encode()
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows((_values(row) for row in batch))
+            yield buffer.getvalue().encode()
+    else:
+        async for batch in batches:
+            yield "".join(
+                json.dumps(dict(zip(COLUMNS, _values(row))), default=str) + "\n" for row in batch
+            ).encode()
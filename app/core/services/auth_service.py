@@ -21,7 +21,8 @@ class AuthService:
         self.email_sender: AsyncEmailSender = email_sender
         self.http_client = http_client
 
-    async def get_current_user(self, token: str) -> User:
+    def get_token_subject(self, token: str) -> str:
+        """Email of the user a valid access token was issued to, read from the token alone."""
         verify = verify_token(token=token, token_type=TokenType.ACCESS)
         if not verify:
             raise InvalidCredentials("Invalid or expired access token")
@@ -29,6 +30,10 @@ class AuthService:
         email = payload.get("sub")
         if not email:
             raise InvalidCredentials("Invalid token")
+        return email
+
+    async def get_current_user(self, token: str) -> User:
+        email = self.get_token_subject(token)
         user = await self.user_repository.get(email)
         if not user:
             raise ObjectNotFound("User", email)
@@ -1,24 +1,44 @@
 from uuid import UUID
 
+from pydantic import EmailStr, TypeAdapter, ValidationError
+
 from app.core.interfaces.company_repo_interface import AbstractCompanyRepository
+from app.core.schemas.access_schemas import AccessContext
 from app.core.schemas.company_schemas import (
+    BulkInvitationReportSchema,
+    BulkInvitationResultSchema,
+    BulkInvitationStatus,
     CompanyInputSchema,
     CompanyInvitationOutputSchema,
     CompanyMemberOutputSchema,
     CompanyMemberUserSchema,
     CompanyOutputSchema,
 )
-from app.core.schemas.pagination_schemas import PaginatedResponse, PaginationMeta
+from app.core.schemas.pagination_schemas import CountStrategy, PaginatedResponse, PaginationMeta
 from app.core.schemas.user_schemas import UserOutputSchema
 from app.infrastructure.postgres.models import Company, User
 from app.infrastructure.postgres.models.enums import CompanyMemberRole, InvitationStatus, InvitationType
 from app.utils.exceptions import ObjectAlreadyExists, ObjectNotFound, PermissionDenied, UnauthorizedAction
 
+email_adapter = TypeAdapter(EmailStr)
+
 
 class CompanyService:
     def __init__(self, company_repository: AbstractCompanyRepository):
         self.company_repository: AbstractCompanyRepository = company_repository
 
+    async def _get_access_context(self, company_id: UUID, user: User) -> AccessContext:
+        context = await self.company_repository.get_access_context(company_id=company_id, user_id=user.id)
+        if not context:
+            raise ObjectNotFound(model_name="Company", id_=company_id)
+        return context
+
+    async def _get_owned_company(self, company_id: UUID, user: User) -> Company:
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER):
+            raise PermissionDenied("Only the company owner can perform this action.")
+        return context.company
+
     async def create(self, company_input: CompanyInputSchema, user: User) -> CompanyOutputSchema:
         company_instance = Company(**company_input.model_dump(), owner_id=user.id)
         company_exists = await self.company_repository.check_if_company_exists(
@@ -34,17 +54,13 @@ class CompanyService:
         return CompanyOutputSchema.model_validate(created_company)
 
     async def update(self, company_id: UUID, user: User, company_input: CompanyInputSchema) -> CompanyOutputSchema:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         response = await self.company_repository.update(company=company, updates=company_input.model_dump())
         return CompanyOutputSchema.model_validate(response)
 
     async def delete(self, company_id: UUID, user: User) -> None:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         await self.company_repository.delete(company=company, owner_id=user.id)
 
@@ -59,51 +75,51 @@ class CompanyService:
         return [CompanyOutputSchema.model_validate(company) for company in companies]
 
     async def get_companies_for_owner_paginated(
-        self, user: User, limit: int, offset: int
+        self,
+        user: User,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> PaginatedResponse[CompanyOutputSchema]:
         """Get paginated companies for owner."""
-        companies, total = await self.company_repository.get_companies_for_owner_paginated(
-            owner_id=user.id, limit=limit, offset=offset
+        page = await self.company_repository.get_companies_for_owner_paginated(
+            owner_id=user.id, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
         )
 
         # Convert to output schemas
-        company_schemas = [CompanyOutputSchema.model_validate(company) for company in companies]
+        company_schemas = [CompanyOutputSchema.model_validate(company) for company in page.items]
 
         # Create pagination metadata
-        meta = PaginationMeta(
-            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
-        )
+        meta = PaginationMeta.from_page(page, limit=limit, offset=offset, cursor=cursor)
 
         return PaginatedResponse[CompanyOutputSchema](items=company_schemas, meta=meta)
 
     async def change_status(self, company_id: UUID, user: User, company_status: str) -> CompanyOutputSchema:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         response = await self.company_repository.update(company=company, updates={"company_status": company_status})
         return CompanyOutputSchema.model_validate(response)
 
     async def upload_logo(self, company_id: UUID, user: User, company_logo: str) -> CompanyOutputSchema:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         response = await self.company_repository.update(company=company, updates={"company_logo_url": company_logo})
         return CompanyOutputSchema.model_validate(response)
 
-    async def get_all_companies_paginated(self, limit: int, offset: int) -> PaginatedResponse[CompanyOutputSchema]:
+    async def get_all_companies_paginated(
+        self, limit: int, offset: int, cursor: str | None = None, count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> PaginatedResponse[CompanyOutputSchema]:
         """Get paginated list of all companies."""
-        # Assuming the repository has a method to get all companies with pagination
-        companies, total = await self.company_repository.get_all_companies_paginated(limit=limit, offset=offset)
+        page = await self.company_repository.get_all_companies_paginated(
+            limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
+        )
 
         # Convert to output schemas
-        company_schemas = [CompanyOutputSchema.model_validate(company) for company in companies]
+        company_schemas = [CompanyOutputSchema.model_validate(company) for company in page.items]
 
         # Create pagination metadata
-        meta = PaginationMeta(
-            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
-        )
+        meta = PaginationMeta.from_page(page, limit=limit, offset=offset, cursor=cursor)
 
         return PaginatedResponse[CompanyOutputSchema](items=company_schemas, meta=meta)
 
@@ -122,9 +138,7 @@ class CompanyService:
             raise ObjectAlreadyExists(message="User is already invited or a member of the company.")
 
     async def invite_user_to_company(self, company_id: UUID, invite_user: User, user: User) -> CompanyInvitationOutputSchema:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         invite_exists = await self.company_repository.check_if_invite_exists(
             company=company, invite_user=invite_user, status=InvitationStatus.PENDING
@@ -146,6 +160,58 @@ class CompanyService:
             status=invited.status
         )
 
+    async def invite_users_to_company(self, company_id: UUID, emails: list[str], user: User) -> BulkInvitationReportSchema:
+        """
+        Invite every user with one of the emails, with a constant number of queries whatever their
+        number: one finds the users, their memberships and their pending invitations, and invitations
+        are inserted in multi-row batches. Emails of no user, of members and of users already invited
+        are reported and skipped.
+        """
+        company = await self._get_owned_company(company_id=company_id, user=user)
+
+        statuses: dict[str, BulkInvitationStatus | None] = {}
+        for email in emails:
+            try:
+                email = email_adapter.validate_python(email.strip())
+            except ValidationError:
+                statuses.setdefault(email, BulkInvitationStatus.INVALID_EMAIL)
+                continue
+            statuses.setdefault(email, None)
+
+        valid_emails = [email for email, status in statuses.items() if status is None]
+        to_invite: dict[str, UUID] = {}
+        for candidate in await self.company_repository.get_invite_candidates(company=company, emails=valid_emails):
+            if candidate.is_member:
+                statuses[candidate.email] = BulkInvitationStatus.ALREADY_MEMBER
+            elif candidate.is_invited:
+                statuses[candidate.email] = BulkInvitationStatus.ALREADY_INVITED
+            else:
+                to_invite[candidate.email] = candidate.id
+
+        invitations = await self.company_repository.invite_users_to_company(
+            company=company,
+            user_ids=list(to_invite.values()),
+            invited_by=user,
+            invitation_type=InvitationType.COMPANY_INVITE,
+        )
+
+        results = []
+        for email, status in statuses.items():
+            invitation_id = invitations.get(to_invite[email]) if email in to_invite else None
+            if invitation_id:
+                status = BulkInvitationStatus.INVITED
+            elif email in to_invite:
+                # Invited by a concurrent request between the lookup and the insert.
+                status = BulkInvitationStatus.ALREADY_INVITED
+            results.append(
+                BulkInvitationResultSchema(
+                    email=email, status=status or BulkInvitationStatus.USER_NOT_FOUND, invitation_id=invitation_id
+                )
+            )
+        return BulkInvitationReportSchema(
+            invited=len(invitations), skipped=len(results) - len(invitations), results=results
+        )
+
     async def get_invitations_for_user(self, user: User) -> list[CompanyInvitationOutputSchema]:
         """Get all invitations for a user with nested objects."""
         invitations = await self.company_repository.get_invitations_for_user(user=user)
@@ -166,9 +232,7 @@ class CompanyService:
 
     async def get_invitations_for_company(self, company_id: UUID, user: User) -> list[CompanyInvitationOutputSchema]:
         """Get all invitations for a company with nested objects."""
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         invitations = await self.company_repository.get_invitations_for_company(company=company)
         
@@ -213,18 +277,12 @@ class CompanyService:
         )
 
     async def leave_company(self, company_id: UUID, user: User) -> None:
-        company = await self.company_repository.get(company_id=company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
-
-        user_is_company_member = await self.company_repository.check_if_user_is_company_member(
-            company=company, user_id=user.id
-        )
-        if not user_is_company_member:
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.is_member:
             raise ObjectNotFound(model_name="Company Member", id_=user.id)
 
-        await self.company_repository.remove_user_from_company(company=company, user_id=user.id)
-        await self.company_repository.remove_user_invitations(company=company, user_id=user.id)
+        await self.company_repository.remove_user_from_company(company=context.company, user_id=user.id)
+        await self.company_repository.remove_user_invitations(company=context.company, user_id=user.id)
 
     async def get_company_members(self, company_id: UUID) -> CompanyMemberOutputSchema:
         """Get company with all members, including owner."""
@@ -246,9 +304,7 @@ class CompanyService:
         return company_schema
 
     async def remove_user_from_company(self, company_id: UUID, user_id: UUID, user: User) -> None:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         user_is_company_member = await self.company_repository.check_if_user_is_company_member(
             company=company, user_id=user_id
@@ -262,9 +318,11 @@ class CompanyService:
     async def change_member_role(
         self, company_id: UUID, user_id: UUID, new_role: CompanyMemberRole, user: User
     ) -> CompanyMemberUserSchema:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
+        if new_role == CompanyMemberRole.OWNER:
+            raise PermissionDenied("A company has a single owner, members can only be made admins or members.")
+        if user_id == company.owner_id:
+            raise PermissionDenied("The role of the company owner can't be changed.")
 
         user_is_company_member = await self.company_repository.check_if_user_is_company_member(
             company=company, user_id=user_id
@@ -279,9 +337,7 @@ class CompanyService:
         return CompanyMemberUserSchema.from_models(user=user, company_member=company_member)
 
     async def get_company_admins(self, company_id: UUID, user: User) -> list[CompanyMemberUserSchema]:
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company Invitation", id_=company_id)
+        company = await self._get_owned_company(company_id=company_id, user=user)
 
         # Get members with their roles
         members = await self.company_repository.get_company_members(company=company)
@@ -303,20 +359,23 @@ class CompanyService:
         return [CompanyOutputSchema.model_validate(company) for company in companies]
 
     async def get_companies_for_member_paginated(
-        self, user: User, limit: int, offset: int
+        self,
+        user: User,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> PaginatedResponse[CompanyOutputSchema]:
         """Get paginated companies where user is a member (not owner)."""
-        companies, total = await self.company_repository.get_companies_for_member_paginated(
-            user_id=user.id, limit=limit, offset=offset
+        page = await self.company_repository.get_companies_for_member_paginated(
+            user_id=user.id, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
         )
 
         # Convert to output schemas
-        company_schemas = [CompanyOutputSchema.model_validate(company) for company in companies]
+        company_schemas = [CompanyOutputSchema.model_validate(company) for company in page.items]
 
         # Create pagination metadata
-        meta = PaginationMeta(
-            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
-        )
+        meta = PaginationMeta.from_page(page, limit=limit, offset=offset, cursor=cursor)
 
         return PaginatedResponse[CompanyOutputSchema](items=company_schemas, meta=meta)
 
@@ -326,9 +385,8 @@ class CompanyService:
         if not invitation:
             raise ObjectNotFound(model_name="Company Invitation", id_=invitation_id)
 
-        company = await self.company_repository.get(company_id=invitation.company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=invitation.company_id)
+        context = await self._get_access_context(company_id=invitation.company_id, user=user)
+        company = context.company
 
         if invitation.status != InvitationStatus.PENDING:
             raise ObjectAlreadyExists(message="Invitation has already been responded to.")
@@ -336,10 +394,7 @@ class CompanyService:
         if invitation.invitation_type != InvitationType.USER_REQUEST:
             raise PermissionDenied(message="Only user membership requests can be accepted this way.")
 
-        company_admins_ids = [
-            member.user_id for member in company.members if member.role in (CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN)
-        ]
-        if user.id not in company_admins_ids:
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
             raise PermissionDenied(message="Only company owners or admins can accept membership requests.")
 
         await self.company_repository.accept_invitation(invitation=invitation)
@@ -353,9 +408,7 @@ class CompanyService:
         if not invitation:
             raise ObjectNotFound(model_name="Company Invitation", id_=invitation_id)
 
-        company = await self.company_repository.get(company_id=invitation.company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=invitation.company_id)
+        context = await self._get_access_context(company_id=invitation.company_id, user=user)
 
         if invitation.status != InvitationStatus.PENDING:
             raise ObjectAlreadyExists(message="Invitation has already been responded to.")
@@ -363,10 +416,7 @@ class CompanyService:
         if invitation.invitation_type != InvitationType.USER_REQUEST:
             raise PermissionDenied(message="Only user membership requests can be rejected this way.")
 
-        company_admins_ids = [
-            member.user_id for member in company.members if member.role in (CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN)
-        ]
-        if user.id not in company_admins_ids:
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
             raise PermissionDenied(message="Only company owners or admins can reject membership requests.")
 
         await self.company_repository.reject_invitation(invitation=invitation)
@@ -376,18 +426,13 @@ class CompanyService:
         if not invitation:
             raise ObjectNotFound(model_name="Company Invitation", id_=invitation_id)
 
-        company = await self.company_repository.get(company_id=invitation.company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=invitation.company_id)
+        context = await self._get_access_context(company_id=invitation.company_id, user=user)
 
         if invitation.status != InvitationStatus.PENDING:
             raise ObjectAlreadyExists(message="Invitation has already been responded to.")
 
         if invitation.invitation_type == InvitationType.COMPANY_INVITE:
-            company_admins_ids = [
-                member.user_id for member in company.members if member.role in (CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN)
-            ]
-            if user.id not in company_admins_ids:
+            if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
                 raise PermissionDenied(message="Only company owners or admins can cansel invitations.")
 
             await self.company_repository.cancel_invitation(invitation=invitation)
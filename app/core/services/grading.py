@@ -0,0 +1,71 @@
+from app.core.schemas.quiz_schemas import (
+    AnswerUserResultSchema,
+    AttemptQuizResultSchema,
+    QuestionTreeSchema,
+    QuestionUserResultSchema,
+    QuizSubmissionSchema,
+    QuizTreeSchema,
+)
+from app.core.services.answer_key import get_answer_key, pack_bits, to_bigint
+from app.utils.exceptions import ObjectNotFound
+
+
+def answers_detail(
+    questions: list[QuestionTreeSchema], answer_masks: list[int | None]
+) -> list[QuestionUserResultSchema]:
+    """The answers chosen for each answered question, given by their masks in the order of `questions`."""
+    return [
+        QuestionUserResultSchema(
+            question_text=question.question_text,
+            answers=[
+                AnswerUserResultSchema(answer_text=answer.answer_text, is_correct=answer.is_correct)
+                for index, answer in enumerate(question.answers)
+                if mask >> index & 1
+            ],
+        )
+        for question, mask in zip(questions, answer_masks)
+        if mask is not None
+    ]
+
+
+def grade_submission(
+    submission: QuizSubmissionSchema, quiz: QuizTreeSchema, positions: list[int] | None = None
+) -> AttemptQuizResultSchema:
+    """Grade the submission on the questions served: those at `positions` of a draw, or all of the quiz's."""
+    answer_key = get_answer_key(quiz)
+    if positions is None:
+        questions, served = quiz.questions, answer_key.questions
+    else:
+        questions = [quiz.questions[position] for position in positions]
+        served = {question.id for question in questions}
+    for question_id in submission.answers:
+        if question_id not in served:
+            raise ObjectNotFound(model_name="Question", id_=question_id)
+
+    total_questions = len(questions)
+    answer_masks, correct = [], []
+
+    for question in questions:
+        answer_ids = submission.answers.get(question.id)
+        if answer_ids is None:
+            answer_masks.append(None)
+            correct.append(False)
+            continue
+
+        question_key = answer_key.questions[question.id]
+        mask = question_key.mask(answer_ids)
+        answer_masks.append(mask)
+        correct.append(mask == question_key.correct_mask)
+
+    correct_count = sum(correct)
+    score_percent = round((correct_count / total_questions) * 100, 2) if total_questions else 0.0
+    return AttemptQuizResultSchema(
+        score=score_percent,
+        total_questions=total_questions,
+        correct_answers_count=correct_count,
+        answers_detail=answers_detail(questions=questions, answer_masks=answer_masks),
+        quiz_version=quiz.version,
+        answer_masks=[None if mask is None else to_bigint(mask) for mask in answer_masks],
+        correct_questions=pack_bits(correct),
+        question_ids=None if positions is None else [question.id for question in questions],
+    )
@@ -0,0 +1,130 @@
+from datetime import UTC, datetime
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import Row
+
+from app.core.schemas.analytics_schemas import (
+    AnswerStatisticsSchema,
+    QuestionStatisticsSchema,
+    QuizItemStatisticsSchema,
+)
+from app.core.schemas.quiz_schemas import QuizTreeSchema
+
+
+def _load(rows: Sequence[Row], quiz: QuizTreeSchema) -> tuple[np.ndarray, ...]:
+    """
+    The answer masks (as uint64), and which questions were served, answered and answered right, as
+    (attempts, questions) arrays in the quiz's question order. Attempts at a draw of a question bank
+    only fill the columns of the questions they were served. Attempts whose answers don't match the
+    quiz's questions are left out.
+    """
+    columns = {question.id: index for index, question in enumerate(quiz.questions)}
+    questions = len(quiz.questions)
+    # Attempts by number of questions served, loaded a group at a time: the same for all the attempts
+    # at a version of a quiz, but those served all of it and those served a draw of it.
+    groups: dict[int, list[tuple[Row, list[int]]]] = {}
+    for row in rows:
+        if row.answer_masks is None:
+            continue
+        if row.question_ids is None:
+            if len(row.answer_masks) != questions:
+                continue
+            served_columns = list(range(questions))
+        elif all(question_id in columns for question_id in row.question_ids):
+            served_columns = [columns[question_id] for question_id in row.question_ids]
+        else:
+            continue
+        groups.setdefault(len(served_columns), []).append((row, served_columns))
+
+    attempts = sum(len(group) for group in groups.values())
+    masks = np.zeros((attempts, questions), dtype=np.uint64)
+    served, answered, correct = (np.zeros((attempts, questions), dtype=bool) for _ in range(3))
+    first = 0
+    for length, group in groups.items():
+        attempt_rows = np.arange(first, first + len(group))[:, None]
+        first += len(group)
+        if not length:
+            continue
+        group_columns = np.array([served_columns for _, served_columns in group], dtype=np.intp)
+        raw = np.array([row.answer_masks for row, _ in group], dtype=object).reshape(len(group), length)
+        group_answered = raw != None  # noqa: E711, compared element-wise
+        # Bitmaps are packed little-endian bit first (see pack_bits), which unpackbits reads back in order.
+        bitmaps = np.frombuffer(b"".join(row.correct_questions for row, _ in group), dtype=np.uint8)
+
+        served[attempt_rows, group_columns] = True
+        answered[attempt_rows, group_columns] = group_answered
+        masks[attempt_rows, group_columns] = np.where(group_answered, raw, 0).astype(np.int64).view(np.uint64)
+        correct[attempt_rows, group_columns] = np.unpackbits(
+            bitmaps.reshape(len(group), -1), axis=1, count=length, bitorder="little"
+        ).astype(bool)
+    return masks, served, answered, correct
+
+
+def _discrimination(correct: np.ndarray, served: np.ndarray) -> np.ndarray:
+    """
+    The corrected item-total correlation of every question: the Pearson correlation, over the attempts
+    it was served in, between answering the question right and the number of the other questions
+    answered right. NaN where either never varies.
+    """
+    weights = served.astype(np.float64)
+    items = correct.astype(np.float64)
+    rest = items.sum(axis=1, keepdims=True) - items
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = weights.sum(axis=0)
+        items -= (weights * items).sum(axis=0) / count
+        rest -= (weights * rest).sum(axis=0) / count
+        covariance = (weights * items * rest).sum(axis=0)
+        spread = np.sqrt((weights * items**2).sum(axis=0) * (weights * rest**2).sum(axis=0))
+        return np.where(spread > 0, covariance / spread, np.nan)
+
+
+def compute_item_statistics(quiz: QuizTreeSchema, rows: Sequence[Row]) -> QuizItemStatisticsSchema:
+    """
+    Item statistics of the attempts at the version of the quiz given, from their packed answers
+    (see get_attempt_answers), worked out over whole arrays rather than attempt by attempt.
+    """
+    questions = len(quiz.questions)
+    masks, served, answered, correct = _load(rows, quiz)
+    attempts = len(masks)
+
+    served_count = served.sum(axis=0)
+    answered_count = answered.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        percent_correct = np.where(served_count > 0, correct.sum(axis=0) / served_count * 100, 0.0)
+    discrimination = _discrimination(correct, served)
+
+    # Times every answer position was chosen, one vectorized pass per position rather than per attempt.
+    positions = max((len(question.answers) for question in quiz.questions), default=0)
+    picks = np.zeros((questions, positions), dtype=np.int64)
+    for position in range(positions):
+        picks[:, position] = np.count_nonzero(masks & np.uint64(1 << position), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pick_rates = np.where(answered_count[:, None] > 0, picks / answered_count[:, None], 0.0)
+
+    return QuizItemStatisticsSchema(
+        quiz_id=quiz.id,
+        quiz_version=quiz.version,
+        attempts_count=attempts,
+        computed_at=datetime.now(UTC).replace(tzinfo=None),
+        questions=[
+            QuestionStatisticsSchema(
+                question_id=question.id,
+                question_text=question.question_text,
+                served=int(served_count[index]),
+                answered=int(answered_count[index]),
+                percent_correct=round(float(percent_correct[index]), 2),
+                discrimination=None if np.isnan(discrimination[index]) else round(float(discrimination[index]), 4),
+                answers=[
+                    AnswerStatisticsSchema(
+                        answer_id=answer.id,
+                        answer_text=answer.answer_text,
+                        is_correct=answer.is_correct,
+                        pick_rate=round(float(pick_rates[index, position]), 4),
+                    )
+                    for position, answer in enumerate(question.answers)
+                ],
+            )
+            for index, question in enumerate(quiz.questions)
+        ],
+    )
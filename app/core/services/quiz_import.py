@@ -0,0 +1,139 @@
+import csv
+import json
+from typing import Iterable, Iterator
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+
+from app.core.schemas.import_schemas import ImportFormat, QuizImportRowSchema
+from app.core.schemas.quiz_schemas import MAX_ANSWERS_PER_QUESTION, QuizInputSchema
+
+CSV_COLUMNS = ("quiz_title", "quiz_description", "question_text", "answer_text", "is_correct")
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" if detail["loc"] else detail["msg"]
+        for detail in error.errors()
+    )
+
+
+class QuizImportParser:
+    """
+    Turns an import file into staging rows, one per answer, as it is read: only the quiz and
+    question being read are kept, so files of any size are parsed in constant memory.
+
+    In a CSV file, every row is an answer, with the CSV_COLUMNS header. Consecutive rows with the same
+    quiz title are one quiz, and consecutive rows of a quiz with the same question text one question.
+    In a JSON-lines file, every line is a quiz, as sent to POST /quizzes/{company_id}.
+
+    Invalid rows are skipped and recorded in `errors` (up to `max_errors` of them), the import
+    must not be merged when there are any.
+    """
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.errors: list[dict] = []
+        self.error_count = 0
+        self.rows = 0
+        self._quiz: tuple[UUID, str] | None = None
+        self._question: tuple[UUID, str] | None = None
+        self._question_position = 0
+        self._answer_position = 0
+
+    def parse(self, lines: Iterable[str], import_format: ImportFormat) -> Iterator[tuple]:
+        if import_format == ImportFormat.CSV:
+            return self._parse_csv(lines)
+        return self._parse_jsonl(lines)
+
+    def _error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "message": message})
+
+    def _row(self, line: int, row: QuizImportRowSchema) -> tuple:
+        if self._quiz is None or self._quiz[1] != row.quiz_title:
+            self._quiz = (uuid4(), row.quiz_title)
+            self._question = None
+            self._question_position = -1
+        if self._question is None or self._question[1] != row.question_text:
+            self._question = (uuid4(), row.question_text)
+            self._question_position += 1
+            self._answer_position = -1
+        self._answer_position += 1
+
+        self.rows += 1
+        return (
+            line,
+            self._quiz[0],
+            row.quiz_title,
+            row.quiz_description,
+            self._question[0],
+            row.question_text,
+            self._question_position,
+            uuid4(),
+            row.answer_text,
+            row.is_correct,
+            self._answer_position,
+        )
+
+    def _parse_csv(self, lines: Iterable[str]) -> Iterator[tuple]:
+        reader = csv.DictReader(lines)
+        missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            self._error(1, f"Missing columns: {', '.join(sorted(missing))}")
+            return
+        for record in reader:
+            try:
+                row = QuizImportRowSchema.model_validate({column: record[column] for column in CSV_COLUMNS})
+            except ValidationError as error:
+                self._error(reader.line_num, _describe(error))
+                continue
+            if (
+                self._question is not None
+                and (self._quiz[1], self._question[1]) == (row.quiz_title, row.question_text)
+                and self._answer_position + 1 >= MAX_ANSWERS_PER_QUESTION
+            ):
+                self._error(reader.line_num, f"A question can't have more than {MAX_ANSWERS_PER_QUESTION} answers")
+                continue
+            yield self._row(reader.line_num, row)
+
+    def _parse_jsonl(self, lines: Iterable[str]) -> Iterator[tuple]:
+        for line, text in enumerate(lines, start=1):
+            if not text.strip():
+                continue
+            try:
+                quiz = QuizInputSchema.model_validate(json.loads(text))
+            except json.JSONDecodeError as error:
+                self._error(line, f"Invalid JSON: {error.msg}")
+                continue
+            except ValidationError as error:
+                self._error(line, _describe(error))
+                continue
+            if not quiz.questions or not all(question.answers for question in quiz.questions):
+                self._error(line, "A quiz needs at least one question and every question at least one answer")
+                continue
+            try:
+                questions = [
+                    [
+                        QuizImportRowSchema(
+                            quiz_title=quiz.title,
+                            quiz_description=quiz.description,
+                            question_text=question.question_text,
+                            answer_text=answer.answer_text,
+                            is_correct=answer.is_correct,
+                        )
+                        for answer in question.answers
+                    ]
+                    for question in quiz.questions
+                ]
+            except ValidationError as error:
+                self._error(line, _describe(error))
+                continue
+
+            # Each line is a quiz of its own, even when it has the title of the previous one.
+            self._quiz = None
+            for answers in questions:
+                self._question = None
+                for answer in answers:
+                    yield self._row(line, answer)
@@ -1,182 +1,679 @@
-import json
-from uuid import UUID
-
+import io
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, BinaryIO
+from uuid import UUID, uuid4
+
+from celery.result import AsyncResult
+from redis.exceptions import RedisError
+
+from app.core.interfaces.analytics_repo_interface import AbstractAnalyticsRepository
 from app.core.interfaces.company_repo_interface import AbstractCompanyRepository
 from app.core.interfaces.quiz_repo_interface import AbstractQuizRepository
-from app.core.repositories.redis_repository import AsyncRedisRepository
-from app.core.schemas import PaginatedResponse, PaginationMeta
+from app.core.repositories.attempt_history_repository import AttemptHistoryRepository
+from app.core.repositories.attempt_session_repository import AttemptSessionRepository
+from app.core.repositories.leaderboard_repository import LeaderboardRepository
+from app.core.repositories.quiz_draw_repository import QuizDrawRepository
+from app.core.schemas import CountStrategy, PaginatedResponse, PaginationMeta
+from app.core.schemas.access_schemas import AccessContext
+from app.core.schemas.analytics_schemas import (
+    CompanyScoreStatsSchema,
+    CompanyUserScoreStatsSchema,
+    ItemStatisticsJobSchema,
+    LeaderboardEntrySchema,
+    QuizItemStatisticsSchema,
+    QuizScoreStatsSchema,
+    UserScoreStatsSchema,
+)
+from app.core.schemas.export_schemas import AttemptExportFilterSchema, ExportFormat, ExportJobSchema
+from app.core.schemas.import_schemas import ImportFormat, QuizImportReportSchema
 from app.core.schemas.quiz_schemas import (
-    AnswerUserResultSchema,
+    AnswerOutputSchema,
     AttemptQuizInputSchema,
+    AttemptQuizOutputSchema,
     AttemptQuizResultSchema,
-    QuestionUserResultSchema,
+    AttemptSessionRedisSchema,
+    AttemptSessionSchema,
+    QuestionOutputSchema,
+    QuestionTreeSchema,
     QuizAttemptRedisSchema,
+    QuizDrawRedisSchema,
+    QuizDrawSchema,
     QuizInputSchema,
     QuizOutputSchema,
+    QuizSubmissionSchema,
+    QuizTreeSchema,
 )
-from app.infrastructure.postgres.models import Quiz, User
+from app.core.services.answer_key import get_answer_key
+from app.core.services.attempt_export import encode_attempts
+from app.core.services.grading import answers_detail, grade_submission
+from app.core.services.quiz_import import QuizImportParser
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.tasks.exports import export_company_attempts
+from app.infrastructure.celery.tasks.item_statistics import compute_item_statistics
+from app.infrastructure.postgres.models import Company, Quiz, User
 from app.infrastructure.postgres.models.enums import CompanyMemberRole
-from app.utils.exceptions import ObjectNotFound, PermissionDenied
+from app.infrastructure.postgres.session_manager import on_commit
+from app.infrastructure.redis.attempt_stream import attempt_stream
+from app.infrastructure.redis.item_statistics_cache import item_statistics_cache
+from app.infrastructure.redis.membership_cache import MISS, membership_cache
+from app.infrastructure.storage import AttemptArchive
+from app.settings import settings
+from app.utils.exceptions import ConflictError, InvalidImportFile, ObjectNotFound, PermissionDenied
+
+logger = logging.getLogger(__name__)
 
 
 class QuizService:
-    def __init__(self, company_repository, quiz_repository, redis_repository):
+    def __init__(
+        self,
+        company_repository,
+        quiz_repository,
+        attempt_history_repository,
+        analytics_repository,
+        leaderboard_repository,
+        quiz_draw_repository,
+        attempt_session_repository,
+        attempt_archive,
+    ):
         self.company_repository: AbstractCompanyRepository = company_repository
         self.quiz_repository: AbstractQuizRepository = quiz_repository
-        self.redis_repository: AsyncRedisRepository = redis_repository
-
-    async def create(self, company_id: UUID, user: User, quiz_payload: QuizInputSchema):
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
+        self.attempt_history_repository: AttemptHistoryRepository = attempt_history_repository
+        self.analytics_repository: AbstractAnalyticsRepository = analytics_repository
+        self.leaderboard_repository: LeaderboardRepository = leaderboard_repository
+        self.quiz_draw_repository: QuizDrawRepository = quiz_draw_repository
+        self.attempt_session_repository: AttemptSessionRepository = attempt_session_repository
+        self.attempt_archive: AttemptArchive = attempt_archive
+
+    async def _get_access_context(self, company_id: UUID, user: User, quiz_id: UUID | None = None) -> AccessContext:
+        context = await self.company_repository.get_access_context(
+            company_id=company_id, user_id=user.id, quiz_id=quiz_id
+        )
+        if not context:
             raise ObjectNotFound(model_name="Company", id_=company_id)
+        if not context.is_member:
+            raise PermissionDenied("You are not a member of this company.")
+        if quiz_id is not None and context.quiz is None:
+            raise ObjectNotFound(model_name="Quiz", id_=quiz_id)
+        return context
+
+    async def _get_member_role(self, company_id: UUID, user: User, use_cache: bool = True) -> CompanyMemberRole:
+        """
+        Role of the user in the company, served from the membership cache when possible: other processes
+        only see a role change once their cached copy expires. Pass use_cache=False for checks that grant
+        more than membership, where a role revoked a moment ago must not be honoured. Writes check roles
+        through _get_access_context, which never uses the cache.
+        """
+        role = await membership_cache.get(company_id, user.id) if use_cache else MISS
+        if not use_cache:
+            membership_cache.stats["bypasses"] += 1
+        if role is MISS:
+            context = await self.company_repository.get_access_context(company_id=company_id, user_id=user.id)
+            if not context:
+                raise ObjectNotFound(model_name="Company", id_=company_id)
+            role = context.role
+            await membership_cache.set(company_id, user.id, role)
+        if role is None:
+            raise PermissionDenied("You are not a member of this company.")
+        return role
 
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if company_member.role not in [CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN]:
+    async def create(self, company_id: UUID, user: User, quiz_payload: QuizInputSchema):
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
             raise PermissionDenied("Only company owners and admins can create quizzes.")
 
-        quiz = await self.quiz_repository.create(company=company, quiz_payload=quiz_payload)
+        quiz = await self.quiz_repository.create(company=context.company, quiz_payload=quiz_payload)
 
         return quiz
 
     async def update(self, quiz_id: UUID, company_id: UUID, user: User, quiz_payload: QuizInputSchema):
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
-
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if company_member.role not in [CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN]:
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
             raise PermissionDenied("Only company owners and admins can update quizzes.")
 
-        quiz = await self.quiz_repository.get(quiz_id=quiz_id, company=company)
-        if not quiz:
-            raise ObjectNotFound(model_name="Quiz", id_=quiz_id)
-
-        updated_quiz = await self.quiz_repository.update(quiz=quiz, quiz_payload=quiz_payload)
+        updated_quiz = await self.quiz_repository.update(quiz=context.quiz, quiz_payload=quiz_payload)
 
         return updated_quiz
 
-    async def delete(self, quiz_id: UUID, company_id: UUID, user: User):
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+    async def import_quizzes(
+        self, company_id: UUID, user: User, file: BinaryIO, import_format: ImportFormat
+    ) -> QuizImportReportSchema:
+        """
+        Create every quiz of a CSV or JSON-lines file. The file is parsed as it is copied into a staging
+        table, then merged into the quiz tables in the same transaction; nothing is created when any
+        row is invalid.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can import quizzes.")
+
+        parser = QuizImportParser(max_errors=settings.quiz.QUIZ_IMPORT_MAX_ERRORS)
+        lines = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        started = time.perf_counter()
+        try:
+            await self.quiz_repository.stage_quiz_import(rows=parser.parse(lines, import_format))
+        except UnicodeDecodeError:
+            raise InvalidImportFile(errors=[{"line": None, "message": "The file is not UTF-8 text"}], error_count=1)
+        finally:
+            # Leave the uploaded file open, it belongs to the request.
+            lines.detach()
+        if parser.error_count:
+            raise InvalidImportFile(errors=parser.errors, error_count=parser.error_count)
+        copied = time.perf_counter()
+
+        quizzes, questions, answers = await self.quiz_repository.merge_quiz_import(company_id=company_id)
+        merged = time.perf_counter()
+        return QuizImportReportSchema(
+            quizzes=quizzes,
+            questions=questions,
+            answers=answers,
+            rows=parser.rows,
+            copy_seconds=round(copied - started, 3),
+            merge_seconds=round(merged - copied, 3),
+            rows_per_second=round(parser.rows / (merged - started), 1),
+        )
 
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if company_member.role not in [CompanyMemberRole.OWNER]:
+    async def delete(self, quiz_id: UUID, company_id: UUID, user: User):
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        if not context.has_role(CompanyMemberRole.OWNER):
             raise PermissionDenied("Only company owners can delete quizzes.")
 
-        quiz = await self.quiz_repository.get(quiz_id=quiz_id, company=company)
-        if not quiz:
-            raise ObjectNotFound(model_name="Quiz", id_=quiz_id)
-
-        await self.quiz_repository.delete(quiz=quiz)
-
-    async def get_company_quizzes(self, company_id: UUID, user: User, limit: int = 10, offset: int = 0):
-        company = await self.company_repository.get(company_id=company_id, owner_id=user.id)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
-
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if not company_member:
-            raise PermissionDenied("You are not a member of this company.")
-
-        quizzes, total = await self.quiz_repository.get_quizzes_by_company(company=company, limit=limit, offset=offset)
-        quiz_schemas = [QuizOutputSchema.model_validate(quiz) for quiz in quizzes]
-
-        meta = PaginationMeta(
-            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
+        await self.quiz_repository.delete(quiz=context.quiz)
+
+    async def get_company_quizzes(
+        self,
+        company_id: UUID,
+        user: User,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ):
+        await self._get_member_role(company_id=company_id, user=user)
+
+        page = await self.quiz_repository.get_quizzes_by_company(
+            company_id=company_id, limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
         )
-        return PaginatedResponse[QuizOutputSchema](items=quiz_schemas, meta=meta)
+        quiz_schemas = [QuizOutputSchema.model_validate(quiz) for quiz in page.items]
 
-    async def calculate_score(self, quiz_payload: AttemptQuizInputSchema, quiz: Quiz) -> AttemptQuizResultSchema:
-        correct_count = 0
-        total_questions = len(quiz.questions)
-        answers_detail = []
+        meta = PaginationMeta.from_page(page, limit=limit, offset=offset, cursor=cursor)
+        return PaginatedResponse[QuizOutputSchema](items=quiz_schemas, meta=meta)
 
-        for quiz_question, user_question in zip(quiz.questions, quiz_payload.questions):
+    def _to_submission(
+        self, quiz_payload: AttemptQuizInputSchema, questions: list[QuestionTreeSchema]
+    ) -> QuizSubmissionSchema:
+        """Translate a submission that repeats the texts of the questions served and their answers into ids."""
+        answers = {}
+        for quiz_question, user_question in zip(questions, quiz_payload.questions):
             if quiz_question.question_text != user_question.question_text:
                 continue
+            chosen = {answer.answer_text for answer in user_question.answers if answer.is_correct}
+            known = {answer.answer_text for answer in quiz_question.answers}
+            if not chosen <= known:
+                # Choosing an answer the question doesn't have can't be right, leave it unanswered.
+                continue
+            answers[quiz_question.id] = [answer.id for answer in quiz_question.answers if answer.answer_text in chosen]
+        return QuizSubmissionSchema(draw_id=quiz_payload.draw_id, answers=answers)
+
+    async def attempt_quiz(
+        self,
+        quiz_payload: AttemptQuizInputSchema | QuizSubmissionSchema,
+        quiz_id: UUID,
+        company_id: UUID,
+        user: User,
+    ):
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        company, quiz = context.company, context.quiz
+        quiz_tree = await self.quiz_repository.get_tree(quiz=quiz)
+
+        draw = None
+        if quiz_payload.draw_id is not None or quiz.sample_size is not None:
+            draw = await self._get_draw(draw_id=quiz_payload.draw_id, quiz=quiz_tree, user=user)
+        positions = draw.positions if draw else None
+
+        if isinstance(quiz_payload, AttemptQuizInputSchema):
+            questions = quiz_tree.questions if draw is None else [quiz_tree.questions[p] for p in positions]
+            quiz_payload = self._to_submission(quiz_payload=quiz_payload, questions=questions)
+        result = grade_submission(submission=quiz_payload, quiz=quiz_tree, positions=positions)
+        attempt = await self._save_attempt(user=user, quiz=quiz, company=company, result=result)
+        if draw is not None:
+            # Answered once: another attempt takes another draw. Kept should the attempt not be committed.
+            await on_commit(partial(self.quiz_draw_repository.delete, draw_id=draw.draw_id))
+        return attempt
 
-            correct_answers = {ans.answer_text for ans in quiz_question.answers if ans.is_correct}
-            user_correct_answers = {ans.answer_text for ans in user_question.answers if ans.is_correct}
-
-            is_question_correct = correct_answers == user_correct_answers
-            if is_question_correct:
-                correct_count += 1
-
-            answers_for_question = [
-                AnswerUserResultSchema(
-                    answer_text=ans.answer_text,
-                    is_correct=ans.answer_text in correct_answers
-                ) for ans in user_question.answers
-            ]
-
-            answers_detail.append(
-                QuestionUserResultSchema(
-                    question_text=quiz_question.question_text,
-                    answers=answers_for_question
-                )
+    async def _save_attempt(
+        self,
+        user: User,
+        quiz: Quiz,
+        company: Company,
+        result: AttemptQuizResultSchema,
+        attempt_id: UUID | None = None,
+        attempted_at: datetime | None = None,
+    ):
+        """
+        Record a graded attempt, or queue it in stream mode, and add it to the history and leaderboards
+        once it is committed. The attempt gets a new id and the current time unless `attempt_id` and
+        `attempted_at` are given.
+        """
+        if settings.quiz.QUIZ_ATTEMPT_INGESTION == "stream":
+            attempt = await self._queue_attempt(
+                user=user,
+                quiz_id=quiz.id,
+                company_id=company.id,
+                result=result,
+                attempt_id=attempt_id,
+                attempted_at=attempted_at,
+            )
+        else:
+            attempt = await self.quiz_repository.record_quiz_attempt(
+                user=user, quiz=quiz, company=company, score=result, attempt_id=attempt_id, attempted_at=attempted_at
             )
 
-        score_percent = round((correct_count / total_questions) * 100, 2)
-        return AttemptQuizResultSchema(
-            score=score_percent,
-            total_questions=total_questions,
-            correct_answers_count=correct_count,
-            answers_detail=answers_detail
+        history_entry = QuizAttemptRedisSchema(
+            **AttemptQuizOutputSchema.model_validate(attempt).model_dump(), answers_detail=result.answers_detail
         )
+        # Scores are added up on the leaderboards, an attempt rolled back must never reach them.
+        await on_commit(partial(self._add_to_history, history_entry))
+        return attempt
 
-    async def attempt_quiz(self, quiz_payload: AttemptQuizInputSchema, quiz_id: UUID, company_id: UUID, user: User):
-        company = await self.company_repository.get(company_id=company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
+    async def _add_to_history(self, attempt: QuizAttemptRedisSchema) -> None:
+        try:
+            await self.attempt_history_repository.add(attempt)
+            await self.leaderboard_repository.record(
+                company_id=attempt.company_id, quiz_id=attempt.quiz_id, user_id=attempt.user_id, score=attempt.score
+            )
+        except RedisError:
+            # The nightly rebuild_leaderboards run brings the leaderboards back in line.
+            logger.warning("Attempt history and leaderboards are unavailable, attempt %s only stored in Postgres", attempt.id)
+
+    async def draw_questions(self, quiz_id: UUID, company_id: UUID, user: User) -> QuizDrawSchema:
+        """
+        Questions to answer in an attempt: `sample_size` of them drawn at random from a question bank,
+        all of them, in order, from other quizzes. The attempt is graded on exactly these questions.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        quiz = context.quiz
+        questions = await self.quiz_repository.draw_questions(quiz_id=quiz.id, sample_size=quiz.sample_size)
+        draw = QuizDrawRedisSchema(
+            draw_id=uuid4(),
+            user_id=user.id,
+            quiz_id=quiz.id,
+            quiz_version=quiz.version,
+            question_ids=[question.id for question in questions],
+            positions=[question.position for question in questions],
+        )
+        await self.quiz_draw_repository.add(draw)
+        return QuizDrawSchema(
+            draw_id=draw.draw_id,
+            quiz_id=quiz.id,
+            quiz_version=quiz.version,
+            expires_at=datetime.now(UTC).replace(tzinfo=None) + timedelta(seconds=self.quiz_draw_repository.ttl),
+            questions=[QuestionOutputSchema.model_validate(question) for question in questions],
+        )
 
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if not company_member:
-            raise PermissionDenied("You are not a member of this company.")
+    async def _get_draw(self, draw_id: UUID | None, quiz: QuizTreeSchema, user: User) -> QuizDrawRedisSchema:
+        if draw_id is None:
+            raise ConflictError("The questions of a question bank must be drawn before they are answered.")
+        draw = await self.quiz_draw_repository.get(draw_id=draw_id)
+        if draw is None or draw.user_id != user.id or draw.quiz_id != quiz.id:
+            raise ObjectNotFound(model_name="QuizDraw", id_=draw_id)
+        if draw.quiz_version != quiz.version:
+            raise ConflictError("The quiz was edited since its questions were drawn, draw them again.")
+        return draw
+
+    async def start_session(self, quiz_id: UUID, company_id: UUID, user: User) -> AttemptSessionSchema:
+        """
+        Start a timed attempt: its questions are drawn as by draw_questions, and the answers saved to the
+        session until it is submitted, or finalized by the finalize_attempt_sessions task once its
+        deadline has passed.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        quiz = context.quiz
+        questions = await self.quiz_repository.draw_questions(quiz_id=quiz.id, sample_size=quiz.sample_size)
+        started_at = datetime.now(UTC).replace(tzinfo=None)
+        session = AttemptSessionRedisSchema(
+            draw_id=uuid4(),
+            user_id=user.id,
+            user_email=user.email,
+            company_id=context.company.id,
+            quiz_id=quiz.id,
+            quiz_version=quiz.version,
+            question_ids=[question.id for question in questions],
+            positions=[question.position for question in questions],
+            started_at=started_at,
+            deadline=started_at + timedelta(seconds=quiz.time_limit or settings.quiz.QUIZ_SESSION_TIME_LIMIT),
+        )
+        await self.attempt_session_repository.add(session)
+        return AttemptSessionSchema(
+            session_id=session.draw_id,
+            quiz_id=quiz.id,
+            quiz_version=quiz.version,
+            started_at=session.started_at,
+            deadline=session.deadline,
+            questions=[QuestionOutputSchema.model_validate(question) for question in questions],
+        )
 
-        quiz = await self.quiz_repository.get(quiz_id=quiz_id, company=company)
-        if not quiz:
-            raise ObjectNotFound(model_name="Quiz", id_=quiz_id)
+    async def _get_session(self, session_id: UUID, quiz_id: UUID, user_email: str) -> AttemptSessionRedisSchema:
+        session = await self.attempt_session_repository.get(session_id=session_id)
+        if session is None or session.user_email != user_email or session.quiz_id != quiz_id:
+            raise ObjectNotFound(model_name="AttemptSession", id_=session_id)
+        return session
+
+    async def _get_session_tree(self, session: AttemptSessionRedisSchema) -> QuizTreeSchema:
+        """The tree of the version of the quiz the session was started at, through the quiz tree cache."""
+        quiz_tree = await self.quiz_repository.get_tree(quiz=Quiz(id=session.quiz_id, version=session.quiz_version))
+        if quiz_tree.version != session.quiz_version:
+            raise ConflictError("The quiz was edited since the attempt started, start it again.")
+        return quiz_tree
+
+    async def get_session(
+        self, quiz_id: UUID, company_id: UUID, session_id: UUID, user: User
+    ) -> AttemptSessionSchema:
+        """An attempt in progress with the answers saved so far, to carry on with it after a reload."""
+        await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        session = await self._get_session(session_id=session_id, quiz_id=quiz_id, user_email=user.email)
+        quiz_tree = await self._get_session_tree(session)
+        questions = [quiz_tree.questions[position] for position in session.positions]
+        return AttemptSessionSchema(
+            session_id=session.draw_id,
+            quiz_id=session.quiz_id,
+            quiz_version=session.quiz_version,
+            started_at=session.started_at,
+            deadline=session.deadline,
+            questions=[
+                QuestionOutputSchema(
+                    id=question.id,
+                    quiz_id=quiz_tree.id,
+                    question_text=question.question_text,
+                    answers=[
+                        AnswerOutputSchema(id=answer.id, question_id=question.id, answer_text=answer.answer_text)
+                        for answer in question.answers
+                    ],
+                )
+                for question in questions
+            ],
+            answers=await self.attempt_session_repository.get_answers(session_id=session.draw_id),
+        )
 
-        result = await self.calculate_score(quiz_payload=quiz_payload, quiz=quiz)
+    async def save_session_answer(
+        self, quiz_id: UUID, session_id: UUID, question_id: UUID, answer_ids: list[UUID] | None, user_email: str
+    ) -> None:
+        """
+        Save the answers chosen for a question of a session, None clearing them. Called on every change,
+        it is served from Redis alone: the user is the one the access token names, whose membership was
+        checked when the session started, and the answers are checked against the cached quiz tree.
+        """
+        session = await self._get_session(session_id=session_id, quiz_id=quiz_id, user_email=user_email)
+        if question_id not in session.question_ids:
+            raise ObjectNotFound(model_name="Question", id_=question_id)
+        if answer_ids is not None:
+            quiz_tree = await self._get_session_tree(session)
+            # Raises ObjectNotFound for answers the question doesn't have.
+            get_answer_key(quiz_tree).questions[question_id].mask(answer_ids)
+        saved = await self.attempt_session_repository.save_answer(
+            session_id=session_id, question_id=question_id, answer_ids=answer_ids
+        )
+        if not saved:
+            raise ConflictError("The time of the attempt is up, its answers can't be changed anymore.")
+
+    async def submit_session(self, quiz_id: UUID, company_id: UUID, session_id: UUID, user: User):
+        """Grade a session on the answers saved to it and record the attempt."""
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        session = await self._get_session(session_id=session_id, quiz_id=quiz_id, user_email=user.email)
+        quiz_tree = await self._get_session_tree(session)
+        if not await self.attempt_session_repository.claim(session_id=session_id):
+            # Submitted meanwhile, or being finalized now that its deadline passed.
+            raise ObjectNotFound(model_name="AttemptSession", id_=session_id)
+        # Submitted after its deadline but before the finalizer got to it, the attempt is recorded
+        # exactly as the finalizer would have: at the deadline, under the session id.
+        attempted_at = min(datetime.now(UTC).replace(tzinfo=None), session.deadline)
+        try:
+            answers = await self.attempt_session_repository.get_answers(session_id=session_id)
+            submission = QuizSubmissionSchema(draw_id=session_id, answers=answers)
+            result = grade_submission(submission=submission, quiz=quiz_tree, positions=session.positions)
+            attempt = await self._save_attempt(
+                user=user,
+                quiz=context.quiz,
+                company=context.company,
+                result=result,
+                attempt_id=session_id,
+                attempted_at=attempted_at,
+            )
+        except Exception:
+            await self.attempt_session_repository.release(session)
+            raise
+        # Kept until the attempt is committed, and put back to be finalized if it isn't.
+        await on_commit(
+            partial(self.attempt_session_repository.delete, session_id=session_id),
+            on_rollback=partial(self.attempt_session_repository.release, session),
+        )
+        return attempt
 
-        quiz_attempt_key = f"quiz_attempt:{user.id}:{company.id}:{quiz.id}"
-        quiz_attempt_value = QuizAttemptRedisSchema(
+    async def _queue_attempt(
+        self,
+        user: User,
+        quiz_id: UUID,
+        company_id: UUID,
+        result: AttemptQuizResultSchema,
+        attempt_id: UUID | None = None,
+        attempted_at: datetime | None = None,
+    ) -> AttemptQuizOutputSchema:
+        """Hand the graded attempt to the flush_quiz_attempts task instead of inserting it now."""
+        attempt = AttemptQuizOutputSchema(
+            # Generated here and used as the row's primary key, it makes re-delivered entries harmless.
+            id=attempt_id or uuid4(),
+            quiz_id=quiz_id,
             user_id=user.id,
-            company_id=company.id,
-            quiz_id=quiz.id,
+            company_id=company_id,
+            # Taken now rather than when the row is flushed, in UTC like the database clock.
+            last_attempt_time=attempted_at or datetime.now(UTC).replace(tzinfo=None),
             score=result.score,
             total_questions=result.total_questions,
             correct_answers_count=result.correct_answers_count,
-            answers_detail=result.answers_detail,
-        ).model_dump_json()
-
-        await self.redis_repository.set(
-            key=quiz_attempt_key,
-            value=quiz_attempt_value,
-            ex=48 * 60 * 60,  # 48 hours expiration
         )
-
-        attempt = await self.quiz_repository.record_quiz_attempt(user=user, quiz=quiz, company=company, score=result)
+        answers = result.model_dump(
+            include={"quiz_version", "answer_masks", "correct_questions", "question_ids"}, exclude_none=True
+        )
+        await attempt_stream.append(attempt_stream.to_entry({**attempt.model_dump(), **answers}))
         return attempt
 
-    async def get_quiz_attempts(self, quiz_id: UUID, company_id: UUID, user: User):
-        company = await self.company_repository.get(company_id=company_id, owner_id=None)
-        if not company:
-            raise ObjectNotFound(model_name="Company", id_=company_id)
-
-        company_member = await self.company_repository.get_company_member(company=company, user_id=user.id)
-        if not company_member:
-            raise PermissionDenied("You are not a member of this company.")
-
-        quiz = await self.quiz_repository.get(quiz_id=quiz_id, company=company)
-        if not quiz:
-            raise ObjectNotFound(model_name="Quiz", id_=quiz_id)
+    async def get_quiz_attempts(self, quiz_id: UUID, company_id: UUID, user: User) -> QuizAttemptRedisSchema:
+        """The user's latest attempt at the quiz."""
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+
+        try:
+            attempt = await self.attempt_history_repository.get_latest(user_id=user.id, quiz_id=quiz_id)
+        except RedisError:
+            logger.warning("Attempt history is unavailable, reading attempts from Postgres", exc_info=True)
+            attempt = None
+        if attempt is None:
+            row = await self.quiz_repository.get_last_user_attempt(user_id=user.id, quiz_id=quiz_id)
+            if row is None:
+                raise ObjectNotFound(model_name="QuizAttempt", id_=quiz_id)
+            attempt = QuizAttemptRedisSchema.model_validate(row)
+            if row.answer_masks is not None:
+                quiz_tree = await self.quiz_repository.get_tree(quiz=context.quiz)
+                # The masks follow the questions of the version answered, which later edits may have changed.
+                if quiz_tree.version == row.quiz_version:
+                    questions = quiz_tree.questions
+                    if row.question_ids is not None:
+                        by_id = {question.id: question for question in questions}
+                        questions = [by_id[question_id] for question_id in row.question_ids]
+                    attempt.answers_detail = answers_detail(questions=questions, answer_masks=row.answer_masks)
+        return attempt
 
-        quiz_attempt_key = f"{user.id}:{company.id}:{quiz.id}"
-        attempt = await self.redis_repository.get(key=quiz_attempt_key)
-        if not attempt:
-            return []
+    async def get_recent_attempts(self, user: User, limit: int = 10) -> list[QuizAttemptRedisSchema]:
+        """
+        The user's newest attempts across all companies, from the Redis history in one round trip.
+        Postgres is only read when the history may be missing some of them, which completes it.
+        """
+        try:
+            attempts, complete = await self.attempt_history_repository.get_recent(user_id=user.id, limit=limit)
+        except RedisError:
+            logger.warning("Attempt history is unavailable, reading attempts from Postgres", exc_info=True)
+            rows = await self.quiz_repository.get_user_attempts(user_id=user.id, limit=limit)
+            return [QuizAttemptRedisSchema.model_validate(row) for row in rows]
+        if complete or len(attempts) >= limit:
+            return attempts
+
+        # Attempts still queued for Postgres are only in Redis, those already there are kept as they have details.
+        rows = await self.quiz_repository.get_user_attempts(
+            user_id=user.id, limit=self.attempt_history_repository.size
+        )
+        known = {attempt.id for attempt in attempts}
+        attempts.extend(QuizAttemptRedisSchema.model_validate(row) for row in rows if row.id not in known)
+        attempts.sort(key=lambda attempt: attempt.last_attempt_time, reverse=True)
+        attempts = attempts[: self.attempt_history_repository.size]
+        try:
+            await self.attempt_history_repository.complete(user_id=user.id, attempts=attempts)
+        except RedisError:
+            logger.warning("Attempt history is unavailable, not completed from Postgres", exc_info=True)
+        return attempts[:limit]
+
+    async def get_company_stats(self, company_id: UUID, user: User) -> CompanyScoreStatsSchema:
+        """Score statistics of every attempt at the company's quizzes, read from one aggregate row."""
+        await self._get_member_role(company_id=company_id, user=user)
+        stats = await self.analytics_repository.get_company_stats(company_id=company_id)
+        return CompanyScoreStatsSchema.model_validate(stats) if stats else CompanyScoreStatsSchema(company_id=company_id)
+
+    async def get_company_quizzes_stats(self, company_id: UUID, user: User) -> list[QuizScoreStatsSchema]:
+        """Score statistics of each quiz of the company that has been attempted."""
+        await self._get_member_role(company_id=company_id, user=user)
+        stats = await self.analytics_repository.get_company_quizzes_stats(company_id=company_id)
+        return [QuizScoreStatsSchema.model_validate(quiz_stats) for quiz_stats in stats]
+
+    async def get_company_user_stats(self, company_id: UUID, user_id: UUID, user: User) -> CompanyUserScoreStatsSchema:
+        """Score statistics of a member in the company, for its owners and admins or the member themselves."""
+        # Another member's results are for owners and admins only, their role is read from the database.
+        role = await self._get_member_role(company_id=company_id, user=user, use_cache=user_id == user.id)
+        if user_id != user.id and role not in (CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can see the results of other members.")
+        stats = await self.analytics_repository.get_company_user_stats(company_id=company_id, user_id=user_id)
+        if stats is None:
+            return CompanyUserScoreStatsSchema(company_id=company_id, user_id=user_id)
+        return CompanyUserScoreStatsSchema.model_validate(stats)
+
+    async def get_user_stats(self, user_id: UUID) -> UserScoreStatsSchema:
+        """Score statistics of a user across all companies, their overall rating."""
+        stats = await self.analytics_repository.get_user_stats(user_id=user_id)
+        return UserScoreStatsSchema.model_validate(stats) if stats else UserScoreStatsSchema(user_id=user_id)
+
+    async def _get_leaderboard_page(
+        self, board: str, limit: int, offset: int
+    ) -> PaginatedResponse[LeaderboardEntrySchema]:
+        entries, total = await self.leaderboard_repository.get_page(board=board, limit=limit, offset=offset)
+        items = [
+            LeaderboardEntrySchema(user_id=user_id, rank=offset + position + 1, average_score=score)
+            for position, (user_id, score) in enumerate(entries)
+        ]
+        meta = PaginationMeta(
+            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
+        )
+        return PaginatedResponse[LeaderboardEntrySchema](items=items, meta=meta)
+
+    async def _get_leaderboard_rank(self, board: str, user: User) -> LeaderboardEntrySchema:
+        rank = await self.leaderboard_repository.get_rank(board=board, user_id=user.id)
+        if rank is None:
+            raise ObjectNotFound(model_name="LeaderboardEntry", id_=user.id)
+        position, score = rank
+        return LeaderboardEntrySchema(user_id=user.id, rank=position + 1, average_score=score)
+
+    async def get_company_leaderboard(
+        self, company_id: UUID, user: User, limit: int = 10, offset: int = 0
+    ) -> PaginatedResponse[LeaderboardEntrySchema]:
+        """Members of the company ranked by their average score."""
+        await self._get_member_role(company_id=company_id, user=user)
+        board = self.leaderboard_repository.company_board(company_id)
+        return await self._get_leaderboard_page(board=board, limit=limit, offset=offset)
+
+    async def get_company_rank(self, company_id: UUID, user: User) -> LeaderboardEntrySchema:
+        await self._get_member_role(company_id=company_id, user=user)
+        return await self._get_leaderboard_rank(board=self.leaderboard_repository.company_board(company_id), user=user)
+
+    async def get_quiz_leaderboard(
+        self, quiz_id: UUID, company_id: UUID, user: User, limit: int = 10, offset: int = 0
+    ) -> PaginatedResponse[LeaderboardEntrySchema]:
+        """Users who attempted the quiz ranked by their average score at it."""
+        await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        board = self.leaderboard_repository.quiz_board(quiz_id)
+        return await self._get_leaderboard_page(board=board, limit=limit, offset=offset)
+
+    async def get_quiz_rank(self, quiz_id: UUID, company_id: UUID, user: User) -> LeaderboardEntrySchema:
+        await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        return await self._get_leaderboard_rank(board=self.leaderboard_repository.quiz_board(quiz_id), user=user)
+
+    async def get_item_statistics(
+        self, quiz_id: UUID, company_id: UUID, user: User
+    ) -> QuizItemStatisticsSchema | ItemStatisticsJobSchema:
+        """
+        Item statistics of the current version of the quiz, or, while they aren't cached, the job
+        working them out in the background.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user, quiz_id=quiz_id)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can see quiz statistics.")
+
+        quiz = context.quiz
+        statistics = await item_statistics_cache.get(quiz_id=quiz.id, version=quiz.version)
+        if statistics is not None:
+            return statistics
+
+        job_id = str(uuid4())
+        running = await item_statistics_cache.claim_job(quiz_id=quiz.id, version=quiz.version, job_id=job_id)
+        if running == job_id:
+            compute_item_statistics.apply_async(args=(str(quiz.id), quiz.version), task_id=job_id)
+        return ItemStatisticsJobSchema(job_id=running, status=AsyncResult(running, app=celery_app).status)
+
+    async def export_company_attempts(
+        self, company_id: UUID, user: User, filters: AttemptExportFilterSchema, export_format: ExportFormat
+    ) -> AsyncIterator[bytes] | ExportJobSchema:
+        """
+        The company's attempts matching the filters, encoded as they are read from the database, or,
+        when there are more than can be served inline, the job writing them to the media storage.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can export attempts.")
+
+        max_rows = settings.quiz.QUIZ_EXPORT_INLINE_MAX_ROWS
+        rows = await self.quiz_repository.count_company_attempts(
+            company_id=company_id, filters=filters, limit=max_rows + 1
+        )
+        if rows > max_rows:
+            job = export_company_attempts.delay(str(company_id), filters.model_dump(mode="json"), export_format.value)
+            return ExportJobSchema(job_id=job.id, status=job.status)
 
-        quiz_schema = QuizAttemptRedisSchema.model_validate(json.loads(attempt))
-        return quiz_schema
\ No newline at end of file
+        batches = self.quiz_repository.stream_company_attempts(
+            company_id=company_id, filters=filters, batch_size=settings.quiz.QUIZ_EXPORT_BATCH_SIZE
+        )
+        return encode_attempts(batches, export_format)
+
+    async def export_archived_attempts(
+        self, company_id: UUID, user: User, filters: AttemptExportFilterSchema, export_format: ExportFormat
+    ) -> AsyncIterator[bytes]:
+        """
+        The company's archived attempts matching the filters, encoded as they are read from the
+        archive files of the months filtered on.
+        """
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can export attempts.")
+
+        batches = self.attempt_archive.read(
+            company_id=company_id, filters=filters, batch_size=settings.quiz.QUIZ_EXPORT_BATCH_SIZE
+        )
+        return encode_attempts(batches, export_format)
+
+    async def get_export_job(self, company_id: UUID, job_id: str, user: User) -> ExportJobSchema:
+        context = await self._get_access_context(company_id=company_id, user=user)
+        if not context.has_role(CompanyMemberRole.OWNER, CompanyMemberRole.ADMIN):
+            raise PermissionDenied("Only company owners and admins can export attempts.")
+
+        job = AsyncResult(job_id, app=celery_app)
+        if not job.successful():
+            return ExportJobSchema(job_id=job_id, status=job.status)
+        if job.result["company_id"] != str(company_id):
+            raise ObjectNotFound(model_name="ExportJob", id_=job_id)
+        return ExportJobSchema(job_id=job_id, status=job.status, url=job.result["url"], rows=job.result["rows"])
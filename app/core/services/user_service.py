@@ -4,7 +4,7 @@ from pydantic import EmailStr
 
 from app.core.interfaces.user_serv_interface import AbstractUserService
 from app.core.repositories.user_repository import AbstractUserRepository
-from app.core.schemas import PaginatedResponse, PaginationMeta
+from app.core.schemas import CountStrategy, PaginatedResponse, PaginationMeta
 from app.core.schemas.user_schemas import UserInputSchema, UserOutputSchema
 from app.infrastructure.postgres.models.user import User
 from app.infrastructure.security.password import hash_password
@@ -37,14 +37,16 @@ class UserService(AbstractUserService):
             raise ObjectNotFound(model_name="User", id_=uuid)
         return UserOutputSchema.model_validate(response)
 
-    async def get_all(self, limit: int, offset: int) -> PaginatedResponse[UserOutputSchema]:
-        users, total  = await self.user_repository.get_all(limit=limit, offset=offset)
-
-        user_schemas = [UserOutputSchema.model_validate(user) for user in users]
-        meta = PaginationMeta(
-            total=total, limit=limit, offset=offset, has_next=offset + limit < total, has_previous=offset > 0
+    async def get_all(
+        self, limit: int, offset: int, cursor: str | None = None, count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> PaginatedResponse[UserOutputSchema]:
+        page = await self.user_repository.get_all(
+            limit=limit, offset=offset, cursor=cursor, count_strategy=count_strategy
         )
 
+        user_schemas = [UserOutputSchema.model_validate(user) for user in page.items]
+        meta = PaginationMeta.from_page(page, limit=limit, offset=offset, cursor=cursor)
+
         return PaginatedResponse[UserOutputSchema](items=user_schemas, meta=meta)
 
     async def update(self, user: User, user_input: UserInputSchema) -> UserOutputSchema:
@@ -1,4 +1,5 @@
 from celery import Celery, Task
+from celery.schedules import crontab
 
 from app.settings import settings
 
@@ -8,6 +9,12 @@ celery_app: Celery = Celery(
     backend=settings.celery.celery_backend,
     include=[
         "app.infrastructure.celery.tasks.common",
+        "app.infrastructure.celery.tasks.attempts",
+        "app.infrastructure.celery.tasks.leaderboards",
+        "app.infrastructure.celery.tasks.exports",
+        "app.infrastructure.celery.tasks.partitions",
+        "app.infrastructure.celery.tasks.item_statistics",
+        "app.infrastructure.celery.tasks.attempt_sessions",
     ],
     task_cls=Task,
 )
@@ -23,4 +30,25 @@ celery_app.conf.beat_schedule = {
     #     "task": "<name>",
     #     "schedule": crontab(hour=0, minute=0),  # every day at 00:00
     # }
+    "flush_quiz_attempts": {
+        "task": "flush_quiz_attempts",
+        "schedule": settings.quiz.QUIZ_ATTEMPT_FLUSH_INTERVAL,
+        # A run that can't start before the next one is due is dropped, not queued behind it.
+        "options": {"expires": settings.quiz.QUIZ_ATTEMPT_FLUSH_INTERVAL},
+    },
+    "finalize_attempt_sessions": {
+        "task": "finalize_attempt_sessions",
+        "schedule": settings.quiz.QUIZ_SESSION_SWEEP_INTERVAL,
+        "options": {"expires": settings.quiz.QUIZ_SESSION_SWEEP_INTERVAL},
+    },
+    # Catches up with scores missed while Redis was unavailable and drops members who left.
+    "rebuild_leaderboards": {
+        "task": "rebuild_leaderboards",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    # Partitions are created months ahead, a daily run leaves plenty of retries before one is needed.
+    "maintain_attempt_partitions": {
+        "task": "maintain_attempt_partitions",
+        "schedule": crontab(hour=2, minute=30),
+    },
 }
@@ -0,0 +1,114 @@
+import logging
+
+from redis.exceptions import RedisError
+from sqlalchemy.exc import NoResultFound
+
+from app.core.repositories.attempt_history_repository import AttemptHistoryRepository
+from app.core.repositories.attempt_session_repository import AttemptSessionRepository
+from app.core.repositories.leaderboard_repository import LeaderboardRepository
+from app.core.repositories.quiz_repository import QuizRepository
+from app.core.schemas.quiz_schemas import (
+    AttemptQuizOutputSchema,
+    AttemptSessionRedisSchema,
+    QuizAttemptRedisSchema,
+    QuizSubmissionSchema,
+)
+from app.core.services.grading import grade_submission
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.postgres.models import Quiz
+from app.infrastructure.redis import get_redis_client
+from app.infrastructure.redis.attempt_stream import attempt_stream
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _finalize_session(
+    session_repository: AttemptSessionRepository, quiz_repository: QuizRepository, session: AttemptSessionRedisSchema
+) -> QuizAttemptRedisSchema | None:
+    """
+    Grade a session on the answers saved to it and queue the attempt in the attempts stream, for
+    flush_quiz_attempts to write with the others. None when its quiz was deleted or edited since.
+    """
+    try:
+        quiz_tree = await quiz_repository.get_tree(quiz=Quiz(id=session.quiz_id, version=session.quiz_version))
+    except NoResultFound:
+        return None
+    if quiz_tree.version != session.quiz_version:
+        return None
+
+    answers = await session_repository.get_answers(session_id=session.draw_id)
+    submission = QuizSubmissionSchema(draw_id=session.draw_id, answers=answers)
+    result = grade_submission(submission=submission, quiz=quiz_tree, positions=session.positions)
+    attempt = AttemptQuizOutputSchema(
+        # The session id and deadline make the row's primary key, a session queued twice is written once.
+        id=session.draw_id,
+        quiz_id=session.quiz_id,
+        user_id=session.user_id,
+        company_id=session.company_id,
+        last_attempt_time=session.deadline,
+        score=result.score,
+        total_questions=result.total_questions,
+        correct_answers_count=result.correct_answers_count,
+    )
+    answer_details = result.model_dump(
+        include={"quiz_version", "answer_masks", "correct_questions", "question_ids"}, exclude_none=True
+    )
+    await attempt_stream.append(attempt_stream.to_entry({**attempt.model_dump(), **answer_details}))
+    return QuizAttemptRedisSchema(**attempt.model_dump(), answers_detail=result.answers_detail)
+
+
+async def _finalize_attempt_sessions() -> int:
+    client = get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS)
+    session_repository = AttemptSessionRepository(
+        client=client, retention=settings.redis.REDIS_ATTEMPT_SESSION_RETENTION
+    )
+    quiz_repository = QuizRepository()
+    attempt_history_repository = AttemptHistoryRepository(
+        client=client, ttl=settings.redis.REDIS_ATTEMPT_HISTORY_TTL, size=settings.redis.REDIS_ATTEMPT_HISTORY_SIZE
+    )
+    leaderboard_repository = LeaderboardRepository(client=client)
+
+    finalized = 0
+    for session_id in await session_repository.get_due(limit=settings.quiz.QUIZ_ATTEMPT_BATCH_SIZE):
+        # Claimed first, a session submitted meanwhile is left to the submission.
+        if not await session_repository.claim(session_id=session_id):
+            continue
+        session = await session_repository.get(session_id=session_id)
+        if session is None:
+            # Expired past its retention while this task wasn't running.
+            continue
+        try:
+            attempt = await _finalize_session(session_repository, quiz_repository, session)
+        except Exception:
+            logger.exception("Failed to finalize attempt session %s, it is retried on the next run", session_id)
+            await session_repository.release(session)
+            continue
+        await session_repository.delete(session_id=session_id)
+        if attempt is None:
+            logger.warning("Dropped attempt session %s, its quiz was deleted or edited since it started", session_id)
+            continue
+        finalized += 1
+        try:
+            await attempt_history_repository.add(attempt)
+            await leaderboard_repository.record(
+                company_id=attempt.company_id, quiz_id=attempt.quiz_id, user_id=attempt.user_id, score=attempt.score
+            )
+        except RedisError:
+            logger.warning(
+                "Attempt history and leaderboards are unavailable, attempt %s only stored in Postgres", attempt.id
+            )
+    return finalized
+
+
+@celery_app.task(name="finalize_attempt_sessions")
+def finalize_attempt_sessions() -> int:
+    """
+    Submit the attempt sessions whose deadline has passed with the answers saved to them, a batch per run.
+    Returns the number of sessions finalized.
+    """
+    finalized = run_async(_finalize_attempt_sessions())
+    if finalized:
+        logger.info("Finalized %s attempt sessions past their deadline", finalized)
+    return finalized
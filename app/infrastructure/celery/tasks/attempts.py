@@ -0,0 +1,64 @@
+import logging
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.repositories.quiz_repository import QuizRepository
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.redis.attempt_stream import attempt_stream
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# A run stops picking up new batches after this long, the next scheduled run carries on.
+FLUSH_TIME_BUDGET = 30.0
+
+
+async def _flush_batch(quiz_repository: QuizRepository, entries: list[tuple[str, dict[str, str]]]) -> int:
+    try:
+        inserted = await quiz_repository.record_quiz_attempts(
+            attempts=[attempt_stream.from_entry(entry) for _, entry in entries]
+        )
+    except IntegrityError:
+        # An attempt of a quiz or user deleted meanwhile fails the whole statement,
+        # insert one at a time to set the offending ones aside.
+        inserted = 0
+        for entry_id, entry in entries:
+            try:
+                row_inserted = await quiz_repository.record_quiz_attempts(attempts=[attempt_stream.from_entry(entry)])
+            except IntegrityError as error:
+                await attempt_stream.dead_letter(entry_id, entry, reason=str(error.orig))
+                continue
+            await attempt_stream.ack([entry_id], inserted=row_inserted)
+            inserted += row_inserted
+        return inserted
+
+    await attempt_stream.ack([entry_id for entry_id, _ in entries], inserted=inserted)
+    return inserted
+
+
+async def _flush_quiz_attempts() -> int:
+    quiz_repository = QuizRepository()
+    await attempt_stream.ensure_group()
+
+    flushed = 0
+    started = time.monotonic()
+    while time.monotonic() - started < FLUSH_TIME_BUDGET:
+        entries = await attempt_stream.read(count=settings.quiz.QUIZ_ATTEMPT_BATCH_SIZE)
+        if not entries:
+            break
+        flushed += await _flush_batch(quiz_repository, entries)
+    return flushed
+
+
+@celery_app.task(name="flush_quiz_attempts")
+def flush_quiz_attempts() -> int:
+    """
+    Write quiz attempts queued in the attempts stream to Postgres, a batch per INSERT.
+    Returns the number of attempts inserted.
+    """
+    flushed = run_async(_flush_quiz_attempts())
+    if flushed:
+        logger.info("Flushed %s quiz attempts", flushed)
+    return flushed
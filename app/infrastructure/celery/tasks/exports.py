@@ -0,0 +1,48 @@
+import logging
+from typing import AsyncIterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from app.core.repositories.quiz_repository import QuizRepository
+from app.core.schemas.export_schemas import AttemptExportFilterSchema, ExportFormat
+from app.core.services.attempt_export import encode_attempts
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.storage import create_local_storage
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _export_company_attempts(company_id: UUID, filters: AttemptExportFilterSchema, export_format: ExportFormat) -> dict:
+    exported = 0
+
+    async def counted(batches: AsyncIterable[Sequence[Row]]):
+        nonlocal exported
+        async for batch in batches:
+            exported += len(batch)
+            yield batch
+
+    batches = QuizRepository().stream_company_attempts(
+        company_id=company_id, filters=filters, batch_size=settings.quiz.QUIZ_EXPORT_BATCH_SIZE
+    )
+    url = await create_local_storage(settings.file_storage).save_stream(
+        encode_attempts(counted(batches), export_format), filename=f"attempts.{export_format.value}"
+    )
+    return {"company_id": str(company_id), "url": url, "rows": exported}
+
+
+@celery_app.task(name="export_company_attempts")
+def export_company_attempts(company_id: str, filters: dict, export_format: str) -> dict:
+    """
+    Write the company's attempts matching the filters to a file in the media storage.
+    Returns the company id, the URL of the file and the number of attempts written.
+    """
+    result = run_async(
+        _export_company_attempts(
+            UUID(company_id), AttemptExportFilterSchema.model_validate(filters), ExportFormat(export_format)
+        )
+    )
+    logger.info("Exported %s attempts of company %s to %s", result["rows"], company_id, result["url"])
+    return result
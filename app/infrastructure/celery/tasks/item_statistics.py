@@ -0,0 +1,35 @@
+import logging
+from uuid import UUID
+
+from app.core.repositories.quiz_repository import QuizRepository
+from app.core.services import item_statistics
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.redis.item_statistics_cache import item_statistics_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def _compute_item_statistics(quiz_id: UUID, version: int) -> dict:
+    quiz_repository = QuizRepository()
+    quiz = await quiz_repository.get_by_id(quiz_id=quiz_id)
+    if quiz is None or quiz.version != version:
+        # Deleted or edited since the job was queued, its statistics would be of another version.
+        return {"quiz_id": str(quiz_id), "quiz_version": version, "attempts": None}
+
+    tree = await quiz_repository.get_tree(quiz=quiz)
+    rows = await quiz_repository.get_attempt_answers(quiz_id=quiz_id, quiz_version=version)
+    statistics = item_statistics.compute_item_statistics(quiz=tree, rows=rows)
+    await item_statistics_cache.set(statistics)
+    return {"quiz_id": str(quiz_id), "quiz_version": version, "attempts": statistics.attempts_count}
+
+
+@celery_app.task(name="compute_item_statistics")
+def compute_item_statistics(quiz_id: str, version: int) -> dict:
+    """
+    Work out the item statistics of a version of a quiz from the packed answers of all its attempts,
+    and cache them for the quiz statistics endpoint.
+    """
+    result = run_async(_compute_item_statistics(UUID(quiz_id), version))
+    logger.info("Computed item statistics of quiz %s version %s over %s attempts", quiz_id, version, result["attempts"])
+    return result
@@ -0,0 +1,49 @@
+import logging
+from collections import defaultdict
+from uuid import UUID
+
+from app.core.repositories.analytics_repository import AnalyticsRepository
+from app.core.repositories.leaderboard_repository import LeaderboardRepository
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.redis import get_redis_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _rebuild_company(
+    analytics_repository: AnalyticsRepository, leaderboard_repository: LeaderboardRepository, company_id: UUID
+) -> None:
+    company_totals = {
+        row.user_id: (row.score_sum, row.attempts_count)
+        for row in await analytics_repository.get_member_score_totals(company_id=company_id)
+    }
+    quiz_totals = defaultdict(dict)
+    for row in await analytics_repository.get_quiz_member_score_totals(company_id=company_id):
+        quiz_totals[row.quiz_id][row.user_id] = (row.score_sum, row.attempts_count)
+    await leaderboard_repository.replace_company(
+        company_id=company_id, company_totals=company_totals, quiz_totals=quiz_totals
+    )
+
+
+async def _rebuild_leaderboards(company_id: UUID | None) -> int:
+    analytics_repository = AnalyticsRepository()
+    leaderboard_repository = LeaderboardRepository(client=get_redis_client(settings.redis.REDIS_DB_QUIZ_ANSWERS))
+    company_ids = [company_id] if company_id else await analytics_repository.get_scored_company_ids()
+    for company_id in company_ids:
+        await _rebuild_company(analytics_repository, leaderboard_repository, company_id)
+    return len(company_ids)
+
+
+@celery_app.task(name="rebuild_leaderboards")
+def rebuild_leaderboards(company_id: str | None = None) -> int:
+    """
+    Rebuild the leaderboards of a company and its quizzes, or of every company, from Postgres.
+    Run after losing Redis data with
+    `celery -A app.infrastructure.celery.celery_app call rebuild_leaderboards [--args='["<company_id>"]']`.
+    Returns the number of companies rebuilt.
+    """
+    rebuilt = run_async(_rebuild_leaderboards(UUID(company_id) if company_id else None))
+    logger.info("Rebuilt the leaderboards of %s companies", rebuilt)
+    return rebuilt
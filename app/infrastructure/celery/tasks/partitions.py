@@ -0,0 +1,76 @@
+import logging
+from datetime import datetime
+
+from app.core.repositories.quiz_repository import QuizRepository
+from app.infrastructure.celery.celery_app import celery_app
+from app.infrastructure.celery.utils import run_async
+from app.infrastructure.postgres.partitions import (
+    add_months,
+    create_attempt_partition,
+    detach_attempt_partition,
+    drop_attempt_partition,
+    get_attempt_partitions,
+    month_start,
+    partition_name,
+)
+from app.infrastructure.storage import create_attempt_archive
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _archive_month(month: datetime) -> None:
+    archived = await create_attempt_archive(settings.quiz).write_month(
+        month=month,
+        batches=QuizRepository().stream_month_attempts(month=month, batch_size=settings.quiz.QUIZ_EXPORT_BATCH_SIZE),
+    )
+    logger.info(
+        "Archived %s attempts of %s companies made in %s", sum(archived.values()), len(archived), f"{month:%Y-%m}"
+    )
+
+
+async def _maintain_attempt_partitions() -> dict[str, list[str]]:
+    partitions = await get_attempt_partitions()
+    current = month_start()
+
+    created = []
+    for offset in range(settings.quiz.QUIZ_ATTEMPT_PARTITIONS_AHEAD + 1):
+        month = add_months(current, offset)
+        if month not in partitions:
+            moved = await create_attempt_partition(month=month)
+            if moved:
+                logger.warning("Moved %s attempts of %s out of the default partition", moved, f"{month:%Y-%m}")
+            created.append(partition_name(month))
+
+    retired = []
+    if settings.quiz.QUIZ_ATTEMPT_RETENTION_MONTHS > 0:
+        cutoff = add_months(current, -settings.quiz.QUIZ_ATTEMPT_RETENTION_MONTHS)
+        for month, name in sorted(partitions.items()):
+            if month >= cutoff:
+                break
+            if settings.quiz.QUIZ_ATTEMPT_RETENTION_ACTION == "detach":
+                await detach_attempt_partition(name=name)
+            else:
+                if settings.quiz.QUIZ_ATTEMPT_RETENTION_ACTION == "archive":
+                    # The partition is only dropped once every file of the month is written.
+                    await _archive_month(month)
+                await drop_attempt_partition(name=name)
+            retired.append(name)
+    return {"created": created, "retired": retired}
+
+
+@celery_app.task(name="maintain_attempt_partitions")
+def maintain_attempt_partitions() -> dict[str, list[str]]:
+    """
+    Create the monthly partitions of user_quiz_attempts for the current month and the
+    QUIZ_ATTEMPT_PARTITIONS_AHEAD next ones, and archive, detach or drop (QUIZ_ATTEMPT_RETENTION_ACTION)
+    those of months older than QUIZ_ATTEMPT_RETENTION_MONTHS.
+    """
+    changes = run_async(_maintain_attempt_partitions())
+    logger.info(
+        "Created attempt partitions %s, retired (%s) %s",
+        changes["created"],
+        settings.quiz.QUIZ_ATTEMPT_RETENTION_ACTION,
+        changes["retired"],
+    )
+    return changes
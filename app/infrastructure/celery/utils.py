@@ -0,0 +1,19 @@
+import asyncio
+from typing import Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_async(coroutine: Coroutine[None, None, T]) -> T:
+    """
+    Run a coroutine from a (synchronous) task.
+    Every task of a worker process runs on the same event loop, so the database and Redis
+    connection pools, which are bound to the loop they were opened on, are reused across tasks.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coroutine)
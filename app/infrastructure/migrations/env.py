@@ -5,6 +5,7 @@ from alembic.script import ScriptDirectory
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.infrastructure.postgres.models.base import BaseModelMixin
+from app.infrastructure.postgres.partitions import ATTEMPTS_TABLE
 from app.settings import settings
 
 # this is the Alembic Config object, which provides
@@ -46,6 +47,13 @@ def process_revision_directives(context, revision, directives):
     migration_script.rev_id = f"{new_rev_id:05}"
 
 
+# Partitions of user_quiz_attempts, and those detached from it, are managed outside of the models
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith(f"{ATTEMPTS_TABLE}_")
+    return True
+
+
 # Offline mode: no active database connection
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
@@ -77,6 +85,7 @@ def do_run_migrations(connection):
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
+        include_name=include_name,
         process_revision_directives=process_revision_directives,
     )
     with context.begin_transaction():
@@ -0,0 +1,42 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 00009
+Revises: 00008
+Create Date: 2026-10-17 10:12:41.530219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00009'
+down_revision: Union[str, None] = '00008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Listings are ordered by (created_at DESC, id DESC) and filtered by the leading columns,
+# so a backward scan of these indexes serves any page without sorting or skipping rows.
+INDEXES = (
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_companies_owner_id_created_at_id', 'companies', ['owner_id', 'created_at', 'id']),
+    ('ix_companies_company_status_created_at_id', 'companies', ['company_status', 'created_at', 'id']),
+    ('ix_quizzes_company_id_created_at_id', 'quizzes', ['company_id', 'created_at', 'id']),
+    ('ix_company_members_user_id_company_id', 'company_members', ['user_id', 'company_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,56 @@
+"""add_foreign_key_hot_path_indexes
+
+Revision ID: 00010
+Revises: 00009
+Create Date: 2026-10-17 11:02:17.408113
+
+EXPLAIN (ANALYZE) of the hot-path lookups before/after, on a local dataset of
+20k users, 10k memberships, 50k invitations, 100k questions, 400k answers and
+500k attempts:
+
+    company_members by (company_id)               Seq Scan          0.6 ms -> Bitmap Index Scan  0.08 ms
+    company_invitations by (invited_user_id, st)  Seq Scan          9.8 ms -> Index Scan         0.08 ms
+    company_invitations by (company_id, status)   Seq Scan          4.3 ms -> Bitmap Index Scan  0.07 ms
+    questions by quiz_id (selectin load)          Seq Scan          8.1 ms -> Bitmap Index Scan  0.09 ms
+    answers by question_id IN (...)               Parallel Seq Scan  42 ms -> Bitmap Index Scan  0.12 ms
+    user_quiz_attempts by (user_id, quiz_id)      Parallel Seq Scan  48 ms -> Index Scan         0.08 ms
+    user_quiz_attempts by company, newest 50      Backward scan of
+                                                  created_at + filter 69 ms -> Index Scan Backward 0.09 ms
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00010'
+down_revision: Union[str, None] = '00009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# quizzes(company_id, created_at) is served by ix_quizzes_company_id_created_at_id from 00009.
+INDEXES = (
+    ('ix_company_members_company_id_user_id', 'company_members', ['company_id', 'user_id']),
+    ('ix_company_invitations_invited_user_id_status', 'company_invitations', ['invited_user_id', 'status']),
+    ('ix_company_invitations_company_id_status', 'company_invitations', ['company_id', 'status']),
+    ('ix_questions_quiz_id', 'questions', ['quiz_id']),
+    ('ix_answers_question_id', 'answers', ['question_id']),
+    ('ix_user_quiz_attempts_user_id_quiz_id', 'user_quiz_attempts', ['user_id', 'quiz_id']),
+    ('ix_user_quiz_attempts_company_id_created_at', 'user_quiz_attempts', ['company_id', 'created_at']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
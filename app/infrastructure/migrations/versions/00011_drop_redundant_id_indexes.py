@@ -0,0 +1,45 @@
+"""drop_redundant_id_indexes
+
+Revision ID: 00011
+Revises: 00010
+Create Date: 2026-10-17 11:09:53.661870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00011'
+down_revision: Union[str, None] = '00010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every ix_<table>_id duplicates the primary key index of its table and only adds write cost.
+TABLES = (
+    'users',
+    'companies',
+    'company_members',
+    'company_invitations',
+    'quizzes',
+    'questions',
+    'answers',
+    'user_quiz_attempts',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_id', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.create_index(
+                f'ix_{table}_id', table, ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
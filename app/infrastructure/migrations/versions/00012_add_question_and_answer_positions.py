@@ -0,0 +1,51 @@
+"""add_question_and_answer_positions
+
+Revision ID: 00012
+Revises: 00011
+Create Date: 2026-10-17 12:26:03.117482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00012'
+down_revision: Union[str, None] = '00011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('answers', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    # Number existing rows in the order they were created.
+    op.execute(
+        """
+        UPDATE questions SET position = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY quiz_id ORDER BY created_at, id) - 1 AS position
+            FROM questions
+        ) AS numbered
+        WHERE questions.id = numbered.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE answers SET position = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY question_id ORDER BY created_at, id) - 1 AS position
+            FROM answers
+        ) AS numbered
+        WHERE answers.id = numbered.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('answers', 'position')
+    op.drop_column('questions', 'position')
@@ -0,0 +1,28 @@
+"""add_quiz_version
+
+Revision ID: 00013
+Revises: 00012
+Create Date: 2026-10-17 14:02:41.530219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00013'
+down_revision: Union[str, None] = '00012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quizzes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quizzes', 'version')
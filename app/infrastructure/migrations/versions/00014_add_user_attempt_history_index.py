@@ -0,0 +1,42 @@
+"""add_user_attempt_history_index
+
+Revision ID: 00014
+Revises: 00013
+Create Date: 2026-10-17 15:20:52.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00014'
+down_revision: Union[str, None] = '00013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Newest attempts of a user, read when their history isn't in Redis.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_quiz_attempts_user_id_created_at',
+            'user_quiz_attempts',
+            ['user_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_quiz_attempts_user_id_created_at',
+            table_name='user_quiz_attempts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,83 @@
+"""add_score_stats
+
+Revision ID: 00015
+Revises: 00014
+Create Date: 2026-10-17 16:41:09.318552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00015'
+down_revision: Union[str, None] = '00014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table name -> key columns and the table each of them references.
+STATS_TABLES = {
+    'quiz_score_stats': {'quiz_id': 'quizzes', 'company_id': 'companies'},
+    'company_score_stats': {'company_id': 'companies'},
+    'user_score_stats': {'user_id': 'users'},
+    'company_user_score_stats': {'company_id': 'companies', 'user_id': 'users'},
+}
+PRIMARY_KEYS = {
+    'quiz_score_stats': ['quiz_id'],
+    'company_score_stats': ['company_id'],
+    'user_score_stats': ['user_id'],
+    'company_user_score_stats': ['company_id', 'user_id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, keys in STATS_TABLES.items():
+        op.create_table(
+            table,
+            *(sa.Column(column, sa.Uuid(), nullable=False) for column in keys),
+            sa.Column('attempts_count', sa.BigInteger(), server_default='0', nullable=False),
+            sa.Column('score_sum', sa.Float(), server_default='0', nullable=False),
+            sa.Column('score_sumsq', sa.Float(), server_default='0', nullable=False),
+            sa.Column('passed_count', sa.BigInteger(), server_default='0', nullable=False),
+            sa.Column('correct_answers_sum', sa.BigInteger(), server_default='0', nullable=False),
+            sa.Column('total_questions_sum', sa.BigInteger(), server_default='0', nullable=False),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+            *(
+                sa.ForeignKeyConstraint([column], [f'{referenced}.id'], ondelete='CASCADE')
+                for column, referenced in keys.items()
+            ),
+            sa.PrimaryKeyConstraint(*PRIMARY_KEYS[table]),
+        )
+    op.create_index('ix_quiz_score_stats_company_id', 'quiz_score_stats', ['company_id'], unique=False)
+
+    # Start from the attempts recorded so far.
+    for table, keys in STATS_TABLES.items():
+        columns = ', '.join(keys)
+        op.execute(
+            sa.text(
+                f"""
+                INSERT INTO {table} ({columns}, attempts_count, score_sum, score_sumsq, passed_count,
+                                     correct_answers_sum, total_questions_sum)
+                SELECT {columns}, count(*), sum(score), sum(score * score), count(*) FILTER (WHERE score >= :pass_score),
+                       sum(correct_answers_count), sum(total_questions)
+                FROM user_quiz_attempts
+                GROUP BY {columns}
+                """
+            ).bindparams(pass_score=settings.quiz.QUIZ_PASS_SCORE)
+        )
+
+    # Never written to, the number of attempts of a quiz is now quiz_score_stats.attempts_count.
+    op.drop_column('quizzes', 'counter')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('quizzes', sa.Column('counter', sa.Integer(), server_default='0', nullable=False))
+    op.drop_index('ix_quiz_score_stats_company_id', table_name='quiz_score_stats')
+    for table in reversed(STATS_TABLES):
+        op.drop_table(table)
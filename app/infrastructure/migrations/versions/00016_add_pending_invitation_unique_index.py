@@ -0,0 +1,60 @@
+"""add_pending_invitation_unique_index
+
+Revision ID: 00016
+Revises: 00015
+Create Date: 2026-10-17 18:05:12.417530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00016'
+down_revision: Union[str, None] = '00015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Earlier duplicates of a pending invitation can't be told apart from the latest one,
+        # cancel them so the unique index can be built.
+        op.execute(
+            """
+            UPDATE company_invitations SET status = 'CANCELED', updated_at = now()
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (
+                        PARTITION BY company_id, invited_user_id, invitation_type ORDER BY created_at DESC, id
+                    ) AS position
+                    FROM company_invitations
+                    WHERE status = 'PENDING'
+                ) AS pending
+                WHERE position > 1
+            )
+            """
+        )
+        op.create_index(
+            'uq_company_invitations_pending',
+            'company_invitations',
+            ['company_id', 'invited_user_id', 'invitation_type'],
+            unique=True,
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_company_invitations_pending',
+            table_name='company_invitations',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
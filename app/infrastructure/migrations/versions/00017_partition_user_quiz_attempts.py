@@ -0,0 +1,112 @@
+"""partition_user_quiz_attempts
+
+Revision ID: 00017
+Revises: 00016
+Create Date: 2026-10-17 19:12:40.226815
+
+Turns user_quiz_attempts into a table range partitioned by month of created_at. The attempts are
+copied into the new table, so the upgrade takes as long as a full copy of them and holds writes to
+user_quiz_attempts meanwhile; run it in a maintenance window on large installs.
+
+"""
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00017'
+down_revision: Union[str, None] = '00016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    'id, user_id, quiz_id, company_id, score, last_attempt_time, total_questions, '
+    'correct_answers_count, created_at, updated_at'
+)
+INDEXES = {
+    'ix_user_quiz_attempts_created_at': ['created_at'],
+    'ix_user_quiz_attempts_user_id_quiz_id': ['user_id', 'quiz_id'],
+    'ix_user_quiz_attempts_company_id_created_at': ['company_id', 'created_at'],
+    'ix_user_quiz_attempts_user_id_created_at': ['user_id', 'created_at'],
+}
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _rename_old_table(old: str, new: str) -> None:
+    op.rename_table(old, new)
+    op.execute(f'ALTER INDEX {old}_pkey RENAME TO {new}_pkey')
+    for index in INDEXES:
+        op.execute(f'ALTER INDEX {index} RENAME TO {index.replace(old, new)}')
+
+
+def _create_table(primary_key: list[str], **kwargs) -> None:
+    op.create_table(
+        'user_quiz_attempts',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('quiz_id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('last_attempt_time', sa.DateTime(), nullable=False),
+        sa.Column('total_questions', sa.Integer(), nullable=False),
+        sa.Column('correct_answers_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **kwargs,
+    )
+    for index, columns in INDEXES.items():
+        op.create_index(index, 'user_quiz_attempts', columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('LOCK TABLE user_quiz_attempts IN EXCLUSIVE MODE')
+    _rename_old_table('user_quiz_attempts', 'user_quiz_attempts_unpartitioned')
+    _create_table(['id', 'created_at'], postgresql_partition_by='RANGE (created_at)')
+
+    # Rows of a month without a partition land here, the maintain_attempt_partitions task moves
+    # them to their partition when creating it.
+    op.execute('CREATE TABLE user_quiz_attempts_default PARTITION OF user_quiz_attempts DEFAULT')
+
+    current = _month_start(datetime.now(UTC).replace(tzinfo=None))
+    oldest = op.get_bind().execute(sa.text('SELECT min(created_at) FROM user_quiz_attempts_unpartitioned')).scalar()
+    month = _month_start(oldest) if oldest else current
+    last = _add_months(current, settings.quiz.QUIZ_ATTEMPT_PARTITIONS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE user_quiz_attempts_y{month.year:04d}m{month.month:02d} PARTITION OF user_quiz_attempts "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute(f'INSERT INTO user_quiz_attempts ({COLUMNS}) SELECT {COLUMNS} FROM user_quiz_attempts_unpartitioned')
+    op.drop_table('user_quiz_attempts_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Attempts of partitions detached by the retention policy aren't brought back.
+    op.execute('LOCK TABLE user_quiz_attempts IN EXCLUSIVE MODE')
+    _rename_old_table('user_quiz_attempts', 'user_quiz_attempts_partitioned')
+    _create_table(['id'])
+    op.execute(f'INSERT INTO user_quiz_attempts ({COLUMNS}) SELECT {COLUMNS} FROM user_quiz_attempts_partitioned')
+    # Dropping the partitioned table drops its partitions.
+    op.drop_table('user_quiz_attempts_partitioned')
@@ -0,0 +1,60 @@
+"""add_attempt_answer_details
+
+Revision ID: 00018
+Revises: 00017
+Create Date: 2026-10-17 21:04:18.663102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00018'
+down_revision: Union[str, None] = '00017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX = 'ix_user_quiz_attempts_quiz_id_quiz_version'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Added to the partitioned table, the columns are added to every partition; being nullable
+    # without a default, no row is rewritten.
+    op.add_column('user_quiz_attempts', sa.Column('quiz_version', sa.Integer(), nullable=True))
+    op.add_column('user_quiz_attempts', sa.Column('answer_masks', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+    op.add_column('user_quiz_attempts', sa.Column('correct_questions', sa.LargeBinary(), nullable=True))
+
+    # An index can't be built concurrently on a partitioned table: it is created on the table alone,
+    # invalid until the index of every partition, built concurrently, is attached to it.
+    op.execute(f'CREATE INDEX IF NOT EXISTS {INDEX} ON ONLY user_quiz_attempts (quiz_id, quiz_version)')
+    partitions = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'user_quiz_attempts'
+            """
+        )
+    ).scalars().all()
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_quiz_id_quiz_version_idx '
+                f'ON {partition} (quiz_id, quiz_version)'
+            )
+            op.execute(f'ALTER INDEX {INDEX} ATTACH PARTITION {partition}_quiz_id_quiz_version_idx')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name='user_quiz_attempts')
+    op.drop_column('user_quiz_attempts', 'correct_questions')
+    op.drop_column('user_quiz_attempts', 'answer_masks')
+    op.drop_column('user_quiz_attempts', 'quiz_version')
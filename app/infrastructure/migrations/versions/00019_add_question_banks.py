@@ -0,0 +1,54 @@
+"""add_question_banks
+
+Revision ID: 00019
+Revises: 00018
+Create Date: 2026-10-17 22:10:51.384027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00019'
+down_revision: Union[str, None] = '00018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quizzes', sa.Column('sample_size', sa.Integer(), nullable=True))
+    op.add_column('user_quiz_attempts', sa.Column('question_ids', postgresql.ARRAY(sa.Uuid()), nullable=True))
+    with op.get_context().autocommit_block():
+        # Draws look questions up by quiz and position; the quiz_id index is a prefix of the new one.
+        op.create_index(
+            'ix_questions_quiz_id_position',
+            'questions',
+            ['quiz_id', 'position'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_questions_quiz_id', table_name='questions', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_quiz_id',
+            'questions',
+            ['quiz_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_questions_quiz_id_position', table_name='questions', postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('user_quiz_attempts', 'question_ids')
+    op.drop_column('quizzes', 'sample_size')
@@ -0,0 +1,28 @@
+"""add_quiz_time_limit
+
+Revision ID: 00020
+Revises: 00019
+Create Date: 2026-10-17 23:41:07.215903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00020'
+down_revision: Union[str, None] = '00019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quizzes', sa.Column('time_limit', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quizzes', 'time_limit')
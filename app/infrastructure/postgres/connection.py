@@ -1,10 +1,15 @@
-from sqlalchemy import NullPool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.infrastructure.postgres.pool import build_engine_options
 from app.settings import settings
 
-engine = create_async_engine(settings.database.DATABASE_URL, echo=False, poolclass=NullPool)
+engine = create_async_engine(settings.database.DATABASE_URL, echo=False, **build_engine_options(settings.database))
+
+replica_engines = [
+    create_async_engine(url, echo=False, **build_engine_options(settings.database))
+    for url in settings.database.REPLICA_DATABASE_URLS
+]
 
 DeclarativeBase = declarative_base()
 
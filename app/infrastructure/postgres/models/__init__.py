@@ -1,3 +1,9 @@
+from app.infrastructure.postgres.models.analytics import (
+    CompanyScoreStats,
+    CompanyUserScoreStats,
+    QuizScoreStats,
+    UserScoreStats,
+)
 from app.infrastructure.postgres.models.company import Company, CompanyInvitation, CompanyMember
 from app.infrastructure.postgres.models.quiz import Answer, Question, Quiz, UserQuizAttempt
 from app.infrastructure.postgres.models.user import User
@@ -11,4 +17,8 @@ __all__ = [
     "Question",
     "Answer",
     "UserQuizAttempt",
+    "QuizScoreStats",
+    "CompanyScoreStats",
+    "UserScoreStats",
+    "CompanyUserScoreStats",
 ]
@@ -0,0 +1,71 @@
+import math
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.postgres import DeclarativeBase
+
+
+class ScoreStatsMixin:
+    """
+    Running totals of the attempts in a scope, added to as attempts are recorded, so the
+    average, spread and pass rate of any number of attempts are read from a single row.
+    """
+
+    attempts_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    score_sum: Mapped[float] = mapped_column(default=0.0, server_default="0")
+    score_sumsq: Mapped[float] = mapped_column(default=0.0, server_default="0")
+    passed_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    correct_answers_sum: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    total_questions_sum: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now(), server_default=func.now())
+
+    @property
+    def average_score(self) -> float:
+        return self.score_sum / self.attempts_count if self.attempts_count else 0.0
+
+    @property
+    def score_stddev(self) -> float:
+        """Sample standard deviation of the scores."""
+        if self.attempts_count < 2:
+            return 0.0
+        variance = (self.score_sumsq - self.score_sum**2 / self.attempts_count) / (self.attempts_count - 1)
+        # Rounding can leave a tiny negative variance when every score is the same.
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed_count / self.attempts_count if self.attempts_count else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        """Share of all the questions answered that were answered correctly."""
+        return self.correct_answers_sum / self.total_questions_sum if self.total_questions_sum else 0.0
+
+
+class QuizScoreStats(ScoreStatsMixin, DeclarativeBase):
+    __tablename__ = "quiz_score_stats"
+
+    quiz_id: Mapped[UUID] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    company_id: Mapped[UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), index=True)
+
+
+class CompanyScoreStats(ScoreStatsMixin, DeclarativeBase):
+    __tablename__ = "company_score_stats"
+
+    company_id: Mapped[UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+
+
+class UserScoreStats(ScoreStatsMixin, DeclarativeBase):
+    __tablename__ = "user_score_stats"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+
+class CompanyUserScoreStats(ScoreStatsMixin, DeclarativeBase):
+    __tablename__ = "company_user_score_stats"
+
+    company_id: Mapped[UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
@@ -9,6 +9,6 @@ from app.infrastructure.postgres import DeclarativeBase
 
 class BaseModelMixin(DeclarativeBase):
     __abstract__ = True
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4, index=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     created_at: Mapped[datetime] = mapped_column(default=func.now(), server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now(), server_default=func.now())
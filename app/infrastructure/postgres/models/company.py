@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import Enum, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Enum, ForeignKey, Index, String, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.postgres.models.base import BaseModelMixin
@@ -32,7 +32,11 @@ class Company(BaseModelMixin):
         passive_deletes=True
     )
 
-    __table_args__ = (UniqueConstraint("owner_id", "company_email", name="uq_owner_email"),)
+    __table_args__ = (
+        UniqueConstraint("owner_id", "company_email", name="uq_owner_email"),
+        Index("ix_companies_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_companies_company_status_created_at_id", "company_status", "created_at", "id"),
+    )
 
 
 class CompanyMember(BaseModelMixin):
@@ -45,6 +49,11 @@ class CompanyMember(BaseModelMixin):
         Enum(CompanyMemberRole, native_enum=False), default=CompanyMemberRole.MEMBER, nullable=False
     )
 
+    __table_args__ = (
+        Index("ix_company_members_company_id_user_id", "company_id", "user_id"),
+        Index("ix_company_members_user_id_company_id", "user_id", "company_id"),
+    )
+
 
 class CompanyInvitation(BaseModelMixin):
     __tablename__ = "company_invitations"
@@ -62,4 +71,18 @@ class CompanyInvitation(BaseModelMixin):
     
     company: Mapped["Company"] = relationship("Company", foreign_keys=[company_id])
     invited_user: Mapped[User] = relationship("User", foreign_keys=[invited_user_id])
-    invited_by: Mapped[User] = relationship("User", foreign_keys=[invited_by_id])
\ No newline at end of file
+    invited_by: Mapped[User] = relationship("User", foreign_keys=[invited_by_id])
+
+    __table_args__ = (
+        Index("ix_company_invitations_invited_user_id_status", "invited_user_id", "status"),
+        Index("ix_company_invitations_company_id_status", "company_id", "status"),
+        # At most one pending invitation, and one pending membership request, per user and company.
+        Index(
+            "uq_company_invitations_pending",
+            "company_id",
+            "invited_user_id",
+            "invitation_type",
+            unique=True,
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
@@ -1,7 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, func
+from sqlalchemy import BigInteger, ForeignKey, Index, LargeBinary, String, Uuid, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.postgres.models.base import BaseModelMixin
@@ -13,31 +14,49 @@ class Quiz(BaseModelMixin):
     company_id: Mapped[UUID] = mapped_column(ForeignKey("companies.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(100))
     description: Mapped[str] = mapped_column(String(500))
-    counter: Mapped[int] = mapped_column(default=0)
-
-    questions = relationship("Question", back_populates="quiz", cascade="all, delete-orphan", lazy="selectin")
+    # Bumped by every change to the quiz or its questions, cached quiz trees are keyed by it.
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    # Questions drawn at random for every attempt, out of all of them (a question bank); None serves them all.
+    sample_size: Mapped[int | None] = mapped_column(nullable=True)
+    # Seconds an attempt session has before it is finalized; None gives it QUIZ_SESSION_TIME_LIMIT.
+    time_limit: Mapped[int | None] = mapped_column(nullable=True)
+
+    questions = relationship(
+        "Question",
+        back_populates="quiz",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="Question.position",
+    )
 
     user_attempts = relationship("UserQuizAttempt", back_populates="quiz")
 
+    __table_args__ = (Index("ix_quizzes_company_id_created_at_id", "company_id", "created_at", "id"),)
+
 
 class Question(BaseModelMixin):
     __tablename__ = "questions"
 
     quiz_id: Mapped[UUID] = mapped_column(ForeignKey("quizzes.id"), nullable=False)
     question_text: Mapped[str] = mapped_column(String(500))
+    # 0 to the number of questions - 1 without gaps, draws from a question bank pick positions in that range.
+    position: Mapped[int] = mapped_column(default=0, server_default="0")
 
     quiz: Mapped["Quiz"] = relationship("Quiz", back_populates="questions")
     answers: Mapped[list["Answer"]] = relationship(
-        "Answer", back_populates="question", cascade="all, delete-orphan", lazy="selectin"
+        "Answer", back_populates="question", cascade="all, delete-orphan", lazy="selectin", order_by="Answer.position"
     )
 
+    __table_args__ = (Index("ix_questions_quiz_id_position", "quiz_id", "position"),)
+
 
 class Answer(BaseModelMixin):
     __tablename__ = "answers"
 
-    question_id: Mapped[UUID] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    question_id: Mapped[UUID] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     answer_text: Mapped[str] = mapped_column(String(500))
     is_correct: Mapped[bool] = mapped_column(default=False)
+    position: Mapped[int] = mapped_column(default=0, server_default="0")
 
     question: Mapped["Question"] = relationship("Question", back_populates="answers")
 
@@ -52,7 +71,29 @@ class UserQuizAttempt(BaseModelMixin):
     last_attempt_time: Mapped[datetime] = mapped_column(default=func.now())
     total_questions: Mapped[int] = mapped_column(default=0)
     correct_answers_count: Mapped[int] = mapped_column(default=0)
+    # What was answered, packed (see answer_key.py): the mask of the answers chosen for each question of
+    # this version of the quiz, in order, None for those left unanswered, and a bitmap of the questions
+    # answered right. All three are NULL for attempts recorded before they were kept.
+    quiz_version: Mapped[int | None] = mapped_column(nullable=True)
+    answer_masks: Mapped[list[int | None] | None] = mapped_column(ARRAY(BigInteger), nullable=True)
+    correct_questions: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Questions served by the draw the attempt answered, in the order of the masks; NULL when it was
+    # served all the questions of the quiz, in their order.
+    question_ids: Mapped[list[UUID] | None] = mapped_column(ARRAY(Uuid), nullable=True)
+    # The table is partitioned by month of created_at (see partitions.py), which every unique key,
+    # the primary key included, has to contain.
+    created_at: Mapped[datetime] = mapped_column(
+        primary_key=True, default=func.now(), server_default=func.now(), index=True
+    )
 
     user = relationship("User", back_populates="quiz_attempts")
     quiz = relationship("Quiz", back_populates="user_attempts")
     company = relationship("Company", back_populates="quiz_attempts")
+
+    __table_args__ = (
+        Index("ix_user_quiz_attempts_user_id_quiz_id", "user_id", "quiz_id"),
+        Index("ix_user_quiz_attempts_company_id_created_at", "company_id", "created_at"),
+        Index("ix_user_quiz_attempts_user_id_created_at", "user_id", "created_at"),
+        Index("ix_user_quiz_attempts_quiz_id_quiz_version", "quiz_id", "quiz_version"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -1,5 +1,5 @@
 from pydantic import EmailStr
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.postgres.models.base import BaseModelMixin
@@ -15,3 +15,5 @@ class User(BaseModelMixin):
     avatar_url: Mapped[str | None] = mapped_column(String(200))
 
     quiz_attempts = relationship("UserQuizAttempt", back_populates="user")
+
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Generic, Iterable, TypeVar
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import find_tables
+
+from app.infrastructure.redis import get_redis_client
+from app.settings import settings
+from app.utils.common import force_bytes, urlsafe_base64_decode, urlsafe_base64_encode
+from app.utils.exceptions import InvalidCursor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+COUNT_CACHE_PREFIX = "pagination:count"
+
+
+class CountStrategy(StrEnum):
+    """How the `total` of a paginated listing is computed."""
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a listing as returned by repositories."""
+
+    items: list[T]
+    total: int | None
+    has_next: bool
+    next_cursor: str | None = None
+    count_strategy: CountStrategy = CountStrategy.EXACT
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def encode_cursor(created_at: datetime, id_: UUID) -> str:
+    """Encode the (created_at, id) position of the last item of a page into an opaque string."""
+    return urlsafe_base64_encode(force_bytes(json.dumps([created_at.isoformat(), str(id_)])))
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, id_ = json.loads(urlsafe_base64_decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(id_)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def _count_query(query: Select) -> Select:
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def _count_cache_key(query: Select) -> str:
+    compiled = query.compile()
+    fingerprint = json.dumps([str(compiled), {k: str(v) for k, v in sorted(compiled.params.items())}])
+    return f"{COUNT_CACHE_PREFIX}:{hashlib.sha1(fingerprint.encode()).hexdigest()}"
+
+
+def _count_keys_set(table: str) -> str:
+    return f"{COUNT_CACHE_PREFIX}:keys:{table}"
+
+
+async def _get_cached_count(key: str) -> int | None:
+    try:
+        total = await get_redis_client().get(key)
+    except RedisError:
+        logger.warning("Count cache is unavailable, counting in the database", exc_info=True)
+        return None
+    return int(total) if total is not None else None
+
+
+async def _set_cached_count(key: str, query: Select, total: int) -> None:
+    # Remember the key under every table the listing reads, so a write to any of them drops it.
+    tables = {table.name for table in find_tables(query, include_joins=True)}
+    ttl = settings.redis.REDIS_COUNT_CACHE_TTL
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.set(key, total, ex=ttl)
+            for table in tables:
+                pipe.sadd(_count_keys_set(table), key)
+                pipe.expire(_count_keys_set(table), ttl)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Count cache is unavailable, total not cached", exc_info=True)
+
+
+async def invalidate_cached_counts(tables: Iterable[str]) -> None:
+    """Drop every cached total computed over one of `tables`, called once their writes are committed."""
+    client = get_redis_client()
+    try:
+        for table in tables:
+            keys = await client.smembers(_count_keys_set(table))
+            await client.delete(_count_keys_set(table), *keys)
+    except RedisError:
+        logger.warning("Count cache is unavailable, cached totals expire on their TTL", exc_info=True)
+
+
+async def estimate_count(session: AsyncSession, query: Select) -> int:
+    """Number of rows the planner expects `query` to return, read from its statistics without running it."""
+    plan = (await session.execute(Explain(query.order_by(None)))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate(
+    session: AsyncSession,
+    query: Select,
+    model,
+    limit: int,
+    offset: int,
+    cursor: str | None = None,
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+) -> Page:
+    """
+    Run a listing query ordered newest first by (created_at, id).
+
+    With a cursor the page starts right after the item the cursor points to (keyset pagination),
+    so its cost does not depend on how deep the page is; otherwise `offset` rows are skipped.
+
+    The total is computed according to `count_strategy`: exact totals are fetched by the page
+    query itself as a scalar subquery, cached ones are served from Redis until a write to one of
+    the listed tables is committed, estimated ones come from the planner and NONE skips the total.
+    """
+    total = None
+    cache_key = None
+    if count_strategy == CountStrategy.CACHED:
+        cache_key = _count_cache_key(query)
+        total = await _get_cached_count(cache_key)
+    elif count_strategy == CountStrategy.ESTIMATED:
+        total = await estimate_count(session, query)
+
+    page_query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    if cursor:
+        page_query = page_query.where(tuple_(model.created_at, model.id) < tuple_(*decode_cursor(cursor)))
+    else:
+        page_query = page_query.offset(offset)
+
+    fuse_count = count_strategy in (CountStrategy.EXACT, CountStrategy.CACHED) and total is None
+    if fuse_count:
+        page_query = page_query.add_columns(_count_query(query).scalar_subquery().correlate(None).label("total"))
+
+    result = await session.execute(page_query)
+    if fuse_count:
+        rows = result.all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        elif cursor is None and offset == 0:
+            total = 0
+        else:
+            # Past the last row the page query returns nothing to carry the total.
+            total = (await session.execute(_count_query(query))).scalar()
+        if cache_key is not None:
+            await _set_cached_count(cache_key, query, total)
+    else:
+        items = list(result.scalars().all())
+
+    has_next = len(items) > limit
+    items = items[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+    return Page(
+        items=items, total=total, has_next=has_next, next_cursor=next_cursor, count_strategy=count_strategy
+    )
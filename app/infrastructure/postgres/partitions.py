@@ -0,0 +1,91 @@
+import re
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.postgres.session_manager import provide_async_session
+
+# user_quiz_attempts is range partitioned on created_at, a partition per month named
+# user_quiz_attempts_y2026m10, plus a default partition catching rows of months with none.
+ATTEMPTS_TABLE = "user_quiz_attempts"
+DEFAULT_PARTITION = f"{ATTEMPTS_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{ATTEMPTS_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(value: datetime | None = None) -> datetime:
+    """First instant of the month of `value` (now, in UTC, by default), naive like the created_at column."""
+    value = value or datetime.now(UTC).replace(tzinfo=None)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{ATTEMPTS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+@provide_async_session
+async def get_attempt_partitions(session: AsyncSession) -> dict[datetime, str]:
+    """Monthly partitions attached to user_quiz_attempts, by the month they hold."""
+    result = await session.execute(
+        text(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": ATTEMPTS_TABLE},
+    )
+    partitions = {}
+    for name in result.scalars():
+        if match := _PARTITION_NAME.match(name):
+            partitions[datetime(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+@provide_async_session
+async def create_attempt_partition(month: datetime, session: AsyncSession) -> int:
+    """
+    Add the partition of a month. Rows of that month already caught by the default partition are
+    moved into it first, as Postgres refuses to attach a partition while the default one holds
+    rows of its range. Returns how many rows were moved.
+    """
+    name, start, end = partition_name(month), month, add_months(month, 1)
+    await session.execute(
+        text(f"CREATE TABLE {name} (LIKE {ATTEMPTS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    moved = await session.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        ),
+        {"start": start, "end": end},
+    )
+    await session.execute(
+        text(
+            f"ALTER TABLE {ATTEMPTS_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    return moved.rowcount
+
+
+@provide_async_session
+async def detach_attempt_partition(name: str, session: AsyncSession) -> None:
+    """Take a partition out of user_quiz_attempts, keeping it as a table of its own."""
+    await session.execute(text(f"ALTER TABLE {ATTEMPTS_TABLE} DETACH PARTITION {name}"))
+
+
+@provide_async_session
+async def drop_attempt_partition(name: str, session: AsyncSession) -> None:
+    await session.execute(text(f"DROP TABLE {name}"))
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from bisect import bisect_left
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.settings import DatabaseSettings
+
+# Upper bounds (in milliseconds) of the checkout wait histogram buckets.
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolTelemetry:
+    """Counters describing how long requests wait to get a connection from the pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, wait * 1000)] += 1
+
+    def record_timeout(self, wait: float) -> None:
+        self.timeouts += 1
+        self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self, pool: "InstrumentedAsyncAdaptedQueuePool") -> dict:
+        bucket_labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_5000ms"]
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "wait_histogram": dict(zip(bucket_labels, self.wait_buckets)),
+        }
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that measures how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.telemetry.record_timeout(time.perf_counter() - started)
+            raise
+        self.telemetry.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        # engine.dispose() swaps in a fresh pool; keep the counters across it.
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+def build_engine_options(database: DatabaseSettings) -> dict:
+    """Keyword arguments for create_async_engine derived from the database settings."""
+    options = {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_size": database.POSTGRES_POOL_SIZE,
+        "max_overflow": database.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": database.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": database.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": database.POSTGRES_POOL_PRE_PING,
+    }
+    if database.POSTGRES_TRANSACTION_POOLER:
+        # A transaction pooler may hand every transaction a different server connection,
+        # so named prepared statements cached per connection can't be relied on.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    return pool.telemetry.snapshot(pool)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` connections up front so the first requests don't pay for the handshake."""
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return
+
+    async def _open(release: asyncio.Event) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            # Hold the connection until all of them are open, otherwise they'd be reused.
+            await release.wait()
+
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_open(release)) for _ in range(connections)]
+    while engine.pool.checkedout() < connections and not any(task.done() for task in tasks):
+        await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(*tasks)
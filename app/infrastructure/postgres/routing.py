@@ -0,0 +1,149 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.postgres.connection import replica_engines
+from app.infrastructure.postgres.pool import warm_up_pool
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies whose reads are being routed, normally the authenticated user id.
+_routing_key: ContextVar[str | None] = ContextVar("routing_key", default=None)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def set_routing_key(key: object) -> None:
+    _routing_key.set(str(key))
+
+
+def get_routing_key() -> str | None:
+    return _routing_key.get()
+
+
+class ReplicaRouter:
+    """Decides whether a read-only repository call may run on a replica and on which one."""
+
+    def __init__(self, engines: list[AsyncEngine], max_lag: float, read_your_writes_window: float):
+        self.engines = engines
+        self.sessionmakers = [
+            sessionmaker(bind=replica, expire_on_commit=False, class_=AsyncSession) for replica in engines
+        ]
+        self.max_lag = max_lag
+        self.read_your_writes_window = read_your_writes_window
+        self.lag: list[float | None] = [None] * len(engines)
+        self.healthy: list[bool] = [True] * len(engines)
+        self.decisions: Counter[str] = Counter()
+        self.replica_reads: list[int] = [0] * len(engines)
+        self._recent_writers: dict[str, float] = {}
+        self._round_robin = itertools.count()
+        self._monitor: asyncio.Task | None = None
+
+    def mark_write(self, key: str | None) -> None:
+        if key is None or not self.engines:
+            return
+        now = time.monotonic()
+        if len(self._recent_writers) > 10_000:
+            self._recent_writers = {k: until for k, until in self._recent_writers.items() if until > now}
+        self._recent_writers[key] = now + self.read_your_writes_window
+
+    def pick(self, key: str | None, pending_writes: bool = False) -> sessionmaker | None:
+        """Return a replica sessionmaker, or None when the read has to go to the primary."""
+        if pending_writes:
+            self.decisions["primary_pending_writes"] += 1
+            return None
+        if not self.engines:
+            self.decisions["primary_no_replicas"] += 1
+            return None
+        if key is not None and self._recent_writers.get(key, 0) > time.monotonic():
+            self.decisions["primary_read_your_writes"] += 1
+            return None
+
+        candidates = [index for index, healthy in enumerate(self.healthy) if healthy]
+        if not candidates:
+            self.decisions["primary_replicas_lagging"] += 1
+            return None
+
+        index = candidates[next(self._round_robin) % len(candidates)]
+        self.decisions["replica"] += 1
+        self.replica_reads[index] += 1
+        return self.sessionmakers[index]
+
+    async def warm_up(self, connections: int) -> None:
+        """
+        Open `connections` connections to each replica. A replica that can't be reached doesn't stop
+        the application: it is left out of routing until the lag monitor finds it healthy.
+        """
+        for index, replica in enumerate(self.engines):
+            try:
+                await warm_up_pool(replica, connections)
+            except Exception:
+                logger.warning(
+                    "Failed to warm up replica %s:%s, reads stay off it until it is healthy",
+                    replica.url.host,
+                    replica.url.port,
+                    exc_info=True,
+                )
+                self.healthy[index] = False
+
+    async def refresh_lag(self) -> None:
+        for index, replica in enumerate(self.engines):
+            try:
+                async with replica.connect() as connection:
+                    lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar()
+            except Exception:
+                self.lag[index] = None
+                self.healthy[index] = False
+                continue
+            self.lag[index] = float(lag) if lag is not None else None
+            self.healthy[index] = lag is not None and float(lag) <= self.max_lag
+
+    async def _monitor_lag(self, interval: float) -> None:
+        while True:
+            await self.refresh_lag()
+            await asyncio.sleep(interval)
+
+    def start_lag_monitor(self, interval: float) -> None:
+        if self.engines and self._monitor is None:
+            self._monitor = asyncio.create_task(self._monitor_lag(interval))
+
+    async def stop_lag_monitor(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+
+    def snapshot(self) -> dict:
+        return {
+            "replicas": [
+                {
+                    "host": replica.url.host,
+                    "port": replica.url.port,
+                    "healthy": self.healthy[index],
+                    "lag_seconds": self.lag[index],
+                    "reads": self.replica_reads[index],
+                }
+                for index, replica in enumerate(self.engines)
+            ],
+            "decisions": dict(self.decisions),
+            "max_lag_seconds": self.max_lag,
+            "read_your_writes_window_seconds": self.read_your_writes_window,
+        }
+
+
+replica_router = ReplicaRouter(
+    engines=replica_engines,
+    max_lag=settings.database.POSTGRES_REPLICA_MAX_LAG,
+    read_your_writes_window=settings.database.POSTGRES_READ_YOUR_WRITES_WINDOW,
+)
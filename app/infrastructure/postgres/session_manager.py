@@ -1,10 +1,39 @@
 import contextlib
+import logging
+from contextvars import ContextVar
 from functools import wraps
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.infrastructure.postgres.connection import AsyncSessionLocal
+from app.infrastructure.postgres.pagination import invalidate_cached_counts
+from app.infrastructure.postgres.routing import get_routing_key, replica_router
+from app.infrastructure.redis.membership_cache import membership_cache
+from app.infrastructure.redis.quiz_tree_cache import quiz_tree_cache
+
+logger = logging.getLogger(__name__)
+
+# Session of the unit of work that is active in the current request/task, if any.
+_current_session: ContextVar[AsyncSession | None] = ContextVar("current_session", default=None)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, _) -> None:
+    session.info["has_writes"] = True
+    written_tables = session.info.setdefault("written_tables", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        written_tables.add(instance.__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        session = orm_execute_state.session
+        session.info["has_writes"] = True
+        session.info.setdefault("written_tables", set()).add(orm_execute_state.statement.table.name)
 
 
 @contextlib.asynccontextmanager
@@ -18,17 +47,155 @@ async def create_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.commit()
         except Exception:
             await session.rollback()
+            await _run_hooks(session.info.get("after_rollback", ()))
             raise
         finally:
             await session.close()
 
+        if session.info.get("has_writes"):
+            replica_router.mark_write(get_routing_key())
+        if session.info.get("written_tables"):
+            await invalidate_cached_counts(session.info["written_tables"])
+        if session.info.get("membership_changes"):
+            await membership_cache.invalidate(session.info["membership_changes"])
+        if session.info.get("stale_quiz_trees"):
+            await quiz_tree_cache.invalidate(session.info["stale_quiz_trees"])
+        await _run_hooks(session.info.get("after_commit", ()))
+
+
+async def _run_hooks(hooks) -> None:
+    # The transaction is over either way, a failing hook must not fail the request that ran it.
+    for hook in hooks:
+        try:
+            await hook()
+        except Exception:
+            logger.exception("Unit of work hook %s failed", hook)
+
+
+@contextlib.asynccontextmanager
+async def create_read_only_session(
+    session_factory: sessionmaker = AsyncSessionLocal,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async contextmanager that will create a session running a READ ONLY transaction.
+    Nothing is committed, the transaction is rolled back when the session closes.
+    """
+    async with session_factory() as session:
+        # Starts the transaction with BEGIN READ ONLY instead of a separate SET TRANSACTION round trip.
+        await session.connection(execution_options={"postgresql_readonly": True})
+        yield session
+
+
+@contextlib.asynccontextmanager
+async def create_streaming_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session of its own for a long read streamed with a server-side cursor, such as an
+    export consumed after the request's unit of work ended. Routed like provide_read_only_session.
+    """
+    replica_session_factory = replica_router.pick(get_routing_key(), pending_writes=False)
+    async with create_read_only_session(replica_session_factory or AsyncSessionLocal) as session:
+        yield session
+
+
+@contextlib.asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async contextmanager that opens a session shared by every repository call made inside it.
+    All the work runs on one connection and is committed once when the block exits,
+    or rolled back if it raises. Nested calls join the outer unit of work.
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with create_async_session() as session:
+        token = _current_session.set(session)
+        try:
+            yield session
+        finally:
+            _current_session.reset(token)
+
+
+def mark_read_only(session: AsyncSession) -> None:
+    """
+    Declare a unit of work read-only: provide_read_only_session may then serve its reads from a
+    read replica. Reads of other units of work always run on their own session, on the primary,
+    since what they read may decide what they write.
+    """
+    session.info["read_only"] = True
+
+
+async def on_commit(
+    callback: Callable[[], Awaitable[None]], on_rollback: Callable[[], Awaitable[None]] | None = None
+) -> None:
+    """
+    Run `callback` once the current unit of work commits, or `on_rollback` if it rolls back instead,
+    for work outside the database that must follow the fate of the transaction. Outside of a unit of
+    work every write is committed as soon as it is made, and `callback` runs right away.
+    """
+    session = _current_session.get()
+    if session is None:
+        await callback()
+        return
+    session.info.setdefault("after_commit", []).append(callback)
+    if on_rollback is not None:
+        session.info.setdefault("after_rollback", []).append(on_rollback)
+
+
+@contextlib.asynccontextmanager
+async def savepoint() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async contextmanager that runs a block in a SAVEPOINT of the current unit of work,
+    so a failure inside it can be handled without rolling back the whole transaction.
+    """
+    session = _current_session.get()
+    if session is None:
+        raise RuntimeError("savepoint() must be used inside unit_of_work()")
+
+    async with session.begin_nested():
+        yield session
+
 
 def provide_async_session(func):
     """
     Function decorator that provides an async session if it isn't provided.
     If you want to reuse a session or run the function as part of a
-    database transaction, you pass it to the function, if not this wrapper
-    will create one and close it for you.
+    database transaction, you pass it to the function. Inside unit_of_work()
+    the unit of work session is used, otherwise this wrapper will create one
+    and close it for you.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        arg_session = "session"
+
+        func_params = func.__code__.co_varnames
+        session_in_args = arg_session in func_params and func_params.index(arg_session) < len(args)
+        session_in_kwargs = arg_session in kwargs
+
+        if session_in_kwargs or session_in_args:
+            return await func(*args, **kwargs)
+
+        current_session = _current_session.get()
+        if current_session is not None:
+            kwargs[arg_session] = current_session
+            return await func(*args, **kwargs)
+
+        async with create_async_session() as session:
+            kwargs[arg_session] = session
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def provide_read_only_session(func):
+    """
+    Function decorator for repository methods that only read.
+    Inside a unit of work the call reuses its session, unless the unit of work was declared
+    read-only (see mark_read_only). Otherwise the call is routed to a read replica in a
+    read-only transaction, unless the user wrote recently (or the read-only unit of work wrote
+    anyway), in which case it runs on the primary.
     """
 
     @wraps(func)
@@ -41,9 +208,21 @@ def provide_async_session(func):
 
         if session_in_kwargs or session_in_args:
             return await func(*args, **kwargs)
-        else:
-            async with create_async_session() as session:
-                kwargs[arg_session] = session
-                return await func(*args, **kwargs)
+
+        current_session = _current_session.get()
+        if current_session is not None and not current_session.info.get("read_only"):
+            kwargs[arg_session] = current_session
+            return await func(*args, **kwargs)
+
+        pending_writes = current_session is not None and current_session.info.get("has_writes", False)
+        replica_session_factory = replica_router.pick(get_routing_key(), pending_writes=pending_writes)
+
+        if replica_session_factory is None and current_session is not None:
+            kwargs[arg_session] = current_session
+            return await func(*args, **kwargs)
+
+        async with create_read_only_session(replica_session_factory or AsyncSessionLocal) as session:
+            kwargs[arg_session] = session
+            return await func(*args, **kwargs)
 
     return wrapper
@@ -0,0 +1,3 @@
+from app.infrastructure.redis.client import close_redis_client, get_redis_client
+
+__all__ = ["close_redis_client", "get_redis_client"]
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from uuid import UUID
+
+from redis.exceptions import ResponseError
+
+from app.infrastructure.redis.client import get_redis_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "attempt-writers"
+
+
+def _encode(value) -> str:
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, list):
+        return json.dumps(value, default=str)
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _entry_time(entry_id: str) -> float:
+    """Seconds since the epoch at which a stream entry was added, taken from its id."""
+    return int(entry_id.split("-")[0]) / 1000
+
+
+class AttemptStream:
+    """
+    Graded quiz attempts waiting to be written to Postgres, kept in a Redis Stream.
+
+    The API appends attempts and returns; writers read them through a consumer group, insert them
+    and acknowledge them only once the insert is committed. An entry whose writer died before
+    acknowledging it is claimed by another writer after `claim_idle` seconds, so every attempt is
+    delivered at least once, and the attempt id, used as the row's primary key, makes a repeated
+    insert a no-op.
+    """
+
+    def __init__(self, stream: str, claim_idle: float):
+        self.stream = stream
+        self.dead_letter_stream = f"{stream}:dead"
+        self.stats_key = f"{stream}:stats"
+        self.claim_idle = claim_idle
+
+    @property
+    def consumer(self) -> str:
+        # Worked out on use: worker processes are forked after this module is imported.
+        return f"{socket.gethostname()}-{os.getpid()}"
+
+    async def append(self, attempt: dict[str, str]) -> str:
+        return await get_redis_client().xadd(self.stream, attempt)
+
+    async def ensure_group(self) -> None:
+        try:
+            await get_redis_client().xgroup_create(self.stream, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as error:
+            if "BUSYGROUP" not in str(error):
+                raise
+
+    async def read(self, count: int) -> list[tuple[str, dict[str, str]]]:
+        """Up to `count` entries: first those abandoned by other writers, then new ones."""
+        client = get_redis_client()
+        _, entries, _ = await client.xautoclaim(
+            self.stream, CONSUMER_GROUP, self.consumer, min_idle_time=int(self.claim_idle * 1000), count=count
+        )
+        if len(entries) < count:
+            response = await client.xreadgroup(
+                CONSUMER_GROUP, self.consumer, {self.stream: ">"}, count=count - len(entries)
+            )
+            for _, stream_entries in response:
+                entries.extend(stream_entries)
+        return entries
+
+    async def ack(self, entry_ids: list[str], inserted: int) -> None:
+        """Forget entries whose attempts are committed, `inserted` of them weren't stored before."""
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.xack(self.stream, CONSUMER_GROUP, *entry_ids)
+            pipe.xdel(self.stream, *entry_ids)
+            pipe.hincrby(self.stats_key, "inserted", inserted)
+            pipe.hincrby(self.stats_key, "duplicates", len(entry_ids) - inserted)
+            await pipe.execute()
+
+    async def dead_letter(self, entry_id: str, attempt: dict[str, str], reason: str) -> None:
+        """Move an entry that can't be inserted out of the way, so it doesn't block the ones after it."""
+        logger.error("Quiz attempt %s can't be stored: %s", attempt.get("id"), reason)
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.xadd(self.dead_letter_stream, {**attempt, "reason": reason})
+            pipe.xack(self.stream, CONSUMER_GROUP, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            pipe.hincrby(self.stats_key, "dead_lettered", 1)
+            await pipe.execute()
+
+    async def snapshot(self) -> dict:
+        client = get_redis_client()
+        await self.ensure_group()
+        group = next(group for group in await client.xinfo_groups(self.stream) if group["name"] == CONSUMER_GROUP)
+        pending = await client.xpending(self.stream, CONSUMER_GROUP)
+        undelivered = await client.xrange(self.stream, min=f"({group['last-delivered-id']}", count=1)
+        stats = await client.hgetall(self.stats_key)
+
+        oldest = [_entry_time(entry_id) for entry_id, _ in undelivered]
+        if pending["pending"]:
+            oldest.append(_entry_time(pending["min"]))
+        return {
+            "backlog": await client.xlen(self.stream),
+            "undelivered": group.get("lag") or 0,
+            "pending": pending["pending"],
+            "lag_seconds": round(max(time.time() - min(oldest), 0.0), 3) if oldest else 0.0,
+            "consumers": group["consumers"],
+            "inserted": int(stats.get("inserted", 0)),
+            "duplicates": int(stats.get("duplicates", 0)),
+            "dead_lettered": int(stats.get("dead_lettered", 0)),
+        }
+
+    @staticmethod
+    def to_entry(attempt: dict) -> dict[str, str]:
+        return {key: _encode(value) for key, value in attempt.items()}
+
+    @staticmethod
+    def from_entry(entry: dict[str, str]) -> dict:
+        attempted_at = datetime.fromisoformat(entry["last_attempt_time"])
+        return {
+            "id": UUID(entry["id"]),
+            "user_id": UUID(entry["user_id"]),
+            "quiz_id": UUID(entry["quiz_id"]),
+            "company_id": UUID(entry["company_id"]),
+            "score": float(entry["score"]),
+            "total_questions": int(entry["total_questions"]),
+            "correct_answers_count": int(entry["correct_answers_count"]),
+            "last_attempt_time": attempted_at,
+            # Listings order attempts by created_at, which would otherwise be the time of the flush.
+            "created_at": attempted_at,
+            # Missing from entries queued before the answers were kept.
+            "quiz_version": int(entry["quiz_version"]) if "quiz_version" in entry else None,
+            "answer_masks": json.loads(entry["answer_masks"]) if "answer_masks" in entry else None,
+            "correct_questions": bytes.fromhex(entry["correct_questions"]) if "correct_questions" in entry else None,
+            # Only set for attempts at a draw of the questions.
+            "question_ids": [UUID(value) for value in json.loads(entry["question_ids"])]
+            if "question_ids" in entry
+            else None,
+        }
+
+
+attempt_stream = AttemptStream(
+    stream=settings.quiz.QUIZ_ATTEMPT_STREAM,
+    claim_idle=settings.quiz.QUIZ_ATTEMPT_CLAIM_IDLE,
+)
@@ -0,0 +1,28 @@
+import redis.asyncio as redis
+
+from app.settings import settings
+
+_clients: dict[int, redis.Redis] = {}
+
+
+def get_redis_client(db: int | None = None) -> redis.Redis:
+    """
+    Shared client of a Redis database (the cache database by default),
+    its connection pool is reused across requests.
+    """
+    db = settings.redis.REDIS_DB_CACHE if db is None else db
+    if db not in _clients:
+        _clients[db] = redis.Redis(
+            host=settings.redis.REDIS_HOST,
+            port=settings.redis.REDIS_PORT,
+            db=db,
+            password=settings.redis.REDIS_PASSWORD,
+            decode_responses=True,
+        )
+    return _clients[db]
+
+
+async def close_redis_client() -> None:
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose()
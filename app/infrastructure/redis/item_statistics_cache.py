@@ -0,0 +1,67 @@
+import logging
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.schemas.analytics_schemas import QuizItemStatisticsSchema
+from app.infrastructure.redis.client import get_redis_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ITEM_STATISTICS_CACHE_PREFIX = "quiz:item-stats"
+
+
+def _statistics_key(quiz_id: UUID, version: int) -> str:
+    return f"{ITEM_STATISTICS_CACHE_PREFIX}:{quiz_id}:{version}"
+
+
+def _job_key(quiz_id: UUID, version: int) -> str:
+    return f"{ITEM_STATISTICS_CACHE_PREFIX}:{quiz_id}:{version}:job"
+
+
+class ItemStatisticsCache:
+    """
+    Item statistics of quiz versions, keyed by quiz id and version like the quiz trees, so edits to a
+    quiz never serve statistics of another version. Unlike a tree, the statistics of a version change
+    with every attempt at it: they are kept `ttl` seconds, then computed again on the next request.
+
+    While they are computed, the id of the job doing it is kept next to them, so that requests coming
+    meanwhile wait for that job rather than start their own. The id expires after `job_timeout` seconds,
+    letting a job that died be replaced.
+    """
+
+    def __init__(self, ttl: int, job_timeout: int):
+        self.ttl = ttl
+        self.job_timeout = job_timeout
+
+    async def get(self, quiz_id: UUID, version: int) -> QuizItemStatisticsSchema | None:
+        try:
+            value = await get_redis_client().get(_statistics_key(quiz_id, version))
+        except RedisError:
+            logger.warning("Item statistics cache is unavailable", exc_info=True)
+            return None
+        return QuizItemStatisticsSchema.model_validate_json(value) if value is not None else None
+
+    async def set(self, statistics: QuizItemStatisticsSchema) -> None:
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.set(
+                _statistics_key(statistics.quiz_id, statistics.quiz_version), statistics.model_dump_json(), ex=self.ttl
+            )
+            pipe.delete(_job_key(statistics.quiz_id, statistics.quiz_version))
+            await pipe.execute()
+
+    async def claim_job(self, quiz_id: UUID, version: int, job_id: str) -> str:
+        """The id of the job computing the statistics: `job_id` if none was, the running one's otherwise."""
+        client = get_redis_client()
+        if await client.set(_job_key(quiz_id, version), job_id, nx=True, ex=self.job_timeout):
+            return job_id
+        running = await client.get(_job_key(quiz_id, version))
+        # The running job may have just finished and dropped its id, this one then recomputes them.
+        return running if running is not None else job_id
+
+
+item_statistics_cache = ItemStatisticsCache(
+    ttl=settings.redis.REDIS_ITEM_STATISTICS_TTL,
+    job_timeout=settings.redis.REDIS_ITEM_STATISTICS_JOB_TIMEOUT,
+)
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.postgres.models.enums import CompanyMemberRole
+from app.infrastructure.redis.client import get_redis_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MEMBERSHIP_CACHE_PREFIX = "auth:membership"
+INVALIDATION_CHANNEL = f"{MEMBERSHIP_CACHE_PREFIX}:invalidations"
+# Stored for users known not to be members, so repeated denied requests don't reach the database.
+NOT_A_MEMBER = "-"
+
+# Returned by MembershipCache.get when nothing is cached, None means "not a member".
+MISS = object()
+
+
+def _company_key(company_id: UUID) -> str:
+    return f"{MEMBERSHIP_CACHE_PREFIX}:{company_id}"
+
+
+class MembershipCache:
+    """
+    Role of a user in a company, kept in a small in-process LRU in front of a Redis hash per company.
+
+    Entries are dropped after the unit of work that changed the membership commits; other processes
+    are told to drop their local copy over pub/sub, and the local TTL bounds staleness if a message
+    is missed.
+    """
+
+    def __init__(self, ttl: int, local_ttl: float, local_size: int):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local_size = local_size
+        self._local: OrderedDict[tuple[UUID, UUID], tuple[float, CompanyMemberRole | None]] = OrderedDict()
+        self.stats: Counter[str] = Counter()
+        self._listener: asyncio.Task | None = None
+
+    def _get_local(self, company_id: UUID, user_id: UUID):
+        entry = self._local.get((company_id, user_id))
+        if entry is None:
+            return MISS
+        expires_at, role = entry
+        if expires_at < time.monotonic():
+            del self._local[(company_id, user_id)]
+            return MISS
+        self._local.move_to_end((company_id, user_id))
+        return role
+
+    def _set_local(self, company_id: UUID, user_id: UUID, role: CompanyMemberRole | None) -> None:
+        self._local[(company_id, user_id)] = (time.monotonic() + self.local_ttl, role)
+        self._local.move_to_end((company_id, user_id))
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    def _evict_local(self, company_id: UUID, user_id: UUID | None) -> None:
+        if user_id is not None:
+            self._local.pop((company_id, user_id), None)
+            return
+        for key in [key for key in self._local if key[0] == company_id]:
+            del self._local[key]
+
+    async def get(self, company_id: UUID, user_id: UUID):
+        """The cached role (None for non-members), or MISS."""
+        role = self._get_local(company_id, user_id)
+        if role is not MISS:
+            self.stats["local_hits"] += 1
+            return role
+
+        try:
+            value = await get_redis_client().hget(_company_key(company_id), str(user_id))
+        except RedisError:
+            logger.warning("Membership cache is unavailable, checking membership in the database", exc_info=True)
+            value = None
+        if value is None:
+            self.stats["misses"] += 1
+            return MISS
+
+        self.stats["redis_hits"] += 1
+        role = None if value == NOT_A_MEMBER else CompanyMemberRole[value]
+        self._set_local(company_id, user_id, role)
+        return role
+
+    async def set(self, company_id: UUID, user_id: UUID, role: CompanyMemberRole | None) -> None:
+        self._set_local(company_id, user_id, role)
+        key = _company_key(company_id)
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.hset(key, str(user_id), role.name if role is not None else NOT_A_MEMBER)
+                # The whole hash expires `ttl` after its first entry, whatever is written to it later.
+                pipe.expire(key, self.ttl, nx=True)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Membership cache is unavailable, role not cached", exc_info=True)
+
+    async def invalidate(self, memberships: Iterable[tuple[UUID, UUID | None]]) -> None:
+        """Drop the cached roles of `(company_id, user_id)` pairs, a None user drops the whole company."""
+        memberships = set(memberships)
+        client = get_redis_client()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for company_id, user_id in memberships:
+                    self._evict_local(company_id, user_id)
+                    if user_id is None:
+                        pipe.delete(_company_key(company_id))
+                    else:
+                        pipe.hdel(_company_key(company_id), str(user_id))
+                    pipe.publish(INVALIDATION_CHANNEL, f"{company_id}:{user_id or ''}")
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Membership cache is unavailable, cached roles expire on their TTL", exc_info=True)
+        self.stats["invalidations"] += len(memberships)
+
+    async def _listen(self) -> None:
+        pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                company_id, user_id = message["data"].split(":")
+                self._evict_local(UUID(company_id), UUID(user_id) if user_id else None)
+        finally:
+            await pubsub.aclose()
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except RedisError:
+                # Until the subscription is back, local entries only live for local_ttl.
+                logger.warning("Lost membership invalidation channel, resubscribing", exc_info=True)
+                self._local.clear()
+                await asyncio.sleep(1)
+
+    def start_invalidation_listener(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_forever())
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        return {
+            "local_hits": self.stats["local_hits"],
+            "redis_hits": self.stats["redis_hits"],
+            "misses": self.stats["misses"],
+            "bypasses": self.stats["bypasses"],
+            "invalidations": self.stats["invalidations"],
+            "hit_ratio": round((lookups - self.stats["misses"]) / lookups, 4) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "ttl_seconds": self.ttl,
+            "local_ttl_seconds": self.local_ttl,
+        }
+
+
+def invalidate_membership_on_commit(session: AsyncSession, company_id: UUID, user_id: UUID | None = None) -> None:
+    """Drop the cached role of `user_id` (every member when None) once `session` commits."""
+    session.info.setdefault("membership_changes", set()).add((company_id, user_id))
+
+
+membership_cache = MembershipCache(
+    ttl=settings.redis.REDIS_MEMBERSHIP_CACHE_TTL,
+    local_ttl=settings.redis.REDIS_MEMBERSHIP_LOCAL_TTL,
+    local_size=settings.redis.REDIS_MEMBERSHIP_LOCAL_SIZE,
+)
@@ -0,0 +1,113 @@
+import logging
+from collections import Counter, OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schemas.quiz_schemas import QuizTreeSchema
+from app.infrastructure.redis.client import get_redis_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+QUIZ_TREE_CACHE_PREFIX = "quiz:tree"
+
+
+def _tree_key(quiz_id: UUID, version: int) -> str:
+    return f"{QUIZ_TREE_CACHE_PREFIX}:{quiz_id}:{version}"
+
+
+class QuizTreeCache:
+    """
+    Serialized quiz trees keyed by quiz id and version, in an in-process LRU bounded by size in front of Redis.
+
+    A given (id, version) never changes content: edits bump the version, so entries are never stale,
+    old versions just stop being asked for and age out of both layers.
+    """
+
+    def __init__(self, ttl: int, local_max_bytes: int):
+        self.ttl = ttl
+        self.local_max_bytes = local_max_bytes
+        self.local_bytes = 0
+        self._local: OrderedDict[tuple[UUID, int], tuple[int, QuizTreeSchema]] = OrderedDict()
+        self.stats: Counter[str] = Counter()
+
+    def _set_local(self, tree: QuizTreeSchema, size: int) -> None:
+        key = (tree.id, tree.version)
+        if key in self._local:
+            self.local_bytes -= self._local.pop(key)[0]
+        self._local[key] = (size, tree)
+        self.local_bytes += size
+        while self.local_bytes > self.local_max_bytes and self._local:
+            self.local_bytes -= self._local.popitem(last=False)[1][0]
+
+    def _evict_local(self, quiz_id: UUID, version: int) -> None:
+        entry = self._local.pop((quiz_id, version), None)
+        if entry is not None:
+            self.local_bytes -= entry[0]
+
+    async def get(self, quiz_id: UUID, version: int) -> QuizTreeSchema | None:
+        entry = self._local.get((quiz_id, version))
+        if entry is not None:
+            self._local.move_to_end((quiz_id, version))
+            self.stats["local_hits"] += 1
+            return entry[1]
+
+        try:
+            value = await get_redis_client().get(_tree_key(quiz_id, version))
+        except RedisError:
+            logger.warning("Quiz tree cache is unavailable, loading the quiz from the database", exc_info=True)
+            value = None
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["redis_hits"] += 1
+        tree = QuizTreeSchema.model_validate_json(value)
+        self._set_local(tree, len(value))
+        return tree
+
+    async def set(self, tree: QuizTreeSchema) -> None:
+        value = tree.model_dump_json()
+        self._set_local(tree, len(value))
+        try:
+            await get_redis_client().set(_tree_key(tree.id, tree.version), value, ex=self.ttl)
+        except RedisError:
+            logger.warning("Quiz tree cache is unavailable, tree not cached", exc_info=True)
+
+    async def invalidate(self, trees: Iterable[tuple[UUID, int]]) -> None:
+        """Drop versions that can no longer be read, so they don't wait for their TTL."""
+        keys = []
+        for quiz_id, version in trees:
+            self._evict_local(quiz_id, version)
+            keys.append(_tree_key(quiz_id, version))
+        try:
+            await get_redis_client().delete(*keys)
+        except RedisError:
+            logger.warning("Quiz tree cache is unavailable, old trees expire on their TTL", exc_info=True)
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        return {
+            "local_hits": self.stats["local_hits"],
+            "redis_hits": self.stats["redis_hits"],
+            "misses": self.stats["misses"],
+            "hit_ratio": round((lookups - self.stats["misses"]) / lookups, 4) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "local_bytes": self.local_bytes,
+            "local_max_bytes": self.local_max_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+
+def drop_quiz_tree_on_commit(session: AsyncSession, quiz_id: UUID, version: int) -> None:
+    """Drop the cached tree of `version` of the quiz once `session` commits."""
+    session.info.setdefault("stale_quiz_trees", set()).add((quiz_id, version))
+
+
+quiz_tree_cache = QuizTreeCache(
+    ttl=settings.redis.REDIS_QUIZ_TREE_CACHE_TTL,
+    local_max_bytes=settings.redis.REDIS_QUIZ_TREE_LOCAL_MAX_BYTES,
+)
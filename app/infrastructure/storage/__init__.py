@@ -1,3 +1,4 @@
+from app.infrastructure.storage.attempt_archive import AttemptArchive, create_attempt_archive
 from app.infrastructure.storage.local_storage import LocalFileStorage, create_local_storage
 
-__all__ = ["LocalFileStorage", "create_local_storage"]
+__all__ = ["AttemptArchive", "LocalFileStorage", "create_attempt_archive", "create_local_storage"]
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterator, Sequence
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import Row
+
+from app.core.schemas.export_schemas import AttemptExportFilterSchema
+from app.settings import QuizSettings
+
+# Columns of an archived attempt, those of an attempt export: the quiz title and user email are
+# kept as they were, for audits to read even once the quiz or the user is gone.
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("quiz_id", pa.string()),
+        ("quiz_title", pa.string()),
+        ("user_id", pa.string()),
+        ("user_email", pa.string()),
+        ("score", pa.float64()),
+        ("correct_answers_count", pa.int32()),
+        ("total_questions", pa.int32()),
+    ]
+)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _record(row: Row) -> dict:
+    """An archived attempt of a (company_id, *export columns) row."""
+    return {
+        name: str(value) if isinstance(value, UUID) else value for name, value in zip(ARCHIVE_SCHEMA.names, row[1:])
+    }
+
+
+def _month(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class AttemptArchive:
+    """
+    Attempts moved out of Postgres, kept as zstd compressed Parquet files, one per company and month:
+    {base_path}/company_id={company_id}/month={YYYY-MM}/attempts.parquet.
+
+    Reads only open the files of the company and months asked for, and skip the row groups whose
+    statistics rule out the quiz, user or dates filtered on.
+    """
+
+    def __init__(self, base_path: Path, row_group_size: int):
+        self.base_path = base_path
+        self.row_group_size = row_group_size
+
+    def _path(self, company_id: UUID | str, month: datetime) -> Path:
+        return self.base_path / f"company_id={company_id}" / f"month={month:%Y-%m}" / "attempts.parquet"
+
+    async def write_month(self, month: datetime, batches: AsyncIterable[Sequence[Row]]) -> dict[UUID, int]:
+        """
+        Archive the attempts of a month, given as (company_id, *export columns) rows ordered by
+        company. The file of a company replaces any earlier one, so a month archived again after
+        an interruption ends up archived once. Returns the number of attempts of each company.
+        """
+        loop = asyncio.get_event_loop()
+        archived: dict[UUID, int] = {}
+        writer, path, pending = None, None, []
+
+        async def flush() -> None:
+            table = pa.Table.from_pylist(pending, schema=ARCHIVE_SCHEMA)
+            await loop.run_in_executor(None, writer.write_table, table)
+            pending.clear()
+
+        try:
+            async for batch in batches:
+                for row in batch:
+                    if row.company_id not in archived:
+                        if writer:
+                            await flush()
+                            await loop.run_in_executor(None, self._close, writer, path)
+                        path = self._path(row.company_id, month)
+                        writer = await loop.run_in_executor(None, self._open, path)
+                        archived[row.company_id] = 0
+                    pending.append(_record(row))
+                    archived[row.company_id] += 1
+                    # A row group per row_group_size attempts, whatever the size of the batches read.
+                    if len(pending) >= self.row_group_size:
+                        await flush()
+            if writer:
+                await flush()
+                await loop.run_in_executor(None, self._close, writer, path)
+        except BaseException:
+            if writer:
+                writer.close()
+                path.with_name(f"{path.name}.part").unlink(missing_ok=True)
+            raise
+        return archived
+
+    def _open(self, path: Path) -> pq.ParquetWriter:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name, the file only replaces the previous one once complete.
+        return pq.ParquetWriter(path.with_name(f"{path.name}.part"), ARCHIVE_SCHEMA, compression="zstd")
+
+    @staticmethod
+    def _close(writer: pq.ParquetWriter, path: Path) -> None:
+        writer.close()
+        path.with_name(f"{path.name}.part").replace(path)
+
+    def _files(self, company_id: UUID, filters: AttemptExportFilterSchema) -> list[str]:
+        """Files of the company's months that overlap the filtered dates, oldest first."""
+        first = _month(_naive_utc(filters.date_from)) if filters.date_from else None
+        last = _naive_utc(filters.date_to) if filters.date_to else None
+        files = []
+        for path in sorted((self.base_path / f"company_id={company_id}").glob("month=*/attempts.parquet")):
+            month = datetime.strptime(path.parent.name.removeprefix("month="), "%Y-%m")
+            if (first is None or month >= first) and (last is None or month < last):
+                files.append(str(path))
+        return files
+
+    @staticmethod
+    def _expression(filters: AttemptExportFilterSchema) -> ds.Expression | None:
+        created_at = ARCHIVE_SCHEMA.field("created_at").type
+        conditions = []
+        if filters.quiz_id is not None:
+            conditions.append(ds.field("quiz_id") == str(filters.quiz_id))
+        if filters.user_id is not None:
+            conditions.append(ds.field("user_id") == str(filters.user_id))
+        if filters.date_from is not None:
+            conditions.append(ds.field("created_at") >= pa.scalar(_naive_utc(filters.date_from), created_at))
+        if filters.date_to is not None:
+            conditions.append(ds.field("created_at") < pa.scalar(_naive_utc(filters.date_to), created_at))
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _read(self, files: list[str], filters: AttemptExportFilterSchema, batch_size: int) -> Iterator[list[tuple]]:
+        dataset = ds.dataset(files, schema=ARCHIVE_SCHEMA, format="parquet")
+        for record_batch in dataset.to_batches(filter=self._expression(filters), batch_size=batch_size):
+            if record_batch.num_rows:
+                yield list(zip(*(column.to_pylist() for column in record_batch.columns)))
+
+    async def read(
+        self, company_id: UUID, filters: AttemptExportFilterSchema, batch_size: int
+    ) -> AsyncIterator[list[tuple]]:
+        """The company's archived attempts matching the filters, month by month, in batches of export rows."""
+        loop = asyncio.get_event_loop()
+        files = await loop.run_in_executor(None, self._files, company_id, filters)
+        if not files:
+            return
+        batches = self._read(files, filters, batch_size)
+        while batch := await loop.run_in_executor(None, next, batches, None):
+            yield batch
+
+
+def create_attempt_archive(settings: QuizSettings) -> AttemptArchive:
+    return AttemptArchive(
+        base_path=settings.QUIZ_ATTEMPT_ARCHIVE_PATH, row_group_size=settings.QUIZ_ATTEMPT_ARCHIVE_ROW_GROUP_SIZE
+    )
@@ -1,6 +1,7 @@
 import asyncio
 import uuid
 from pathlib import Path
+from typing import AsyncIterable
 
 from app.core.interfaces.file_storage_interface import FileStorageInterface
 from app.settings import FileStorageSettings
@@ -57,6 +58,30 @@ class LocalFileStorage(FileStorageInterface):
         # Return full URL
         return self._get_file_url(unique_filename)
 
+    async def save_stream(self, chunks: AsyncIterable[bytes], filename: str) -> str:
+        """
+        Save a file generated chunk by chunk, so it is never held in memory whole, and return its URL.
+        Meant for files the application writes itself: neither size nor extension is checked.
+        """
+        unique_filename = self._generate_unique_filename(filename)
+        file_path = self.base_path / unique_filename
+        # Written under a temporary name, the file only appears at its URL once complete.
+        part_path = file_path.with_name(f"{unique_filename}.part")
+
+        loop = asyncio.get_event_loop()
+        file = await loop.run_in_executor(None, open, part_path, "wb")
+        try:
+            async for chunk in chunks:
+                await loop.run_in_executor(None, file.write, chunk)
+        except BaseException:
+            file.close()
+            part_path.unlink(missing_ok=True)
+            raise
+        file.close()
+        await loop.run_in_executor(None, part_path.rename, file_path)
+
+        return self._get_file_url(unique_filename)
+
     def _write_file_sync(self, file_path: Path, content: bytes) -> None:
         """Synchronous file write operation."""
         with open(file_path, "wb") as f:
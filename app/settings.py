@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -73,10 +74,59 @@ class RedisSettings(BaseSettings):
     REDIS_DB: int = Field(0, alias="REDIS_DB")
     REDIS_DB_QUIZ_ANSWERS: int = Field(0, alias="REDIS_DB_QUIZ_ANSWERS")
     REDIS_PASSWORD: str | None = Field(None, alias="REDIS_PASSWORD")
+    REDIS_DB_CACHE: int = Field(0, alias="REDIS_DB_CACHE")
+    REDIS_COUNT_CACHE_TTL: int = Field(60, alias="REDIS_COUNT_CACHE_TTL")
+    REDIS_MEMBERSHIP_CACHE_TTL: int = Field(300, alias="REDIS_MEMBERSHIP_CACHE_TTL")
+    REDIS_MEMBERSHIP_LOCAL_TTL: float = Field(5, alias="REDIS_MEMBERSHIP_LOCAL_TTL")
+    REDIS_MEMBERSHIP_LOCAL_SIZE: int = Field(10_000, alias="REDIS_MEMBERSHIP_LOCAL_SIZE")
+    REDIS_QUIZ_TREE_CACHE_TTL: int = Field(24 * 60 * 60, alias="REDIS_QUIZ_TREE_CACHE_TTL")
+    REDIS_QUIZ_TREE_LOCAL_MAX_BYTES: int = Field(32 * 1024 * 1024, alias="REDIS_QUIZ_TREE_LOCAL_MAX_BYTES")
+    REDIS_ATTEMPT_HISTORY_TTL: int = Field(48 * 60 * 60, alias="REDIS_ATTEMPT_HISTORY_TTL")
+    REDIS_ATTEMPT_HISTORY_SIZE: int = Field(100, alias="REDIS_ATTEMPT_HISTORY_SIZE")  # attempts kept per user
+    # Questions drawn from a question bank can be answered for this long
+    REDIS_QUIZ_DRAW_TTL: int = Field(4 * 60 * 60, alias="REDIS_QUIZ_DRAW_TTL")
+    # Attempt sessions not finalized by their deadline, while the sweep can't run, are kept this much longer
+    REDIS_ATTEMPT_SESSION_RETENTION: int = Field(24 * 60 * 60, alias="REDIS_ATTEMPT_SESSION_RETENTION")
+    # Item statistics of a quiz are recomputed, taking new attempts into account, once this old
+    REDIS_ITEM_STATISTICS_TTL: int = Field(15 * 60, alias="REDIS_ITEM_STATISTICS_TTL")
+    REDIS_ITEM_STATISTICS_JOB_TIMEOUT: int = Field(10 * 60, alias="REDIS_ITEM_STATISTICS_JOB_TIMEOUT")
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="REDIS_", extra="ignore")
 
 
+class QuizSettings(BaseSettings):
+    # "sync" inserts attempts within the request, "stream" queues them in a Redis Stream for the
+    # flush_quiz_attempts task; Redis should then persist with appendonly yes / appendfsync everysec.
+    QUIZ_ATTEMPT_INGESTION: Literal["sync", "stream"] = Field("sync", alias="QUIZ_ATTEMPT_INGESTION")
+    QUIZ_ATTEMPT_STREAM: str = Field("quiz:attempts", alias="QUIZ_ATTEMPT_STREAM")
+    QUIZ_ATTEMPT_BATCH_SIZE: int = Field(500, alias="QUIZ_ATTEMPT_BATCH_SIZE")
+    QUIZ_ATTEMPT_FLUSH_INTERVAL: float = Field(1.0, alias="QUIZ_ATTEMPT_FLUSH_INTERVAL")  # seconds
+    # Entries a writer hasn't acknowledged for this long are taken over by another one
+    QUIZ_ATTEMPT_CLAIM_IDLE: float = Field(60.0, alias="QUIZ_ATTEMPT_CLAIM_IDLE")  # seconds
+    # Attempts scoring at least this percentage count as passed in the score statistics
+    QUIZ_PASS_SCORE: float = Field(50.0, alias="QUIZ_PASS_SCORE")
+    # Attempt sessions at quizzes without a time limit of their own end this long after they start
+    QUIZ_SESSION_TIME_LIMIT: int = Field(60 * 60, alias="QUIZ_SESSION_TIME_LIMIT")  # seconds
+    # Sessions past their deadline are finalized with their saved answers by a task run this often
+    QUIZ_SESSION_SWEEP_INTERVAL: float = Field(30.0, alias="QUIZ_SESSION_SWEEP_INTERVAL")  # seconds
+    # Exports of more attempts than this are written to the media storage by a background job
+    QUIZ_EXPORT_INLINE_MAX_ROWS: int = Field(100_000, alias="QUIZ_EXPORT_INLINE_MAX_ROWS")
+    QUIZ_EXPORT_BATCH_SIZE: int = Field(2000, alias="QUIZ_EXPORT_BATCH_SIZE")  # rows fetched per cursor round trip
+    QUIZ_IMPORT_MAX_ERRORS: int = Field(100, alias="QUIZ_IMPORT_MAX_ERRORS")  # invalid rows listed in the response
+    # Monthly partitions of user_quiz_attempts are created this many months in advance
+    QUIZ_ATTEMPT_PARTITIONS_AHEAD: int = Field(3, alias="QUIZ_ATTEMPT_PARTITIONS_AHEAD")
+    # Partitions of months older than this are archived (to Parquet files), detached (kept as tables
+    # of their own) or dropped, 0 keeps them all
+    QUIZ_ATTEMPT_RETENTION_MONTHS: int = Field(0, alias="QUIZ_ATTEMPT_RETENTION_MONTHS")
+    QUIZ_ATTEMPT_RETENTION_ACTION: Literal["archive", "detach", "drop"] = Field(
+        "archive", alias="QUIZ_ATTEMPT_RETENTION_ACTION"
+    )
+    QUIZ_ATTEMPT_ARCHIVE_PATH: Path = Field(Path("archive/attempts"), alias="QUIZ_ATTEMPT_ARCHIVE_PATH")
+    QUIZ_ATTEMPT_ARCHIVE_ROW_GROUP_SIZE: int = Field(100_000, alias="QUIZ_ATTEMPT_ARCHIVE_ROW_GROUP_SIZE")
+
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="QUIZ_", extra="ignore")
+
+
 class DatabaseSettings(BaseSettings):
     POSTGRES_DRIVER: str = Field(default="postgresql+asyncpg", alias="POSTGRES_DRIVER")
     POSTGRES_USER: str = Field(..., alias="POSTGRES_USER")
@@ -85,6 +135,23 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_PORT: int = Field(default=5432, alias="POSTGRES_PORT")
     POSTGRES_DB: str = Field(..., alias="POSTGRES_DB")
 
+    # Connection pool
+    POSTGRES_POOL_SIZE: int = Field(default=20, alias="POSTGRES_POOL_SIZE")
+    POSTGRES_MAX_OVERFLOW: int = Field(default=10, alias="POSTGRES_MAX_OVERFLOW")
+    POSTGRES_POOL_TIMEOUT: float = Field(default=30.0, alias="POSTGRES_POOL_TIMEOUT")  # seconds
+    POSTGRES_POOL_RECYCLE: int = Field(default=1800, alias="POSTGRES_POOL_RECYCLE")  # seconds, -1 disables
+    POSTGRES_POOL_PRE_PING: bool = Field(default=True, alias="POSTGRES_POOL_PRE_PING")
+    POSTGRES_POOL_WARMUP: int = Field(default=5, alias="POSTGRES_POOL_WARMUP")  # connections opened on startup
+    # Set when connecting through a transaction-pooling proxy (PgBouncer pool_mode=transaction)
+    POSTGRES_TRANSACTION_POOLER: bool = Field(default=False, alias="POSTGRES_TRANSACTION_POOLER")
+
+    # Read replicas as a JSON list of "host" or "host:port"; empty sends every read to the primary
+    POSTGRES_REPLICA_HOSTS: list[str] = Field(default=[], alias="POSTGRES_REPLICA_HOSTS")
+    POSTGRES_REPLICA_MAX_LAG: float = Field(default=10.0, alias="POSTGRES_REPLICA_MAX_LAG")  # seconds
+    POSTGRES_REPLICA_LAG_CHECK_INTERVAL: float = Field(default=5.0, alias="POSTGRES_REPLICA_LAG_CHECK_INTERVAL")
+    # After a user's write, their reads stay on the primary for this many seconds
+    POSTGRES_READ_YOUR_WRITES_WINDOW: float = Field(default=5.0, alias="POSTGRES_READ_YOUR_WRITES_WINDOW")
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     @property
@@ -94,6 +161,17 @@ class DatabaseSettings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def REPLICA_DATABASE_URLS(self) -> list[str]:
+        urls = []
+        for replica in self.POSTGRES_REPLICA_HOSTS:
+            host, _, port = replica.partition(":")
+            urls.append(
+                f"{self.POSTGRES_DRIVER}://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{host}:{port or self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+            )
+        return urls
+
 
 class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
@@ -110,6 +188,7 @@ class Settings(BaseSettings):
     google_sso: GoogleSSOSettings = GoogleSSOSettings()
     smtp: SMTPSettings = SMTPSettings()
     redis: RedisSettings = RedisSettings()
+    quiz: QuizSettings = QuizSettings()
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
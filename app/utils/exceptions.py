@@ -46,4 +46,19 @@ class FileExtensionNotAllowedError(Exception):
         self.extension = extension
         self.allowed = allowed
         self.message = f"File extension '{self.extension}' is not allowed. Allowed extensions: {self.allowed}"
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+
+class InvalidCursor(Exception):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        self.message = "Invalid pagination cursor"
+        super().__init__(self.message)
+
+
+class InvalidImportFile(Exception):
+    def __init__(self, errors: list[dict], error_count: int):
+        self.errors = errors
+        self.error_count = error_count
+        self.message = f"{error_count} rows of the file are invalid, nothing was imported"
+        super().__init__(self.message)
@@ -0,0 +1,108 @@
+"""
+Latency of quiz creation by quiz size, bulk INSERT ... RETURNING against one INSERT per row.
+
+Runs against the database configured in the environment, every quiz is created inside
+a transaction that is rolled back, so nothing is left behind:
+
+    python -m benchmarks.quiz_create --sizes 1 10 50 200 --answers 4 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.core.repositories.quiz_repository import QuizRepository
+from app.core.schemas.quiz_schemas import AnswerInputSchema, QuestionInputSchema, QuizInputSchema
+from app.infrastructure.postgres.connection import AsyncSessionLocal, engine
+from app.infrastructure.postgres.models import Answer, Company, Question, Quiz, User
+
+
+def build_payload(questions: int, answers: int) -> QuizInputSchema:
+    return QuizInputSchema(
+        title="Benchmark",
+        description="Benchmark quiz",
+        questions=[
+            QuestionInputSchema(
+                question_text=f"Question {i}",
+                answers=[AnswerInputSchema(answer_text=f"Answer {j}", is_correct=j == 0) for j in range(answers)],
+            )
+            for i in range(questions)
+        ],
+    )
+
+
+async def create_row_by_row(company: Company, payload: QuizInputSchema, session) -> Quiz:
+    """The previous implementation: one INSERT and flush per row, then a re-read of the quiz."""
+    quiz = Quiz(company_id=company.id, title=payload.title, description=payload.description)
+    session.add(quiz)
+    await session.flush()
+    for question_payload in payload.questions:
+        question = Question(quiz_id=quiz.id, question_text=question_payload.question_text)
+        session.add(question)
+        await session.flush()
+        for answer_payload in question_payload.answers:
+            session.add(
+                Answer(
+                    question_id=question.id,
+                    answer_text=answer_payload.answer_text,
+                    is_correct=answer_payload.is_correct,
+                )
+            )
+            await session.flush()
+    return await QuizRepository().get(quiz_id=quiz.id, company=company, session=session)
+
+
+async def bulk(company: Company, payload: QuizInputSchema, session) -> Quiz:
+    return await QuizRepository().create(company=company, quiz_payload=payload, session=session)
+
+
+async def measure(create, payload: QuizInputSchema, repeat: int) -> tuple[list[float], int]:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            owner = User(first_name="Bench", last_name="Mark", email=f"{uuid4()}@bench.local", password="-")
+            company = Company(company_name="Bench", company_address="-", company_email="bench@bench.local", owner=owner)
+            session.add_all([owner, company])
+            await session.flush()
+
+            event.listen(engine.sync_engine, "before_cursor_execute", count)
+            started = time.perf_counter()
+            await create(company, payload, session)
+            timings.append(time.perf_counter() - started)
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+            await session.rollback()
+    return timings, statements // repeat
+
+
+async def main(sizes: list[int], answers: int, repeat: int) -> None:
+    print(f"{'questions':>9} {'answers':>8} {'strategy':>12} {'statements':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in sizes:
+        payload = build_payload(size, answers)
+        for name, create in (("row-by-row", create_row_by_row), ("bulk", bulk)):
+            timings, statements = await measure(create, payload, repeat)
+            timings_ms = sorted(t * 1000 for t in timings)
+            p95 = timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))]
+            print(
+                f"{size:>9} {size * answers:>8} {name:>12} {statements:>10} "
+                f"{statistics.median(timings_ms):>8.2f} {p95:>8.2f}"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--answers", type=int, default=4, help="answers per question")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.answers, args.repeat))
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
@@ -6,10 +7,29 @@ from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
 
 from app.application.api import error_handlers, routers
+from app.infrastructure.postgres.connection import engine, replica_engines
+from app.infrastructure.postgres.pool import warm_up_pool
+from app.infrastructure.postgres.routing import replica_router
+from app.infrastructure.redis import close_redis_client
+from app.infrastructure.redis.membership_cache import membership_cache
 from app.settings import settings
 from app.utils import exceptions
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await warm_up_pool(engine, settings.database.POSTGRES_POOL_WARMUP)
+    await replica_router.warm_up(settings.database.POSTGRES_POOL_WARMUP)
+    replica_router.start_lag_monitor(settings.database.POSTGRES_REPLICA_LAG_CHECK_INTERVAL)
+    membership_cache.start_invalidation_listener()
+    yield
+    await membership_cache.stop_invalidation_listener()
+    await replica_router.stop_lag_monitor()
+    for database_engine in (engine, *replica_engines):
+        await database_engine.dispose()
+    await close_redis_client()
+
+
 def _include_middleware(app: FastAPI) -> None:
     app.add_middleware(
         CORSMiddleware,
@@ -56,6 +76,14 @@ def _include_error_handlers(app: FastAPI) -> None:
         exceptions.FileExtensionNotAllowedError,
         error_handlers.file_extension_not_allowed_handler # type: ignore
     )
+    app.add_exception_handler(
+        exceptions.InvalidCursor,
+        error_handlers.handle_invalid_cursor # type: ignore
+    )
+    app.add_exception_handler(
+        exceptions.InvalidImportFile,
+        error_handlers.handle_invalid_import_file # type: ignore
+    )
 
 
 def _mount_static_files(app: FastAPI) -> None:
@@ -65,7 +93,7 @@ def _mount_static_files(app: FastAPI) -> None:
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     _include_middleware(app)
     _include_router(app)
     _include_error_handlers(app)
@@ -0,0 +1,29 @@
+import os
+
+# The settings are read when the app modules are imported. The unit tests don't reach any of the
+# services they describe, so placeholders do where the environment doesn't provide them.
+for name, value in {
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_DB": "test",
+    "JWT_SECRET_KEY": "test",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "1",
+    "JWT_REFRESH_TOKEN_EXPIRE_MINUTES": "1",
+    "JWT_RESET_PASSWORD_TOKEN_EXPIRE_MINUTES": "1",
+    "JWT_TOKEN_TYPE": "bearer",
+    "AZURE_CLIENT_ID": "test",
+    "AZURE_TENANT_ID": "test",
+    "AZURE_CLIENT_SECRET": "test",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "SMTP_EMAIL_HOST": "localhost",
+    "SMTP_EMAIL_PORT": "25",
+    "SMTP_EMAIL_USERNAME": "test",
+    "SMTP_EMAIL_PASSWORD": "test",
+    "SMTP_FROM_EMAIL": "test@example.com",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,88 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.schemas.quiz_schemas import AnswerTreeSchema, QuestionTreeSchema, QuizTreeSchema
+from app.core.services.answer_key import compile_answer_key, get_answer_key, pack_bits, to_bigint, unpack_bits
+from app.utils.exceptions import ObjectNotFound
+
+
+def make_question(*correct: bool) -> QuestionTreeSchema:
+    return QuestionTreeSchema(
+        id=uuid4(),
+        question_text="Question",
+        answers=[
+            AnswerTreeSchema(id=uuid4(), answer_text=f"A{index}", is_correct=flag) for index, flag in enumerate(correct)
+        ],
+    )
+
+
+def test_answers_are_bits_by_position():
+    question = make_question(False, True, True)
+    key = compile_answer_key(QuizTreeSchema(id=uuid4(), version=1, questions=[question])).questions[question.id]
+    assert key.correct_mask == 0b110
+    assert key.mask([question.answers[2].id, question.answers[0].id]) == 0b101
+    assert key.is_correct([question.answers[1].id, question.answers[2].id])
+    assert not key.is_correct([question.answers[1].id])
+
+
+def test_unknown_answer_is_rejected():
+    question = make_question(True, False)
+    key = compile_answer_key(QuizTreeSchema(id=uuid4(), version=1, questions=[question])).questions[question.id]
+    with pytest.raises(ObjectNotFound):
+        key.mask([uuid4()])
+
+
+def test_empty_choice_is_correct_without_correct_answers():
+    question = make_question(False, False)
+    key = compile_answer_key(QuizTreeSchema(id=uuid4(), version=1, questions=[question])).questions[question.id]
+    assert key.correct_mask == 0
+    assert key.is_correct([])
+    assert not key.is_correct([question.answers[0].id])
+
+
+def test_64th_answer_is_the_sign_bit():
+    question = make_question(*[False] * 63, True)
+    key = compile_answer_key(QuizTreeSchema(id=uuid4(), version=1, questions=[question])).questions[question.id]
+    mask = key.mask([question.answers[63].id])
+    assert mask == 1 << 63
+    assert to_bigint(mask) == -(1 << 63)
+    assert to_bigint(mask) >> 63 & 1 == 1
+
+
+@pytest.mark.parametrize("mask", [0, 1, 0b1011, (1 << 63) - 1, 1 << 63, (1 << 64) - 1])
+def test_to_bigint_fits_64_bits_and_keeps_the_bits(mask):
+    value = to_bigint(mask)
+    assert -(1 << 63) <= value < 1 << 63
+    assert value & ((1 << 64) - 1) == mask
+    assert all((value >> index & 1) == (mask >> index & 1) for index in range(64))
+
+
+@pytest.mark.parametrize(
+    "flags, packed",
+    [
+        ([], b""),
+        ([True], b"\x01"),
+        ([False, True, False, False, False, False, False, True], b"\x82"),
+        ([True] * 8 + [False, True], b"\xff\x02"),
+    ],
+)
+def test_pack_bits(flags, packed):
+    assert pack_bits(flags) == packed
+    assert unpack_bits(packed, len(flags)) == flags
+
+
+def test_pack_bits_matches_numpy_little_bit_order():
+    flags = [index % 3 == 0 for index in range(21)]
+    unpacked = np.unpackbits(np.frombuffer(pack_bits(flags), dtype=np.uint8), bitorder="little")
+    assert unpacked[: len(flags)].astype(bool).tolist() == flags
+    assert not unpacked[len(flags) :].any()
+
+
+def test_answer_key_is_compiled_once_per_version():
+    quiz = QuizTreeSchema(id=uuid4(), version=1, questions=[make_question(True, False)])
+    assert get_answer_key(quiz) is get_answer_key(quiz)
+    edited = QuizTreeSchema(id=quiz.id, version=2, questions=[make_question(False, True)])
+    assert get_answer_key(edited).version == 2
+    assert get_answer_key(edited) is not get_answer_key(quiz)
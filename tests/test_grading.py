@@ -0,0 +1,109 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.schemas.quiz_schemas import (
+    AnswerTreeSchema,
+    QuestionTreeSchema,
+    QuizSubmissionSchema,
+    QuizTreeSchema,
+)
+from app.core.services.answer_key import pack_bits
+from app.core.services.grading import grade_submission
+from app.utils.exceptions import ObjectNotFound
+
+
+def make_quiz(*questions: list[bool]) -> QuizTreeSchema:
+    """A quiz with a question per list of flags telling which of its answers are correct."""
+    return QuizTreeSchema(
+        id=uuid4(),
+        version=1,
+        questions=[
+            QuestionTreeSchema(
+                id=uuid4(),
+                question_text=f"Q{position}",
+                answers=[
+                    AnswerTreeSchema(id=uuid4(), answer_text=f"Q{position}A{index}", is_correct=flag)
+                    for index, flag in enumerate(correct)
+                ],
+            )
+            for position, correct in enumerate(questions)
+        ],
+    )
+
+
+def choose(quiz: QuizTreeSchema, position: int, *indexes: int) -> dict:
+    question = quiz.questions[position]
+    return {question.id: [question.answers[index].id for index in indexes]}
+
+
+def test_grades_every_question_of_the_quiz():
+    quiz = make_quiz([True, False], [False, True, True], [True, False])
+    answers = {**choose(quiz, 0, 0), **choose(quiz, 1, 1)}
+    result = grade_submission(QuizSubmissionSchema(answers=answers), quiz)
+    assert (result.total_questions, result.correct_answers_count, result.score) == (3, 1, 33.33)
+    # The second question needed both of its correct answers, the third one was left unanswered.
+    assert result.answer_masks == [0b01, 0b010, None]
+    assert result.correct_questions == pack_bits([True, False, False])
+    assert result.question_ids is None
+    assert result.quiz_version == 1
+    assert [[answer.answer_text for answer in detail.answers] for detail in result.answers_detail] == [
+        ["Q0A0"],
+        ["Q1A1"],
+    ]
+
+
+def test_empty_choice_on_question_without_correct_answer():
+    quiz = make_quiz([False, False], [True, False])
+    answers = {quiz.questions[0].id: [], **choose(quiz, 1, 1)}
+    result = grade_submission(QuizSubmissionSchema(answers=answers), quiz)
+    assert result.answer_masks == [0, 0b10]
+    assert result.correct_questions == pack_bits([True, False])
+    assert result.answers_detail[0].answers == []
+
+
+def test_unanswered_question_without_correct_answer_is_wrong():
+    quiz = make_quiz([False, False])
+    result = grade_submission(QuizSubmissionSchema(answers={}), quiz)
+    assert result.answer_masks == [None]
+    assert result.correct_answers_count == 0
+    assert result.answers_detail == []
+
+
+def test_64th_answer_is_stored_as_the_sign_bit():
+    quiz = make_quiz([False] * 63 + [True])
+    result = grade_submission(QuizSubmissionSchema(answers=choose(quiz, 0, 63)), quiz)
+    assert result.answer_masks == [-(1 << 63)]
+    assert result.score == 100.0
+
+
+def test_draw_grades_only_the_questions_served():
+    quiz = make_quiz([True, False], [True, False], [True, False], [True, False])
+    positions = [3, 1]
+    answers = {**choose(quiz, 3, 0), **choose(quiz, 1, 1)}
+    result = grade_submission(QuizSubmissionSchema(draw_id=uuid4(), answers=answers), quiz, positions=positions)
+    assert (result.total_questions, result.correct_answers_count, result.score) == (2, 1, 50.0)
+    # Masks, flags and details follow the order the questions were served in.
+    assert result.question_ids == [quiz.questions[3].id, quiz.questions[1].id]
+    assert result.answer_masks == [0b01, 0b10]
+    assert result.correct_questions == pack_bits([True, False])
+    assert [detail.question_text for detail in result.answers_detail] == ["Q3", "Q1"]
+
+
+def test_draw_rejects_questions_not_served():
+    quiz = make_quiz([True, False], [True, False], [True, False])
+    with pytest.raises(ObjectNotFound):
+        grade_submission(QuizSubmissionSchema(draw_id=uuid4(), answers=choose(quiz, 0, 0)), quiz, positions=[1, 2])
+
+
+def test_unknown_question_or_answer_is_rejected():
+    quiz = make_quiz([True, False])
+    with pytest.raises(ObjectNotFound):
+        grade_submission(QuizSubmissionSchema(answers={uuid4(): []}), quiz)
+    with pytest.raises(ObjectNotFound):
+        grade_submission(QuizSubmissionSchema(answers={quiz.questions[0].id: [uuid4()]}), quiz)
+
+
+def test_quiz_without_questions_scores_zero():
+    result = grade_submission(QuizSubmissionSchema(answers={}), make_quiz())
+    assert (result.total_questions, result.score, result.correct_questions) == (0, 0.0, b"")
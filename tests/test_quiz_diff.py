@@ -0,0 +1,145 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.repositories.quiz_diff import diff_quiz
+from app.core.schemas.quiz_schemas import AnswerInputSchema, QuestionInputSchema, QuizInputSchema
+from app.infrastructure.postgres.models import Answer, Question, Quiz
+from app.utils.exceptions import ConflictError, ObjectNotFound
+
+
+def make_quiz(*questions: list[str]) -> Quiz:
+    """A stored quiz with a question per list of answer texts, the first answer of each being correct."""
+    quiz = Quiz(id=uuid4(), title="Quiz", description="Description", sample_size=None, time_limit=None)
+    quiz.questions = [
+        Question(
+            id=uuid4(),
+            question_text=f"Q{position}",
+            position=position,
+            answers=[
+                Answer(id=uuid4(), answer_text=text, is_correct=index == 0, position=index)
+                for index, text in enumerate(answers)
+            ],
+        )
+        for position, answers in enumerate(questions)
+    ]
+    return quiz
+
+
+def payload_of(quiz: Quiz, with_ids: bool = True) -> list[QuestionInputSchema]:
+    """The questions of a stored quiz as submitted unchanged, with or without their ids."""
+    return [
+        QuestionInputSchema(
+            id=question.id if with_ids else None,
+            question_text=question.question_text,
+            answers=[
+                AnswerInputSchema(
+                    id=answer.id if with_ids else None, answer_text=answer.answer_text, is_correct=answer.is_correct
+                )
+                for answer in question.answers
+            ],
+        )
+        for question in quiz.questions
+    ]
+
+
+def submit(quiz: Quiz, questions: list[QuestionInputSchema], **changes) -> QuizInputSchema:
+    fields = {"title": quiz.title, "description": quiz.description, **changes}
+    return QuizInputSchema(**fields, questions=questions)
+
+
+@pytest.mark.parametrize("with_ids", [True, False])
+def test_unchanged_quiz_has_empty_diff(with_ids):
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    diff = diff_quiz(quiz, submit(quiz, payload_of(quiz, with_ids=with_ids)))
+    assert diff.is_empty
+    assert diff.question_order == [question.id for question in quiz.questions]
+
+
+def test_quiz_fields_are_compared():
+    quiz = make_quiz(["a", "b"])
+    diff = diff_quiz(quiz, submit(quiz, payload_of(quiz), title="Renamed", sample_size=1))
+    assert diff.quiz_changes == {"title": "Renamed", "sample_size": 1}
+
+
+def test_items_without_id_match_by_position():
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    questions = payload_of(quiz, with_ids=False)
+    questions[1].question_text = "Edited"
+    questions[1].answers[1].answer_text = "Edited"
+    diff = diff_quiz(quiz, submit(quiz, questions))
+    second = quiz.questions[1]
+    assert diff.question_updates == [{"id": second.id, "question_text": "Edited", "position": 1}]
+    assert diff.answer_updates == [
+        {"id": second.answers[1].id, "answer_text": "Edited", "is_correct": False, "position": 1}
+    ]
+    assert not (diff.question_inserts or diff.question_deletes or diff.answer_inserts or diff.answer_deletes)
+
+
+def test_items_with_id_match_wherever_they_move():
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    first, second = quiz.questions
+    diff = diff_quiz(quiz, submit(quiz, payload_of(quiz)[::-1]))
+    assert diff.question_order == [second.id, first.id]
+    assert diff.question_updates == [
+        {"id": second.id, "question_text": "Q1", "position": 0},
+        {"id": first.id, "question_text": "Q0", "position": 1},
+    ]
+    # The answers followed their question, nothing about them changed.
+    assert not (diff.answer_inserts or diff.answer_updates or diff.answer_deletes)
+
+
+def test_position_doesnt_take_a_row_claimed_by_id():
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    first, second = quiz.questions
+    moved, new = payload_of(quiz)[0], payload_of(quiz, with_ids=False)[1]
+    # The first question is sent second, by id; the item at its old position is a new question.
+    diff = diff_quiz(quiz, submit(quiz, [new, moved]))
+    assert len(diff.question_inserts) == 1
+    assert diff.question_order == [diff.question_inserts[0]["id"], first.id]
+    assert diff.question_deletes == [second.id]
+
+
+def test_removed_items_are_deleted():
+    quiz = make_quiz(["a", "b", "c"], ["d", "e"])
+    questions = payload_of(quiz)[:1]
+    del questions[0].answers[1]
+    diff = diff_quiz(quiz, submit(quiz, questions))
+    assert diff.question_deletes == [quiz.questions[1].id]
+    # Answers of a deleted question go with it, only those removed from kept questions are listed.
+    assert diff.answer_deletes == [quiz.questions[0].answers[1].id]
+    assert diff.answer_updates == [
+        {"id": quiz.questions[0].answers[2].id, "answer_text": "c", "is_correct": False, "position": 1}
+    ]
+
+
+def test_unknown_id_is_rejected():
+    quiz = make_quiz(["a", "b"])
+    questions = payload_of(quiz)
+    questions[0].answers[0].id = uuid4()
+    with pytest.raises(ObjectNotFound):
+        diff_quiz(quiz, submit(quiz, questions))
+
+
+def test_id_of_another_question_is_unknown():
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    questions = payload_of(quiz)
+    questions[0].answers[0].id = quiz.questions[1].answers[0].id
+    with pytest.raises(ObjectNotFound):
+        diff_quiz(quiz, submit(quiz, questions))
+
+
+def test_duplicate_question_id_is_rejected():
+    quiz = make_quiz(["a", "b"], ["c", "d"])
+    questions = payload_of(quiz)
+    questions[1].id = questions[0].id
+    with pytest.raises(ConflictError):
+        diff_quiz(quiz, submit(quiz, questions))
+
+
+def test_duplicate_answer_id_is_rejected():
+    quiz = make_quiz(["a", "b"])
+    questions = payload_of(quiz)
+    questions[0].answers[1].id = questions[0].answers[0].id
+    with pytest.raises(ConflictError):
+        diff_quiz(quiz, submit(quiz, questions))